@@ -11,6 +11,7 @@ from .models import (
     LetterOfRecommendation,
 )
 from allauth.socialaccount.models import SocialAccount
+from .search import search_queryset
 
 
 @admin.register(User)
@@ -30,12 +31,21 @@ class UserAdmin(admin.ModelAdmin):
     list_filter = ("is_admin", "is_faculty", "is_reviewer", "is_active")
     search_fields = ("username", "email", "display_name")
 
+    def get_queryset(self, request):
+        """Annotate the SSO flag so the changelist does not query it per row."""
+        return super().get_queryset(request).with_sso()
+
+    def get_search_results(self, request, queryset, search_term):
+        """Use the full-text index instead of icontains on every search field."""
+        return search_queryset(queryset, "user", search_term, order=False), False
+
     def is_sso(self, obj):
         """Check if user logged in via SSO."""
         return obj.is_sso
 
     is_sso.boolean = True
     is_sso.short_description = "SSO User"
+    is_sso.admin_order_field = "sso_linked"
 
     def get_readonly_fields(self, request, obj=None):
         """
@@ -90,10 +100,14 @@ class ApplicationResponseAdmin(admin.ModelAdmin):
 class AnnouncementAdmin(admin.ModelAdmin):
     list_display = ("title", "importance", "is_active", "created_at", "created_by")
     list_filter = ("importance", "is_active", "created_at")
-    search_fields = ("title", "content")
+    search_fields = ("title", "plain_text")
     ordering = ("-created_at",)
     readonly_fields = ("created_at", "updated_at")
 
+    def get_search_results(self, request, queryset, search_term):
+        """Search the text extracted from the content instead of its raw JSON."""
+        return search_queryset(queryset, "announcement", search_term, order=False), False
+
 
 @admin.register(ConfidentialNote)
 class ConfidentialNoteAdmin(admin.ModelAdmin):
@@ -1,6 +1,45 @@
+import os
+import sys
+
 from django.apps import AppConfig
+from django.conf import settings
+
+
+def _background_threads_enabled():
+    """
+    True when this process was explicitly asked to run background threads.
+    RUN_BACKGROUND_THREADS is only set on the gunicorn and runserver commands,
+    so management commands, tests, scripts and other `django.setup()` callers
+    never start them.
+    """
+    if not settings.RUN_BACKGROUND_THREADS:
+        return False
+    argv = [os.path.basename(arg) for arg in sys.argv]
+    if argv[:2] == ["manage.py", "runserver"] and "--noreload" not in argv:
+        # The autoreloader's parent process does not serve requests
+        return os.environ.get("RUN_MAIN") == "true"
+    return True
 
 
 class ApiConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "api"
+
+    def ready(self):
+        from django.db.models.signals import post_migrate
+
+        from . import signals  # noqa: F401
+        from .search import ensure_search_indexes
+
+        # FULLTEXT indexes cannot be declared on models, so create them after migrate
+        post_migrate.connect(ensure_search_indexes, sender=self)
+
+        if settings.APPLICATION_LIFECYCLE_SCHEDULER and _background_threads_enabled():
+            from .lifecycle import start_lifecycle_scheduler
+
+            start_lifecycle_scheduler()
+
+        if settings.TRANSCRIPT_REFRESH_IN_PROCESS and _background_threads_enabled():
+            from .transcript_jobs import start_transcript_workers
+
+            start_transcript_workers()
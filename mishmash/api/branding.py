@@ -0,0 +1,92 @@
+"""
+Site Branding Cache
+===================
+
+The branding record is read on every page load (`/api/branding/current/`) and
+for every email sent, but only changes when an administrator edits it. Its
+field values are cached in two tiers:
+
+- a process-local copy, trusted for `LOCAL_TTL` seconds, so most reads do not
+  even reach the cache backend
+- the shared application cache (see cache.py), tagged "branding"
+
+Both tiers are cleared by the SiteBranding save/delete signals (see signals.py).
+Other processes drop their local copy within `LOCAL_TTL` seconds.
+"""
+
+import threading
+import time
+
+from . import cache as app_cache
+
+CACHE_NAMESPACE = "branding"
+# Seconds a process trusts its local copy before re-reading the shared cache
+LOCAL_TTL = 30
+# Seconds the shared cache keeps the record; saves invalidate it immediately
+SHARED_TTL = 60 * 60
+
+DEFAULT_BRANDING = {
+    "site_name": "Study Abroad College",
+    "primary_color": "#1976d2",
+}
+
+_local_lock = threading.Lock()
+_local_values = None
+_local_expires = 0.0
+
+
+def _load_branding_values():
+    from .models import SiteBranding
+
+    # Always use ID 1 for consistency; create the default record if none exists
+    branding, _ = SiteBranding.objects.get_or_create(id=1, defaults=DEFAULT_BRANDING)
+    return {
+        "id": branding.id,
+        "site_name": branding.site_name,
+        "primary_color": branding.primary_color,
+        "logo": branding.logo.name if branding.logo else None,
+        "welcome_message": branding.welcome_message,
+    }
+
+
+def get_branding_values():
+    """
+    Return the current branding field values as a dict, from the cache if possible.
+    """
+    global _local_values, _local_expires
+
+    with _local_lock:
+        if _local_values is not None and time.monotonic() < _local_expires:
+            return _local_values
+
+    values = app_cache.get_or_set(
+        CACHE_NAMESPACE,
+        ["current"],
+        _load_branding_values,
+        timeout=SHARED_TTL,
+        tags=[CACHE_NAMESPACE],
+    )
+
+    with _local_lock:
+        _local_values = values
+        _local_expires = time.monotonic() + LOCAL_TTL
+    return values
+
+
+def get_current_branding():
+    """
+    Return the current branding as an unsaved SiteBranding instance built from
+    the cached values, suitable for serialization without a database query.
+    """
+    from .models import SiteBranding
+
+    return SiteBranding(**get_branding_values())
+
+
+def invalidate_branding_cache():
+    """Drop the cached branding from this process and from the shared cache."""
+    global _local_values
+
+    with _local_lock:
+        _local_values = None
+    app_cache.invalidate_tags(CACHE_NAMESPACE)
@@ -0,0 +1,165 @@
+"""
+Application Cache Helpers
+=========================
+
+Thin layer over the Django cache configured in `settings.CACHES` (Redis when
+`REDIS_URL` is set, otherwise a file or local-memory cache). It adds:
+
+- Namespaced keys: every entry lives under a namespace such as "branding" or
+  "programs", and the key parts (e.g. query parameters) are hashed, so callers
+  never have to worry about key length or allowed characters.
+- Tag-based invalidation: an entry can be stored with tags. Each tag has a
+  version number that is part of the key, so `invalidate_tags("programs")`
+  makes every entry carrying that tag unreachable at once. Stale entries simply
+  expire.
+- Stampede protection: `get_or_set` lets a single caller recompute a missing
+  entry while concurrent callers wait briefly for the result instead of all
+  hitting the database together.
+- Fail-open behaviour: if the cache backend is unreachable, values are computed
+  as if the cache were empty and an error is logged.
+
+Usage:
+    from api import cache as app_cache
+
+    programs = app_cache.get_or_set(
+        "programs", ["list", request.query_params.urlencode()],
+        compute=lambda: serialize_programs(), timeout=300, tags=["programs"],
+    )
+    app_cache.invalidate_tags("programs")
+"""
+
+import hashlib
+import json
+import logging
+import time
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 300
+# Seconds a recompute lock is held at most, and how long waiters poll for the result
+LOCK_TIMEOUT = 10
+LOCK_WAIT = 2.0
+LOCK_POLL_INTERVAL = 0.05
+
+_MISSING = object()
+
+
+def _tag_key(tag):
+    return f"tag:{tag}"
+
+
+def _new_tag_version():
+    # Time based, so a version lost to eviction never restarts at a value that
+    # old entries may still be stored under
+    return int(time.time() * 1000)
+
+
+def _tag_versions(tags):
+    """Return the current version of each tag, creating missing versions."""
+    if not tags:
+        return []
+    keys = [_tag_key(tag) for tag in tags]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # add() keeps a version another process created in the meantime
+            version = _new_tag_version()
+            cache.add(key, version, None)
+            versions[key] = cache.get(key, version)
+    return [versions[key] for key in keys]
+
+
+def make_key(namespace, key_parts=(), tags=()):
+    """
+    Build the cache key for `key_parts` in `namespace`, including the current
+    versions of `tags`.
+    """
+    digest = hashlib.sha256(
+        json.dumps(list(key_parts), sort_keys=True, default=str).encode()
+    ).hexdigest()[:32]
+    versions = ".".join(str(version) for version in _tag_versions(sorted(tags)))
+    return f"{namespace}:{versions}:{digest}"
+
+
+def get_value(namespace, key_parts=(), tags=(), default=None):
+    try:
+        return cache.get(make_key(namespace, key_parts, tags), default)
+    except Exception as e:
+        logger.error(f"Cache get failed for {namespace}: {str(e)}")
+        return default
+
+
+def set_value(namespace, key_parts, value, timeout=DEFAULT_TIMEOUT, tags=()):
+    try:
+        cache.set(make_key(namespace, key_parts, tags), value, timeout)
+    except Exception as e:
+        logger.error(f"Cache set failed for {namespace}: {str(e)}")
+
+
+def delete_value(namespace, key_parts=(), tags=()):
+    try:
+        cache.delete(make_key(namespace, key_parts, tags))
+    except Exception as e:
+        logger.error(f"Cache delete failed for {namespace}: {str(e)}")
+
+
+def invalidate_tags(*tags):
+    """Make every entry stored with any of `tags` unreachable."""
+    for tag in tags:
+        key = _tag_key(tag)
+        try:
+            try:
+                cache.incr(key)
+            except ValueError:
+                # No version yet, so nothing was cached under this tag
+                cache.add(key, _new_tag_version(), None)
+        except Exception as e:
+            logger.error(f"Cache invalidation failed for tag {tag}: {str(e)}")
+
+
+def get_or_set(namespace, key_parts, compute, timeout=DEFAULT_TIMEOUT, tags=()):
+    """
+    Return the cached value for `key_parts`, calling `compute()` and caching its
+    result on a miss. Only one caller at a time recomputes a given entry; others
+    wait up to `LOCK_WAIT` seconds for it before computing it themselves.
+    """
+    try:
+        key = make_key(namespace, key_parts, tags)
+        value = cache.get(key, _MISSING)
+    except Exception as e:
+        logger.error(f"Cache get failed for {namespace}: {str(e)}")
+        return compute()
+    if value is not _MISSING:
+        return value
+
+    lock_key = f"lock:{key}"
+    try:
+        acquired = cache.add(lock_key, 1, LOCK_TIMEOUT)
+    except Exception as e:
+        logger.error(f"Cache lock failed for {namespace}: {str(e)}")
+        return compute()
+
+    if not acquired:
+        deadline = time.monotonic() + LOCK_WAIT
+        while time.monotonic() < deadline:
+            time.sleep(LOCK_POLL_INTERVAL)
+            value = cache.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+        # The holder is slow or died; compute without caching
+        return compute()
+
+    try:
+        value = compute()
+    except Exception:
+        cache.delete(lock_key)
+        raise
+
+    try:
+        cache.set(key, value, timeout)
+        cache.delete(lock_key)
+    except Exception as e:
+        logger.error(f"Cache set failed for {namespace}: {str(e)}")
+    return value
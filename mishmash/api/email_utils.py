@@ -13,20 +13,19 @@ DEFAULT_FROM_EMAIL = os.getenv("SENDGRID_DEFAULT_FROM", "hccabroad@gmail.com")
 # Get site branding for emails
 def get_site_branding():
     try:
-        from .models import SiteBranding
-        branding = SiteBranding.objects.first()
-        if branding:
-            # Use relative URL path for the logo that will work in emails
-            logo_url = f"/media/{branding.logo.name}" if branding.logo else "/images/logo.png"
-            return {
-                'site_name': branding.site_name,
-                'primary_color': branding.primary_color,
-                'logo_url': logo_url
-            }
+        from .branding import get_branding_values
+        branding = get_branding_values()
+        # Use relative URL path for the logo that will work in emails
+        logo_url = f"/media/{branding['logo']}" if branding['logo'] else "/images/logo.png"
+        return {
+            'site_name': branding['site_name'],
+            'primary_color': branding['primary_color'],
+            'logo_url': logo_url
+        }
     except Exception as e:
         logger.error(f"Error fetching site branding: {str(e)}")
     
-    # Return defaults if no branding is found or there was an error
+    # Return defaults if the branding could not be loaded
     return {
         'site_name': 'Study Abroad College',
         'primary_color': '#1a237e',
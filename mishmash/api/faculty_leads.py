@@ -0,0 +1,67 @@
+"""
+Faculty Lead Invariant
+======================
+
+Every program must have at least one faculty lead. When a program would be left
+without one (created without leads, its last lead removed, or its last lead
+demoted or deleted), the default admin account is added as its lead.
+
+This is enforced on the write paths (ProgramViewSet create/update, faculty
+demotion in UserViewSet.update, user deletion in api/signals.py) so the read
+paths never have to check or repair it. Existing data can be repaired with
+`python manage.py repair_faculty_leads`.
+"""
+
+from .models import Program, User
+from .program_catalog import invalidate_program_catalog
+
+DEFAULT_FACULTY_LEAD_USERNAME = "admin"
+
+
+def get_default_faculty_lead():
+    """Returns the user added to programs without faculty leads, or None if missing."""
+    return User.objects.filter(username=DEFAULT_FACULTY_LEAD_USERNAME).first()
+
+
+def programs_without_faculty_leads(program_ids=None):
+    """
+    Returns a queryset of programs that currently have no faculty leads.
+
+    Args:
+        program_ids (iterable, optional): Restrict the check to these programs.
+    """
+    queryset = Program.objects.filter(faculty_leads__isnull=True)
+    if program_ids is not None:
+        queryset = queryset.filter(id__in=list(program_ids))
+    return queryset
+
+
+def backfill_faculty_leads(program_ids=None):
+    """
+    Adds the default admin as faculty lead of every program that has none.
+
+    Args:
+        program_ids (iterable, optional): Only check these programs. Defaults to all programs.
+
+    Returns:
+        int: Number of programs that were given the default faculty lead.
+    """
+    missing_ids = list(
+        programs_without_faculty_leads(program_ids).values_list("id", flat=True)
+    )
+    if not missing_ids:
+        return 0
+
+    admin_user = get_default_faculty_lead()
+    if admin_user is None:
+        # Handle case where admin user doesn't exist
+        return 0
+
+    through = Program.faculty_leads.through
+    through.objects.bulk_create(
+        [through(program_id=program_id, user_id=admin_user.id) for program_id in missing_ids],
+        ignore_conflicts=True,
+    )
+    # bulk_create sends no m2m_changed signal
+    invalidate_program_catalog()
+    return len(missing_ids)
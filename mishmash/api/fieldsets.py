@@ -0,0 +1,136 @@
+"""
+Sparse Fieldsets
+================
+
+Every endpoint accepts `?fields=` and `?omit=` on GET requests to choose which
+fields of its serializer are returned:
+
+    GET /api/documents/?application=12&fields=id,type,last_modified
+    GET /api/programs/?omit=description,faculty_leads
+    GET /api/announcements/?fields=summary
+
+Both take comma-separated field names. A serializer can also define named
+presets in `Meta.field_presets`, which may be used wherever a field name can.
+Unknown names are rejected with a 400 so that typos do not go unnoticed.
+
+Only the top-level serializer is trimmed; nested serializers (e.g. the
+faculty leads of a program) are returned whole.
+
+Views using `SparseFieldsetMixin` also stop loading the database columns that
+no selected field needs, using `.defer()`. The columns a field needs are worked
+out from its `source`; fields without a model column of their own (method
+fields, properties) declare theirs in `Meta.field_dependencies`:
+
+    class Meta:
+        field_dependencies = {"pdf_url": ("pdf",)}
+
+If a selected field needs columns that cannot be worked out, nothing is
+deferred, since a deferred column read later costs one query per row.
+"""
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+FIELDS_PARAM = "fields"
+OMIT_PARAM = "omit"
+
+
+def _split(value):
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+
+class DynamicFieldsMixin:
+    """
+    Serializer mixin honoring `?fields=` and `?omit=` on GET requests (see the
+    module docstring). Mix in before `serializers.ModelSerializer`.
+    """
+
+    def _is_top_level(self):
+        root = self.root
+        return root is self or (
+            root is self.parent and isinstance(root, serializers.ListSerializer)
+        )
+
+    def _fieldset_params(self):
+        request = self.context.get("request")
+        if request is None or request.method not in SAFE_METHODS or not self._is_top_level():
+            return None, None
+        params = request.query_params
+        return params.get(FIELDS_PARAM), params.get(OMIT_PARAM)
+
+    def _expand_names(self, value, available, param):
+        presets = getattr(self.Meta, "field_presets", {})
+        names = []
+        for name in _split(value):
+            if name in presets:
+                names.extend(presets[name])
+            elif name in available:
+                names.append(name)
+            else:
+                raise serializers.ValidationError({param: f"Unknown field '{name}'."})
+        return set(names)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        selected, omitted = self._fieldset_params()
+        if selected:
+            keep = self._expand_names(selected, fields, FIELDS_PARAM)
+        else:
+            keep = set(fields)
+        if omitted:
+            keep -= self._expand_names(omitted, fields, OMIT_PARAM)
+        return {name: field for name, field in fields.items() if name in keep}
+
+    def get_deferrable_fields(self):
+        """
+        Return the names of the model's columns that none of the selected fields
+        needs, or an empty list if that cannot be worked out.
+        """
+        selected, omitted = self._fieldset_params()
+        if not (selected or omitted):
+            return []
+
+        opts = self.Meta.model._meta
+        dependencies = getattr(self.Meta, "field_dependencies", {})
+        needed = set()
+        for name, field in self.fields.items():
+            if field.write_only:
+                continue
+            if name in dependencies:
+                needed.update(dependencies[name])
+                continue
+            if field.source == "*":
+                return []
+            try:
+                needed.add(opts.get_field(field.source_attrs[0]).name)
+            except FieldDoesNotExist:
+                # A property or annotation reading unknown columns
+                return []
+
+        return [
+            model_field.name
+            for model_field in opts.concrete_fields
+            # Relations stay loaded so select_related/prefetch_related keep working
+            if not model_field.primary_key
+            and not model_field.is_relation
+            and model_field.name not in needed
+        ]
+
+
+class SparseFieldsetMixin:
+    """
+    ViewSet mixin deferring the columns that `?fields=` / `?omit=` leave out.
+    The serializer must use DynamicFieldsMixin.
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.request.method not in SAFE_METHODS:
+            return queryset
+        serializer = self.get_serializer()
+        get_deferrable_fields = getattr(serializer, "get_deferrable_fields", None)
+        if get_deferrable_fields is None:
+            return queryset
+        deferred = get_deferrable_fields()
+        return queryset.defer(*deferred) if deferred else queryset
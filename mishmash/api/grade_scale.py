@@ -0,0 +1,127 @@
+"""
+Grade Scale
+===========
+
+Grades reported by Ulink, and how they are compared when checking program
+prerequisites.
+
+Letter grades are ranked from D- (0) up to A+ (11) once, at import. A
+prerequisite is met by a letter grade at or above the program's minimum
+grade (`Program.prerequisite_min_grade`, D- when blank). "S" (satisfactory)
+and "IP" (in progress) always meet it. Grades are never compared as strings:
+"A+" < "A" and "D+" < "D-" in string order.
+
+A program may also accept other courses in place of a prerequisite
+(`Program.prerequisite_equivalents`, e.g. {"BIOL 101": ["BIOL 110"]}); the
+requirement is met if any of them has a passing grade.
+
+`compile_prerequisites()` turns a program's prerequisites, minimum grade and
+equivalents into a `PrerequisiteMatcher`, which checks a transcript with set
+lookups only. Matchers are cached, so evaluating many transcripts against the
+same program (see api/prerequisites.py) compiles it once.
+"""
+
+from functools import lru_cache
+
+# Lowest to highest
+LETTER_GRADES = ("D-", "D", "D+", "C-", "C", "C+", "B-", "B", "B+", "A-", "A", "A+")
+GRADE_RANKS = {grade: rank for rank, grade in enumerate(LETTER_GRADES)}
+
+# Satisfactory (pass/fail) and in progress meet any minimum grade
+ALWAYS_PASSING_GRADES = frozenset({"S", "IP"})
+PASSING_GRADES = frozenset(GRADE_RANKS) | ALWAYS_PASSING_GRADES
+
+MIN_GRADE_CHOICES = [(grade, grade) for grade in reversed(LETTER_GRADES)]
+
+
+def grade_rank(grade):
+    """The rank of a letter grade (D- is 0, A+ is 11), or None for other grades."""
+    return GRADE_RANKS.get(grade)
+
+
+def passing_grades(min_grade=""):
+    """
+    The grades that meet `min_grade` (any passing grade when blank).
+
+    Raises:
+        ValueError: If `min_grade` is not a letter grade.
+    """
+    if not min_grade:
+        return PASSING_GRADES
+    if min_grade not in GRADE_RANKS:
+        raise ValueError(f"Unknown minimum grade '{min_grade}'")
+    min_rank = GRADE_RANKS[min_grade]
+    return frozenset(
+        grade for grade, rank in GRADE_RANKS.items() if rank >= min_rank
+    ) | ALWAYS_PASSING_GRADES
+
+
+def normalize_course(course):
+    """'biol  101 ' -> 'BIOL 101', the form used in transcripts."""
+    return " ".join(str(course).upper().split())
+
+
+class PrerequisiteMatcher:
+    """A program's prerequisites, compiled; see the module docstring."""
+
+    __slots__ = ("requirements", "passing")
+
+    def __init__(self, requirements, passing):
+        # ((required course as listed, (normalized courses that satisfy it, ...)), ...)
+        self.requirements = requirements
+        self.passing = passing
+
+    def missing(self, transcript):
+        """The required courses `transcript` does not satisfy, in listed order."""
+        transcript = transcript or {}
+        passing = self.passing
+        return [
+            course
+            for course, accepted in self.requirements
+            if not any(transcript.get(option) in passing for option in accepted)
+        ]
+
+    def meets_all(self, transcript):
+        return not self.missing(transcript)
+
+
+@lru_cache(maxsize=256)
+def _compile(prerequisites, min_grade, equivalents):
+    equivalents = dict(equivalents)
+    requirements = tuple(
+        (course, (normalize_course(course),) + equivalents.get(normalize_course(course), ()))
+        for course in prerequisites
+    )
+    return PrerequisiteMatcher(requirements, passing_grades(min_grade))
+
+
+def compile_prerequisites(prerequisites, min_grade="", equivalents=None):
+    """
+    Compile prerequisites into a (cached) PrerequisiteMatcher.
+
+    Args:
+        prerequisites (list): Required course codes, e.g. ["BIOL 101"].
+        min_grade (str): Lowest letter grade that passes; blank for any passing grade.
+        equivalents (dict, optional): Required course to courses that also satisfy it.
+    """
+    prerequisites = tuple(prerequisites or ())
+    # Hashable form of the equivalents, so the compiled matcher can be cached
+    equivalents = tuple(
+        sorted(
+            (
+                normalize_course(course),
+                tuple(sorted({normalize_course(option) for option in options})),
+            )
+            for course, options in (equivalents or {}).items()
+        )
+    )
+    return _compile(prerequisites, min_grade or "", equivalents)
+
+
+def get_program_matcher(program):
+    """The compiled prerequisites of a program."""
+    return compile_prerequisites(
+        program.prerequisites,
+        program.prerequisite_min_grade,
+        program.prerequisite_equivalents,
+    )
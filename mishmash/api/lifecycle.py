@@ -0,0 +1,150 @@
+"""
+Application Lifecycle Engine
+============================
+
+Time-driven status transitions for applications live here instead of in the
+read paths of the API. Currently this covers a single rule:
+
+- An application that is still "Enrolled" once its program's `end_date` has
+  passed becomes "Completed".
+
+The transition is applied with one set-based UPDATE per batch, and the matching
+audit entries are written with `bulk_create` so the audit trail stays intact
+without a per-row `save()`. Each batch is locked with `SELECT ... FOR UPDATE
+SKIP LOCKED`, so concurrent runs split the work instead of both logging it.
+
+Entry points:
+- `complete_ended_enrollments()`: run the transition once (used by the
+  `complete_enrollments` management command).
+- `start_lifecycle_scheduler()`: start an in-process daemon thread that runs the
+  transition periodically (started from `ApiConfig.ready` when enabled and
+  RUN_BACKGROUND_THREADS is set).
+"""
+
+import logging
+import threading
+import time
+
+from auditlog.models import LogEntry
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Number of applications transitioned per UPDATE statement
+BATCH_SIZE = 500
+
+_scheduler_lock = threading.Lock()
+_scheduler_thread = None
+
+
+def complete_ended_enrollments(today=None, batch_size=BATCH_SIZE, dry_run=False):
+    """
+    Move every "Enrolled" application whose program has ended to "Completed".
+
+    Args:
+        today (date, optional): The reference date. Defaults to the current date.
+        batch_size (int): Maximum number of applications updated per statement.
+        dry_run (bool): If True, only count the matching applications.
+
+    Returns:
+        int: Number of applications transitioned (or that would be, for a dry run).
+    """
+    from .models import Application
+
+    if today is None:
+        today = timezone.now().date()
+
+    pending = Application.objects.filter(
+        status="Enrolled", program__end_date__lt=today
+    )
+    if dry_run:
+        return pending.count()
+
+    content_type = ContentType.objects.get_for_model(Application)
+    transitioned = 0
+
+    while True:
+        with transaction.atomic():
+            # Lock the batch so overlapping runs (one per worker process) never
+            # transition, and audit, the same application twice
+            rows = list(
+                pending.select_for_update(skip_locked=True, of=("self",))
+                .order_by("id")
+                .values_list("id", "student__display_name", "program__title")[:batch_size]
+            )
+            if not rows:
+                break
+
+            ids = [row[0] for row in rows]
+            updated = Application.objects.filter(
+                id__in=ids, status="Enrolled"
+            ).update(status="Completed")
+
+            timestamp = timezone.now()
+            LogEntry.objects.bulk_create(
+                [
+                    LogEntry(
+                        content_type=content_type,
+                        object_pk=str(app_id),
+                        object_id=app_id,
+                        object_repr=f"{display_name} - {title}",
+                        action=LogEntry.Action.UPDATE,
+                        changes={"status": ["Enrolled", "Completed"]},
+                        additional_data={"source": "lifecycle"},
+                        timestamp=timestamp,
+                    )
+                    for app_id, display_name, title in rows
+                ]
+            )
+            transitioned += updated
+
+        if len(rows) < batch_size:
+            break
+
+    if transitioned:
+        logger.info(f"Marked {transitioned} enrolled applications as completed")
+    return transitioned
+
+
+def _run_scheduler(interval):
+    while True:
+        try:
+            complete_ended_enrollments()
+        except Exception as e:
+            logger.error(f"Application lifecycle run failed: {str(e)}")
+        finally:
+            # Don't hold a database connection open while sleeping
+            connection.close()
+        time.sleep(interval)
+
+
+def start_lifecycle_scheduler(interval=None):
+    """
+    Start the in-process lifecycle scheduler, if it is not already running.
+
+    The transition is idempotent, so it is safe for every worker process to run
+    its own scheduler.
+
+    Args:
+        interval (int, optional): Seconds between runs. Defaults to
+            `settings.APPLICATION_LIFECYCLE_INTERVAL`.
+    """
+    global _scheduler_thread
+
+    if interval is None:
+        interval = settings.APPLICATION_LIFECYCLE_INTERVAL
+
+    with _scheduler_lock:
+        if _scheduler_thread is not None and _scheduler_thread.is_alive():
+            return _scheduler_thread
+        _scheduler_thread = threading.Thread(
+            target=_run_scheduler,
+            args=(interval,),
+            name="application-lifecycle",
+            daemon=True,
+        )
+        _scheduler_thread.start()
+        return _scheduler_thread
@@ -0,0 +1,238 @@
+"""
+Study Abroad Program - API Benchmark Command
+============================================
+To run this use:
+    docker compose exec backend python manage.py bench_api
+
+This Django management command replays a weighted mix of the API calls the
+frontend makes on its busiest pages against the data currently in the database
+(ideally a dataset created with generate_load_dataset), and reports per endpoint:
+- p50/p95/p99 latency in milliseconds
+- SQL queries per request (max)
+- Response size in bytes (max)
+
+Where test_api_endpoints checks correctness, this command checks cost. A budget
+file can be given to turn it into a regression gate: the command exits with an
+error when any endpoint exceeds its budgeted p95 latency, query count or
+response size. --write-budget records the current results (with headroom) as a
+new budget file.
+
+Budget file format (JSON, every key optional):
+    {
+        "programs": {"p95_ms": 120, "queries": 3, "bytes": 400000},
+        ...
+    }
+
+Usage:
+    python manage.py bench_api
+    python manage.py bench_api --requests 2000 --seed 7
+    python manage.py bench_api --only programs branding
+    python manage.py bench_api --write-budget bench_budget.json
+    python manage.py bench_api --budget bench_budget.json
+"""
+
+import json
+import math
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from api.models import Application, Document, Program, User
+
+# Endpoint name -> (relative weight in the mix, who makes the call)
+ENDPOINTS = {
+    "programs": (5, "student"),
+    "applicant_counts": (2, "admin"),
+    "applicant_table": (3, "admin"),
+    "application_documents": (3, "admin"),
+    "dashboard": (2, "student"),
+    "announcements": (3, "anonymous"),
+    "branding": (5, "anonymous"),
+}
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks latency, query counts and response sizes of the main API endpoints.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500, help='Number of measured requests (default: 500)')
+        parser.add_argument('--warmup', type=int, default=20, help='Unmeasured requests sent first (default: 20)')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for the request mix (default: 42)')
+        parser.add_argument('--only', nargs='+', choices=list(ENDPOINTS), help='Only benchmark these endpoints')
+        parser.add_argument('--budget', type=str, help='JSON budget file to check the results against')
+        parser.add_argument('--write-budget', type=str, help='Write the results to this JSON budget file')
+        parser.add_argument(
+            '--headroom',
+            type=float,
+            default=1.5,
+            help='Multiplier applied to p95 latency and bytes when writing a budget (default: 1.5)'
+        )
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        targets = self.get_targets()
+        names = options['only'] or list(ENDPOINTS)
+
+        clients = {"anonymous": APIClient()}
+        for role in ("student", "admin"):
+            clients[role] = APIClient()
+            clients[role].force_authenticate(user=targets[role])
+
+        weights = [ENDPOINTS[name][0] for name in names]
+        results = {name: {"latency": [], "queries": [], "bytes": [], "errors": 0} for name in names}
+
+        for n in range(options['warmup'] + options['requests']):
+            name = rng.choices(names, weights=weights)[0]
+            url = self.build_url(name, targets, rng)
+            client = clients[ENDPOINTS[name][1]]
+
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                response = client.get(url)
+                elapsed = (time.perf_counter() - start) * 1000
+
+            if n < options['warmup']:
+                continue
+            result = results[name]
+            if response.status_code != 200:
+                result["errors"] += 1
+                continue
+            result["latency"].append(elapsed)
+            result["queries"].append(len(queries))
+            result["bytes"].append(len(response.content))
+
+        summary = self.summarize(results)
+        self.print_summary(summary)
+
+        if options['write_budget']:
+            self.write_budget(summary, options['write_budget'], options['headroom'])
+
+        failures = [
+            f"{name}: {result['errors']} requests failed"
+            for name, result in results.items()
+            if result["errors"]
+        ]
+        if options['budget']:
+            failures += self.check_budget(summary, options['budget'])
+
+        if failures:
+            for failure in failures:
+                self.stdout.write(self.style.ERROR(failure))
+            raise CommandError(f"Benchmark failed: {len(failures)} problem(s) found.")
+        self.stdout.write(self.style.SUCCESS("Benchmark completed."))
+
+    def get_targets(self):
+        """
+        Pick the users and records the requests are made for: the program with
+        the most applicants, an application with documents and its student.
+        """
+        admin = User.objects.filter(is_admin=True).order_by('id').first()
+        busiest = (
+            Application.objects.values('program_id')
+            .annotate(applicants=Count('id'))
+            .order_by('-applicants', 'program_id')
+            .first()
+        )
+        if admin is None or busiest is None:
+            raise CommandError('No admin or applications found. Seed the database first.')
+
+        program_id = busiest['program_id']
+        application = (
+            Application.objects.filter(id__in=Document.objects.values('application_id'))
+            .order_by('id')
+            .first()
+        ) or Application.objects.filter(program_id=program_id).order_by('id').first()
+
+        return {
+            "admin": admin,
+            "student": application.student,
+            "program_id": program_id,
+            "application_id": application.id,
+            "program_ids": list(Program.objects.order_by('-id').values_list('id', flat=True)[:50]),
+        }
+
+    def build_url(self, name, targets, rng):
+        if name == "programs":
+            return "/api/programs/?exclude_ended=true" if rng.random() < 0.5 else "/api/programs/"
+        if name == "applicant_counts":
+            ids = ",".join(str(program_id) for program_id in targets["program_ids"][:25])
+            return f"/api/programs/applicant_counts/?ids={ids}"
+        if name == "applicant_table":
+            return f"/api/applications/?program={targets['program_id']}&expand=student"
+        if name == "application_documents":
+            return f"/api/documents/?application={targets['application_id']}"
+        if name == "dashboard":
+            return "/api/users/me/dashboard/"
+        if name == "announcements":
+            return "/api/announcements/"
+        if name == "branding":
+            return "/api/branding/current/"
+        raise CommandError(f"Unknown endpoint {name}")
+
+    def summarize(self, results):
+        summary = {}
+        for name, result in results.items():
+            if not result["latency"]:
+                continue
+            summary[name] = {
+                "requests": len(result["latency"]),
+                "p50_ms": round(percentile(result["latency"], 50), 2),
+                "p95_ms": round(percentile(result["latency"], 95), 2),
+                "p99_ms": round(percentile(result["latency"], 99), 2),
+                "queries": max(result["queries"]),
+                "bytes": max(result["bytes"]),
+            }
+        return summary
+
+    def print_summary(self, summary):
+        self.stdout.write(
+            f"\n{'Endpoint':<24}{'Requests':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'Queries':>9}{'Bytes':>11}"
+        )
+        for name, row in summary.items():
+            self.stdout.write(
+                f"{name:<24}{row['requests']:>9}{row['p50_ms']:>10.2f}{row['p95_ms']:>10.2f}"
+                f"{row['p99_ms']:>10.2f}{row['queries']:>9}{row['bytes']:>11}"
+            )
+        self.stdout.write("")
+
+    def write_budget(self, summary, path, headroom):
+        budget = {
+            name: {
+                "p95_ms": round(row["p95_ms"] * headroom, 2),
+                # Query counts should not grow at all
+                "queries": row["queries"],
+                "bytes": math.ceil(row["bytes"] * headroom),
+            }
+            for name, row in summary.items()
+        }
+        with open(path, "w") as budget_file:
+            json.dump(budget, budget_file, indent=4)
+        self.stdout.write(self.style.SUCCESS(f"Wrote budget to {path}"))
+
+    def check_budget(self, summary, path):
+        try:
+            with open(path) as budget_file:
+                budget = json.load(budget_file)
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Could not read budget file {path}: {e}")
+
+        failures = []
+        for name, limits in budget.items():
+            row = summary.get(name)
+            if row is None:
+                continue
+            for key, limit in limits.items():
+                if key in row and row[key] > limit:
+                    failures.append(f"{name}: {key} {row[key]} exceeds budget {limit}")
+        return failures
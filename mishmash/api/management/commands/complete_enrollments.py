@@ -0,0 +1,62 @@
+"""
+Study Abroad Program - Complete Enrollments Command
+===================================================
+To run this use:
+    docker compose exec backend python manage.py complete_enrollments
+
+This Django management command marks every "Enrolled" application whose program
+has already ended as "Completed". The same transition runs periodically inside
+the web server (see APPLICATION_LIFECYCLE_SCHEDULER in settings.py); this command
+allows running it on demand or from cron.
+
+Usage:
+    python manage.py complete_enrollments
+    python manage.py complete_enrollments --dry-run
+    python manage.py complete_enrollments --date 2025-06-01
+"""
+
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from api.lifecycle import BATCH_SIZE, complete_ended_enrollments
+
+
+class Command(BaseCommand):
+    help = 'Marks enrolled applications of ended programs as completed.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report how many applications would be completed'
+        )
+        parser.add_argument(
+            '--date',
+            type=str,
+            help='Reference date in YYYY-MM-DD format (default: today)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help=f'Applications updated per statement (default: {BATCH_SIZE})'
+        )
+
+    def handle(self, *args, **options):
+        today = None
+        if options['date']:
+            try:
+                today = datetime.strptime(options['date'], '%Y-%m-%d').date()
+            except ValueError:
+                raise CommandError('Invalid date format. Use YYYY-MM-DD.')
+
+        count = complete_ended_enrollments(
+            today=today,
+            batch_size=options['batch_size'],
+            dry_run=options['dry_run'],
+        )
+
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(f'DRY RUN: {count} applications would be marked as completed'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Marked {count} applications as completed'))
@@ -0,0 +1,110 @@
+"""
+Study Abroad Program - Explain Queries Command
+==============================================
+To run this use:
+    docker compose exec backend python manage.py explain_queries
+
+This Django management command prints the database query plan for the hottest
+application, document, letter, response and note lookups made by the API. Run it
+before and after a schema change (e.g. on a dataset produced by a load generator)
+to confirm that the composite indexes declared in api/models.py are being used
+instead of full table scans.
+
+Usage:
+    python manage.py explain_queries
+    python manage.py explain_queries --only application_status
+    python manage.py explain_queries --analyze
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.utils import timezone
+from api.models import (
+    Application,
+    ApplicationResponse,
+    ConfidentialNote,
+    Document,
+    LetterOfRecommendation,
+    Program,
+)
+
+
+class Command(BaseCommand):
+    help = 'Prints query plans for the hot API lookups.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--only',
+            nargs='+',
+            help='Only explain the named queries'
+        )
+        parser.add_argument(
+            '--analyze',
+            action='store_true',
+            help='Run EXPLAIN ANALYZE (MySQL 8.0.18+ only)'
+        )
+
+    def get_queries(self):
+        """
+        Build the queries to explain, using existing rows so that the plans
+        reflect real values.
+        """
+        application = Application.objects.order_by('id').first()
+        if application is None:
+            raise CommandError('No applications found. Seed the database first.')
+
+        today = timezone.now().date()
+        return {
+            'applicants_by_status': Application.objects.filter(
+                program_id=application.program_id, status='Applied'
+            ),
+            'applicant_counts': Application.objects.filter(
+                program_id=application.program_id
+            ).values_list('status').annotate(count=Count('id')).order_by(),
+            'application_status': Application.objects.filter(
+                student_id=application.student_id, program_id=application.program_id
+            ),
+            'student_applications': Application.objects.filter(
+                student_id=application.student_id
+            ),
+            'lifecycle_completion': Application.objects.filter(
+                status='Enrolled', program__end_date__lt=today
+            ).order_by('id'),
+            'current_programs': Program.objects.filter(end_date__gte=today),
+            'application_documents': Document.objects.filter(
+                application_id=application.id, type=Document.TYPES_OF_DOCS[0][0]
+            ),
+            'application_letters': LetterOfRecommendation.objects.filter(
+                application_id=application.id, letter_timestamp__isnull=False
+            ),
+            'student_responses': ApplicationResponse.objects.filter(
+                application__student_id=application.student_id
+            ),
+            'application_notes': ConfidentialNote.objects.filter(
+                application_id=application.id
+            ).order_by('-timestamp'),
+        }
+
+    def handle(self, *args, **options):
+        queries = self.get_queries()
+
+        names = options['only'] or list(queries)
+        unknown = [name for name in names if name not in queries]
+        if unknown:
+            raise CommandError(
+                f"Unknown queries: {', '.join(unknown)}. Choose from: {', '.join(queries)}"
+            )
+
+        explain_options = {}
+        if options['analyze']:
+            if connection.vendor != 'mysql':
+                raise CommandError('--analyze is only supported on MySQL.')
+            explain_options['analyze'] = True
+
+        self.stdout.write(f'Database backend: {connection.vendor}')
+        for name in names:
+            queryset = queries[name]
+            self.stdout.write(self.style.SUCCESS(f'\n== {name} =='))
+            self.stdout.write(str(queryset.query))
+            self.stdout.write(queryset.explain(**explain_options))
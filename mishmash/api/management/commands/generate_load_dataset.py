@@ -0,0 +1,487 @@
+"""
+Study Abroad Program - Load Dataset Generation Command
+======================================================
+To run this use:
+    docker compose exec backend python manage.py generate_load_dataset
+
+This Django management command generates a large synthetic dataset so that
+production-scale performance problems can be reproduced locally on MySQL or
+SQLite. Unlike add_test_users/add_test_programs/add_test_applications, every
+table is filled with bulk_create in batches, so hundreds of thousands of rows
+can be created in minutes.
+
+Features:
+- Creates students, faculty, reviewers and provider partners (password 'guest')
+- Creates programs spread over past, current and future semesters, with faculty
+  leads, provider partners, prerequisites and the default questions
+- Creates applications (at most one per student and program) with responses,
+  documents, confidential notes, letters of recommendation and audit entries
+- The same seed, reference date and volumes always produce the same data
+
+Generated users are named '<prefix>_user000001', ... and generated programs are
+titled '[<prefix>] ...', so the dataset can be removed again with --clear without
+touching any other data.
+
+Usage:
+    python manage.py generate_load_dataset
+    python manage.py generate_load_dataset --users 50000 --programs 2000 --applications 200000
+    python manage.py generate_load_dataset --seed 7 --reference-date 2025-03-01
+    python manage.py generate_load_dataset --clear
+
+Note: This command should only be used in development/testing environments,
+      never in production as it creates users with known passwords.
+
+Note: Letters of recommendation marked as fulfilled point at placeholder PDF
+      paths; no files are written to MEDIA_ROOT.
+"""
+
+import base64
+import random
+import uuid
+from datetime import datetime, timedelta
+
+from auditlog.context import disable_auditlog
+from auditlog.models import LogEntry
+from django.contrib.auth.hashers import make_password
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from api.models import (
+    Application,
+    ApplicationQuestion,
+    ApplicationResponse,
+    ConfidentialNote,
+    Document,
+    LetterOfRecommendation,
+    Program,
+    User,
+)
+from api.program_catalog import invalidate_program_catalog
+from api.signatures import PNG_MAGIC, store_signature
+from api.transcripts import transcript_etag
+
+AUDIT_SOURCE = "load_dataset"
+
+DEFAULT_QUESTIONS = [
+    "Why do you want to participate in this study abroad program?",
+    "How does this program align with your academic or career goals?",
+    "What challenges do you anticipate during this experience, and how will you address them?",
+    "Describe a time you adapted to a new or unfamiliar environment.",
+    "What unique perspective or contribution will you bring to the group?",
+]
+
+FIRST_NAMES = [
+    "Emma", "James", "Maria", "David", "Sarah", "Mohammed", "Priya", "Lucas",
+    "Nina", "Tom", "Elena", "Marcus", "Rachel", "Isabella", "Hiroshi", "Erik",
+    "Lisa", "Carlos", "Giulia", "Alice", "Daniel", "Emily", "Frank", "Sophie",
+]
+LAST_NAMES = [
+    "Wilson", "Chen", "Garcia", "Kim", "Johnson", "Ali", "Patel", "Silva",
+    "Williams", "Anderson", "Romano", "Tanaka", "Laurent", "Nilsson", "Chang",
+    "Tan", "Lee", "Brown", "Taylor", "Smith", "Harris", "Clark", "Lewis", "Walker",
+]
+SUBJECTS = [
+    "Ancient Philosophy", "Digital Innovation", "Sustainable Agriculture",
+    "Journalism", "Marine Biology", "Renaissance Art", "Global Health",
+    "Urban Planning", "Fashion Design", "Astronomy", "Game Development",
+    "Polar Research", "Culinary Arts", "International Business",
+]
+CITIES = [
+    "Athens", "Silicon Valley", "New Zealand", "New York City", "Great Barrier Reef",
+    "Florence", "Cape Town", "Paris", "Tokyo", "Stockholm", "Singapore", "Lima",
+    "Milan", "Reykjavik", "Seoul", "Barcelona",
+]
+MAJORS = [
+    "Computer Science", "Biology", "Philosophy", "Journalism", "Environmental Science",
+    "Art History", "Economics", "Mechanical Engineering", "Undeclared",
+]
+COURSES = [
+    "BIOL 101", "BIOL 201", "CHEM 101", "PHYS 101", "MATH 112", "MATH 212",
+    "COMPSCI 201", "ECON 101", "HIST 150", "PHIL 101", "ENGL 110", "ART 120",
+]
+GRADES = ["A+", "A", "A-", "B+", "B", "B-", "C+", "C", "C-", "D", "F", "IP", "S"]
+NOTE_TEXTS = [
+    "Strong essay responses, recommend approval.",
+    "Follow up on missing medical records.",
+    "Discussed housing preferences with the student.",
+    "GPA is below the usual threshold, review with the faculty lead.",
+]
+RESPONSE_TEXTS = [
+    "I have always wanted to experience this culture first hand.",
+    "This program fits directly into my major requirements.",
+    "I expect the language barrier to be the biggest challenge.",
+    "I moved to a new city for college and adapted quickly.",
+    "I will bring my experience as a peer mentor to the group.",
+]
+
+# (status, weight) choices for an application, by program timing
+PAST_STATUSES = [("Completed", 6), ("Enrolled", 1), ("Withdrawn", 2), ("Canceled", 1)]
+CURRENT_STATUSES = [("Enrolled", 6), ("Approved", 1), ("Withdrawn", 2), ("Canceled", 1)]
+FUTURE_STATUSES = [("Applied", 5), ("Eligible", 2), ("Approved", 2), ("Withdrawn", 1)]
+
+
+class Command(BaseCommand):
+    help = 'Generates a large, deterministic synthetic dataset for performance testing.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50000, help='Number of users (default: 50000)')
+        parser.add_argument('--programs', type=int, default=2000, help='Number of programs (default: 2000)')
+        parser.add_argument('--applications', type=int, default=200000, help='Number of applications (default: 200000)')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed (default: 42)')
+        parser.add_argument(
+            '--reference-date',
+            type=str,
+            help='Date the program schedule is centered on, YYYY-MM-DD (default: today)'
+        )
+        parser.add_argument('--batch-size', type=int, default=2000, help='Rows per INSERT (default: 2000)')
+        parser.add_argument('--prefix', type=str, default='load', help="Prefix for generated usernames and program titles (default: 'load')")
+        parser.add_argument(
+            '--clear',
+            action='store_true',
+            help='Delete a previously generated dataset with the same prefix and exit'
+        )
+
+    def handle(self, *args, **options):
+        self.prefix = options['prefix']
+        self.batch_size = options['batch_size']
+
+        if options['clear']:
+            self.clear()
+            return
+
+        if options['users'] < 10 or options['programs'] < 1 or options['applications'] < 0:
+            raise CommandError('At least 10 users and 1 program are required.')
+
+        if options['reference_date']:
+            try:
+                today = datetime.strptime(options['reference_date'], '%Y-%m-%d').date()
+            except ValueError:
+                raise CommandError('Invalid date format. Use YYYY-MM-DD.')
+        else:
+            today = timezone.now().date()
+
+        if User.objects.filter(username__startswith=f'{self.prefix}_').exists():
+            raise CommandError(
+                f"A dataset with prefix '{self.prefix}' already exists. Run with --clear first."
+            )
+
+        self.rng = random.Random(options['seed'])
+        self.reference_time = timezone.make_aware(datetime.combine(today, datetime.min.time()))
+
+        students, staff = self.create_users(options['users'])
+        if options['applications'] > len(students) * options['programs']:
+            raise CommandError('Too many applications for the number of students and programs.')
+
+        programs = self.create_programs(options['programs'], today, staff)
+        self.create_applications(options['applications'], students, programs, today)
+        self.create_application_details(students, programs, staff)
+        # Bulk inserts send no signals, so drop cached program lists explicitly
+        invalidate_program_catalog()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated {len(students) + sum(len(ids) for ids in staff.values())} users, "
+            f"{len(programs)} programs and {options['applications']} applications"
+        ))
+
+    def clear(self):
+        with disable_auditlog():
+            deleted, _ = LogEntry.objects.filter(additional_data__source=AUDIT_SOURCE).delete()
+            self.stdout.write(f'Deleted {deleted} audit entries')
+            # Programs first, so that deleting users has no faculty leads to backfill
+            deleted, _ = Program.objects.filter(title__startswith=f'[{self.prefix}] ').delete()
+            self.stdout.write(f'Deleted {deleted} program rows (including applications)')
+            deleted, _ = User.objects.filter(username__startswith=f'{self.prefix}_').delete()
+            self.stdout.write(f'Deleted {deleted} user rows')
+        invalidate_program_catalog()
+        self.stdout.write(self.style.SUCCESS(f"Cleared dataset '{self.prefix}'"))
+
+    def bulk_insert(self, model, objects):
+        """Insert `objects` in batches and return the number of rows written."""
+        for start in range(0, len(objects), self.batch_size):
+            with transaction.atomic():
+                model.objects.bulk_create(objects[start:start + self.batch_size])
+        return len(objects)
+
+    def random_time(self, days_before, days_after=0):
+        """A datetime within the given window around the reference date."""
+        offset = self.rng.randint(-days_before * 86400, days_after * 86400)
+        return self.reference_time + timedelta(seconds=offset)
+
+    def create_users(self, count):
+        """
+        Create `count` users and return (students, staff), where students maps
+        user id to display name and staff maps a role to a list of user ids.
+        """
+        # Hashing is deliberately slow, so every generated user shares one hash
+        password = make_password('guest')
+        roles = (
+            ['faculty'] * max(1, count // 50)
+            + ['reviewer'] * max(1, count // 100)
+            + ['partner'] * max(1, count // 200)
+            + ['admin'] * max(1, count // 1000)
+        )
+        roles += ['student'] * (count - len(roles))
+        self.rng.shuffle(roles)
+
+        users = []
+        # Fetched at the reference date, like the rest of the data
+        fetched_at = self.reference_time
+        for n, role in enumerate(roles, start=1):
+            username = f'{self.prefix}_user{n:06d}'
+            transcript = None
+            if role == 'student' and self.rng.random() < 0.5:
+                transcript = {
+                    course: self.rng.choice(GRADES)
+                    for course in self.rng.sample(COURSES, self.rng.randint(3, 8))
+                }
+            users.append(User(
+                username=username,
+                password=password,
+                display_name=f'{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}',
+                email=f'{username}@example.com',
+                is_admin=role == 'admin',
+                is_faculty=role in ('faculty', 'admin'),
+                is_reviewer=role == 'reviewer',
+                is_provider_partner=role == 'partner',
+                ulink_transcript=transcript,
+                ulink_transcript_fetched_at=fetched_at if transcript else None,
+                ulink_transcript_etag=transcript_etag(transcript) if transcript else '',
+            ))
+        self.bulk_insert(User, users)
+
+        # MySQL does not return primary keys from bulk_create, so read them back
+        students = {}
+        staff = {'admin': [], 'faculty': [], 'reviewer': [], 'partner': []}
+        rows = User.objects.filter(username__startswith=f'{self.prefix}_').order_by('id').values_list(
+            'id', 'display_name', 'is_admin', 'is_faculty', 'is_reviewer', 'is_provider_partner'
+        )
+        for user_id, display_name, is_admin, is_faculty, is_reviewer, is_partner in rows.iterator():
+            if is_admin:
+                staff['admin'].append(user_id)
+            elif is_faculty:
+                staff['faculty'].append(user_id)
+            elif is_reviewer:
+                staff['reviewer'].append(user_id)
+            elif is_partner:
+                staff['partner'].append(user_id)
+            else:
+                students[user_id] = display_name
+
+        self.stdout.write(f'Created {count} users ({len(students)} students)')
+        return students, staff
+
+    def create_programs(self, count, today, staff):
+        """
+        Create `count` programs with their faculty leads, provider partners and
+        questions, and return a dict mapping program id to (title, start_date, end_date).
+        """
+        programs = []
+        for n in range(1, count + 1):
+            # Spread programs from about two years ago to one year ahead
+            open_date = today + timedelta(days=self.rng.randint(-800, 300))
+            deadline = open_date + timedelta(days=self.rng.randint(30, 90))
+            essential_deadline = deadline + timedelta(days=self.rng.randint(7, 30))
+            start_date = essential_deadline + timedelta(days=self.rng.randint(14, 60))
+            end_date = start_date + timedelta(days=self.rng.randint(30, 120))
+            track_payment = self.rng.random() < 0.3
+            programs.append(Program(
+                title=f'[{self.prefix}] {self.rng.choice(SUBJECTS)} in {self.rng.choice(CITIES)} #{n}',
+                year=str(start_date.year),
+                semester='Spring' if start_date.month < 5 else 'Summer' if start_date.month < 8 else 'Fall',
+                description='Generated program for load testing.',
+                application_open_date=open_date,
+                application_deadline=deadline,
+                essential_document_deadline=essential_deadline,
+                payment_deadline=essential_deadline if track_payment else None,
+                start_date=start_date,
+                end_date=end_date,
+                track_payment=track_payment,
+                prerequisites=self.rng.sample(COURSES, self.rng.randint(1, 2)) if self.rng.random() < 0.3 else [],
+            ))
+        self.bulk_insert(Program, programs)
+
+        program_rows = {
+            program_id: (title, start_date, end_date)
+            for program_id, title, start_date, end_date in Program.objects.filter(
+                title__startswith=f'[{self.prefix}] '
+            ).order_by('id').values_list('id', 'title', 'start_date', 'end_date')
+        }
+
+        leads = staff['faculty'] + staff['admin']
+        lead_rows = []
+        partner_rows = []
+        questions = []
+        for program_id in program_rows:
+            for lead_id in self.rng.sample(leads, min(len(leads), self.rng.randint(1, 2))):
+                lead_rows.append(Program.faculty_leads.through(program_id=program_id, user_id=lead_id))
+            if staff['partner'] and self.rng.random() < 0.2:
+                partner_rows.append(Program.provider_partners.through(
+                    program_id=program_id, user_id=self.rng.choice(staff['partner'])
+                ))
+            for text in DEFAULT_QUESTIONS:
+                questions.append(ApplicationQuestion(program_id=program_id, text=text, is_required=True))
+        self.bulk_insert(Program.faculty_leads.through, lead_rows)
+        self.bulk_insert(Program.provider_partners.through, partner_rows)
+        self.bulk_insert(ApplicationQuestion, questions)
+
+        self.stdout.write(f'Created {count} programs with {len(questions)} questions')
+        return program_rows
+
+    def create_applications(self, count, students, programs, today):
+        student_ids = list(students)
+        program_ids = list(programs)
+        seen = set()
+        batch = []
+        created = 0
+
+        while created < count:
+            student_id = self.rng.choice(student_ids)
+            program_id = self.rng.choice(program_ids)
+            if (student_id, program_id) in seen:
+                continue
+            seen.add((student_id, program_id))
+
+            _, start_date, end_date = programs[program_id]
+            if end_date < today:
+                statuses = PAST_STATUSES
+            elif start_date <= today:
+                statuses = CURRENT_STATUSES
+            else:
+                statuses = FUTURE_STATUSES
+            status = self.rng.choices(
+                [name for name, _ in statuses], weights=[weight for _, weight in statuses]
+            )[0]
+
+            batch.append(Application(
+                student_id=student_id,
+                program_id=program_id,
+                date_of_birth=today - timedelta(days=self.rng.randint(18 * 365, 30 * 365)),
+                gpa=round(self.rng.uniform(2.0, 4.0), 3),
+                major=self.rng.choice(MAJORS),
+                status=status,
+                payment_status=self.rng.choice(['Unpaid', 'Partially', 'Fully']),
+            ))
+            created += 1
+
+            if len(batch) >= self.batch_size:
+                self.bulk_insert(Application, batch)
+                batch = []
+        self.bulk_insert(Application, batch)
+
+        self.stdout.write(f'Created {count} applications')
+
+    def create_application_details(self, students, programs, staff):
+        """
+        Create responses, documents, notes, letters and audit entries for the
+        generated applications, reading them back in batches.
+        """
+        question_ids = {}
+        for question_id, program_id in ApplicationQuestion.objects.filter(
+            program__title__startswith=f'[{self.prefix}] '
+        ).order_by('id').values_list('id', 'program_id'):
+            question_ids.setdefault(program_id, []).append(question_id)
+
+        note_authors = staff['admin'] + staff['faculty']
+        doc_types = [doc_type for doc_type, _ in Document.TYPES_OF_DOCS]
+        # One realistically sized signature image, shared by every document
+        # (signatures are stored by content hash, so it is stored once)
+        signature = store_signature(
+            'data:image/png;base64,' + base64.b64encode(PNG_MAGIC + self.rng.randbytes(3000)).decode()
+        )
+        content_type = ContentType.objects.get_for_model(Application)
+        totals = {'responses': 0, 'documents': 0, 'notes': 0, 'letters': 0, 'audit entries': 0}
+
+        applications = Application.objects.filter(
+            program__title__startswith=f'[{self.prefix}] '
+        ).order_by('id').values_list('id', 'student_id', 'program_id', 'status')
+
+        batch = []
+        for row in applications.iterator(chunk_size=self.batch_size):
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                self.create_details_batch(batch, students, programs, question_ids, note_authors,
+                                          doc_types, signature, content_type, totals)
+                batch = []
+        if batch:
+            self.create_details_batch(batch, students, programs, question_ids, note_authors,
+                                      doc_types, signature, content_type, totals)
+
+        self.stdout.write('Created ' + ', '.join(f'{count} {name}' for name, count in totals.items()))
+
+    def create_details_batch(self, batch, students, programs, question_ids, note_authors,
+                             doc_types, signature, content_type, totals):
+        responses = []
+        documents = []
+        notes = []
+        letters = []
+        log_entries = []
+
+        for app_id, student_id, program_id, status in batch:
+            for question_id in question_ids.get(program_id, []):
+                responses.append(ApplicationResponse(
+                    application_id=app_id,
+                    question_id=question_id,
+                    response=self.rng.choice(RESPONSE_TEXTS),
+                ))
+
+            if status in ('Approved', 'Enrolled', 'Completed'):
+                for doc_type in self.rng.sample(doc_types, self.rng.randint(0, len(doc_types))):
+                    documents.append(Document(
+                        application_id=app_id,
+                        title=doc_type,
+                        type=doc_type,
+                        is_electronic=True,
+                        form_data={'name': students[student_id], 'agree': True},
+                        signature_file=signature,
+                    ))
+
+            if note_authors and self.rng.random() < 0.3:
+                for _ in range(self.rng.randint(1, 2)):
+                    notes.append(ConfidentialNote(
+                        application_id=app_id,
+                        author_id=self.rng.choice(note_authors),
+                        content=self.rng.choice(NOTE_TEXTS),
+                        timestamp=self.random_time(days_before=365),
+                    ))
+
+            if self.rng.random() < 0.4:
+                for n in range(self.rng.randint(1, 2)):
+                    fulfilled = self.rng.random() < 0.5
+                    letters.append(LetterOfRecommendation(
+                        application_id=app_id,
+                        writer_name=f'{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}',
+                        writer_email=f'writer{app_id}_{n}@example.com',
+                        pdf=f'recommendation_letters/{app_id}/letter.pdf' if fulfilled else None,
+                        letter_timestamp=self.random_time(days_before=180) if fulfilled else None,
+                        token=uuid.UUID(int=self.rng.getrandbits(128)),
+                    ))
+
+            object_repr = f'{students[student_id]} - {programs[program_id][0]}'
+            log_entries.append(LogEntry(
+                content_type=content_type,
+                object_pk=str(app_id),
+                object_id=app_id,
+                object_repr=object_repr,
+                action=LogEntry.Action.CREATE,
+                changes={'status': ['None', 'Applied']},
+                additional_data={'source': AUDIT_SOURCE},
+                timestamp=self.random_time(days_before=730),
+            ))
+            if status != 'Applied':
+                log_entries.append(LogEntry(
+                    content_type=content_type,
+                    object_pk=str(app_id),
+                    object_id=app_id,
+                    object_repr=object_repr,
+                    action=LogEntry.Action.UPDATE,
+                    changes={'status': ['Applied', status]},
+                    additional_data={'source': AUDIT_SOURCE},
+                    timestamp=self.random_time(days_before=365),
+                ))
+
+        totals['responses'] += self.bulk_insert(ApplicationResponse, responses)
+        totals['documents'] += self.bulk_insert(Document, documents)
+        totals['notes'] += self.bulk_insert(ConfidentialNote, notes)
+        totals['letters'] += self.bulk_insert(LetterOfRecommendation, letters)
+        totals['audit entries'] += self.bulk_insert(LogEntry, log_entries)
@@ -0,0 +1,51 @@
+"""
+Study Abroad Program - Generate Thumbnails Command
+==================================================
+To run this use:
+    docker compose exec backend python manage.py generate_thumbnails
+
+This Django management command generates the resized copies of announcement
+cover images (see api/thumbnails.py). New uploads get them automatically in the
+background, so this is only needed for images uploaded before thumbnails
+existed, or after THUMBNAIL_WIDTHS or THUMBNAIL_FORMATS change (`--all`).
+
+Usage:
+    python manage.py generate_thumbnails
+    python manage.py generate_thumbnails --all
+"""
+
+from django.core.management.base import BaseCommand
+from api.models import Announcement
+from api.thumbnails import generate_cover_variants
+
+
+class Command(BaseCommand):
+    help = 'Generates thumbnails for announcement cover images that do not have them yet.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Regenerate the thumbnails of every cover image'
+        )
+
+    def handle(self, *args, **options):
+        announcements = Announcement.objects.exclude(cover_image='').exclude(cover_image__isnull=True)
+
+        generated = failed = 0
+        for announcement in announcements.order_by('id').iterator():
+            variants = announcement.cover_image_variants or {}
+            if not options['all'] and variants.get('source') == announcement.cover_image.name:
+                continue
+            try:
+                if generate_cover_variants(announcement.id):
+                    generated += 1
+            except Exception as e:
+                failed += 1
+                self.stderr.write(self.style.ERROR(
+                    f'Could not generate thumbnails for announcement {announcement.id}: {e}'
+                ))
+
+        self.stdout.write(self.style.SUCCESS(f'Generated thumbnails for {generated} announcements'))
+        if failed:
+            self.stdout.write(self.style.WARNING(f'{failed} announcements failed'))
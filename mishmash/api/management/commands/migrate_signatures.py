@@ -0,0 +1,98 @@
+"""
+Study Abroad Program - Migrate Signatures Command
+=================================================
+To run this use:
+    docker compose exec backend python manage.py migrate_signatures
+
+This Django management command moves signature images that are still stored
+inline in the Document `signature` / `parent_guardian_signature` columns into
+the signatures storage (see api/signatures.py), and empties the columns.
+
+Documents are processed in batches of `--batch-size`, so only one batch of
+images is held in memory at a time. A document edited while the command runs
+is skipped (the edit already stored its signature as a file). Inline values
+that are not a PNG or SVG image are left in place and reported.
+The command can be re-run safely; it only picks up documents that still have
+an inline signature.
+
+Usage:
+    python manage.py migrate_signatures
+    python manage.py migrate_signatures --dry-run
+    python manage.py migrate_signatures --batch-size 100
+"""
+
+from django.core.management.base import BaseCommand
+from api.models import Document
+from api.signatures import SIGNATURE_KINDS, inline_signature_filter, store_signature
+
+
+class Command(BaseCommand):
+    help = 'Moves inline document signatures into the signatures file storage.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=200,
+            help='Number of documents loaded at a time (default: 200)'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only count the documents that still have inline signatures'
+        )
+
+    def handle(self, *args, **options):
+        pending = Document.objects.filter(inline_signature_filter())
+
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(
+                f'DRY RUN: {pending.count()} documents have inline signatures'
+            ))
+            return
+
+        columns = ['id', 'last_modified']
+        for file_field, inline_field in SIGNATURE_KINDS.values():
+            columns += [file_field, inline_field]
+
+        migrated = skipped = failed = 0
+        last_id = 0
+        while True:
+            batch = list(
+                pending.filter(id__gt=last_id).order_by('id').only(*columns)[:options['batch_size']]
+            )
+            if not batch:
+                break
+            last_id = batch[-1].id
+
+            for document in batch:
+                changes = {}
+                for file_field, inline_field in SIGNATURE_KINDS.values():
+                    value = getattr(document, inline_field)
+                    if not value:
+                        continue
+                    try:
+                        changes[file_field] = store_signature(value)
+                        changes[inline_field] = None
+                    except ValueError as e:
+                        failed += 1
+                        self.stderr.write(self.style.ERROR(f'Document {document.id} {inline_field}: {e}'))
+                if not changes:
+                    continue
+
+                # update() leaves last_modified alone; the filter skips concurrent edits
+                updated = Document.objects.filter(
+                    id=document.id, last_modified=document.last_modified
+                ).update(**changes)
+                if updated:
+                    migrated += 1
+                else:
+                    skipped += 1
+
+            self.stdout.write(f'Processed documents up to id {last_id}')
+
+        self.stdout.write(self.style.SUCCESS(f'Moved the signatures of {migrated} documents'))
+        if skipped:
+            self.stdout.write(self.style.WARNING(f'{skipped} documents changed meanwhile and were skipped'))
+        if failed:
+            self.stdout.write(self.style.WARNING(f'{failed} invalid signatures were left unchanged'))
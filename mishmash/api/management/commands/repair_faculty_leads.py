@@ -0,0 +1,57 @@
+"""
+Study Abroad Program - Repair Faculty Leads Command
+===================================================
+To run this use:
+    docker compose exec backend python manage.py repair_faculty_leads
+
+This Django management command is a one-off repair for programs that were saved
+without any faculty lead. Every such program gets the default admin account as
+its faculty lead. New writes enforce this invariant automatically (see
+api/faculty_leads.py), so this only needs to run once on existing data.
+
+Usage:
+    python manage.py repair_faculty_leads
+    python manage.py repair_faculty_leads --dry-run
+"""
+
+from django.core.management.base import BaseCommand
+from api.faculty_leads import (
+    DEFAULT_FACULTY_LEAD_USERNAME,
+    backfill_faculty_leads,
+    get_default_faculty_lead,
+    programs_without_faculty_leads,
+)
+
+
+class Command(BaseCommand):
+    help = 'Adds the default admin as faculty lead to programs without any faculty leads.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only list the programs that would be repaired'
+        )
+
+    def handle(self, *args, **options):
+        programs = list(programs_without_faculty_leads().order_by('id'))
+
+        if not programs:
+            self.stdout.write(self.style.SUCCESS('All programs have at least one faculty lead.'))
+            return
+
+        for program in programs:
+            self.stdout.write(f'Program without faculty leads: {program.title} (id={program.id})')
+
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(f'DRY RUN: Would repair {len(programs)} programs'))
+            return
+
+        if get_default_faculty_lead() is None:
+            self.stderr.write(self.style.ERROR(
+                f"Default faculty lead '{DEFAULT_FACULTY_LEAD_USERNAME}' does not exist. No programs repaired."
+            ))
+            return
+
+        repaired = backfill_faculty_leads([program.id for program in programs])
+        self.stdout.write(self.style.SUCCESS(f'Repaired {repaired} programs'))
@@ -0,0 +1,74 @@
+"""
+Study Abroad Program - Run Transcript Worker Command
+====================================================
+To run this use:
+    docker compose exec backend python manage.py run_transcript_worker
+
+This Django management command runs transcript refresh workers (see
+api/transcript_jobs.py) in the foreground until interrupted. By default the web
+server runs its own workers (TRANSCRIPT_REFRESH_IN_PROCESS in settings.py); use
+this command when those are turned off, or to work through a backlog of queued
+jobs with `--once`, which exits as soon as the queue is empty.
+
+Usage:
+    python manage.py run_transcript_worker
+    python manage.py run_transcript_worker --concurrency 4
+    python manage.py run_transcript_worker --once
+"""
+
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from api.transcript_jobs import run_worker, worker_name
+
+
+class Command(BaseCommand):
+    help = 'Runs transcript refresh workers until interrupted.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=settings.TRANSCRIPT_REFRESH_WORKERS,
+            help=f'Number of jobs run at once (default: {settings.TRANSCRIPT_REFRESH_WORKERS})'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Exit once no job is due instead of waiting for new ones'
+        )
+
+    def handle(self, *args, **options):
+        concurrency = options['concurrency']
+        if concurrency < 1:
+            raise CommandError('--concurrency must be at least 1.')
+
+        stop_event = threading.Event()
+        processed = []
+
+        def work(index):
+            processed.append(
+                run_worker(worker_name(index), stop_event=stop_event, exit_when_idle=options['once'])
+            )
+
+        threads = [
+            threading.Thread(target=work, args=(index,), name=f'transcript-worker-{index}')
+            for index in range(concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        self.stdout.write(f'Started {concurrency} transcript workers')
+
+        try:
+            for thread in threads:
+                # join() with a timeout so Ctrl+C is handled promptly
+                while thread.is_alive():
+                    thread.join(1)
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING('Stopping after the running jobs finish...'))
+            stop_event.set()
+            for thread in threads:
+                thread.join()
+
+        self.stdout.write(self.style.SUCCESS(f'Ran {sum(processed)} transcript refresh jobs'))
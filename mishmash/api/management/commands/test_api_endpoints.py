@@ -1,9 +1,11 @@
+import json
 from django.core.management.base import BaseCommand
 from rest_framework.test import APIClient
 from django.utils.timezone import now
 from datetime import timedelta
 from api.models import Program, User, Application, ApplicationQuestion, ApplicationResponse
-from django.db import transaction
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
 
 
 class Command(BaseCommand):
@@ -125,6 +127,18 @@ class Command(BaseCommand):
                 print(f"WARNING: Expected JSON error response, but got non-JSON response (likely an HTML error page).")
                 warnings[0] += 1
 
+    @staticmethod
+    def check_query_count(query_counts, *, success_message, error_message, total_tests=None, passed_tests=None, failed_tests=None, warnings=None):
+        """Helper function to check that a list of query counts is constant (no N+1 queries)."""
+        total_tests[0] += 1
+
+        if len(set(query_counts)) == 1:
+            print(f"PASSED: {success_message} ({query_counts[0]} queries)")
+            passed_tests[0] += 1
+        else:
+            print(f"FAILED: {error_message} (Query counts {query_counts})")
+            failed_tests[0] += 1
+
     def test_user_endpoints(self, client):
         """
         API Endpoints:
@@ -132,6 +146,7 @@ class Command(BaseCommand):
         GET     /api/users/                       List all users                  IsAuthenticated, IsAdminOrSelf None                      List of users (admin), self (student)          403 if unauthorized
         GET     /api/users/{id}/                  Retrieve specific user          IsAuthenticated, IsAdminOrSelf id                        User details                                   403 if unauthorized, 404 if not found
         GET     /api/users/current_user/          Get current user                IsAuthenticated                None                      User details                                   401 if not authenticated
+        GET     /api/users/me/dashboard/          Get current user's dashboard    IsAuthenticated                exclude_ended (optional)  {"programs":[{"program":{...},"application":{...}}]} 401 if not authenticated
         POST    /api/users/signup/                Register a new user             AllowAny                       username, password        {"token":"<auth_token>","user":{user details}} 400 if missing credentials
         POST    /api/users/login/                 Authenticate user               AllowAny                       username, password        {"token":"<auth_token>","user":{user details}} 401 if invalid credentials
         POST    /api/users/logout/                Logout user                     IsAuthenticated                None                      {"detail":"Successfully logged out"}           400 if already logged out
@@ -177,6 +192,12 @@ class Command(BaseCommand):
                     error_message="Fetching current user details failed.",
                     total_tests=total_tests, passed_tests=passed_tests, failed_tests=failed_tests, warnings=warnings)
 
+        # Fetch the current user's dashboard
+        response = client.get("/api/users/me/dashboard/")
+        Command.check_response(response, 200, success_message="Fetching current user dashboard succeeded.",
+                    error_message="Fetching current user dashboard failed.",
+                    total_tests=total_tests, passed_tests=passed_tests, failed_tests=failed_tests, warnings=warnings)
+
         # Logout user
         response = client.post("/api/users/logout/")
         Command.check_response(response, 200, success_message="Logout successful.",
@@ -251,6 +272,7 @@ class Command(BaseCommand):
         DELETE /api/programs/{id}/                    Delete a program                       IsAdminOrReadOnly          id (Program ID)               204 No Content                                    403 if unauthorized, 404 if not found
         GET    /api/programs/{id}/application_status/ Get user's application status          IsAuthenticated            id (Program ID)               {"status":"Applied","application_id":12}          401 if not authenticated
         GET    /api/programs/{id}/applicant_counts/   Get applicant counts for a program    AllowAny                    id (Program ID)               {"applied":10,"enrolled":5,"withdrawn":2,"canceled":1,"total_active":15} None
+        GET    /api/programs/applicant_counts/        Get applicant counts for many programs AllowAny                   ids=<id>,<id> (optional)      {"<id>":{"applied":10,...,"total_active":15}}     400 if ids invalid
         GET    /api/programs/{id}/questions/          Get application questions for program AllowAny                    id (Program ID)               List of questions                                 None
         '''
 
@@ -281,7 +303,7 @@ class Command(BaseCommand):
             "start_date": now().date(),
             "end_date": now().date() + timedelta(days=10),
         }
-        response = client.post("/api/programs/", bad_program_data)
+        response = client.post("/api/programs/", bad_program_data, format="json")
         Command.check_response(response, 400, success_message="Rejected program with application deadline before open date.",
                             error_message="Program creation should have failed due to invalid application dates.",
                             total_tests=total_tests, passed_tests=passed_tests, failed_tests=failed_tests, warnings=warnings)
@@ -290,7 +312,7 @@ class Command(BaseCommand):
         bad_program_data["application_deadline"] = now().date() + timedelta(days=10)  # Fix previous issue
         bad_program_data["start_date"] = now().date() + timedelta(days=5)
         bad_program_data["end_date"] = now().date()  # Invalid: End date before start date
-        response = client.post("/api/programs/", bad_program_data)
+        response = client.post("/api/programs/", bad_program_data, format="json")
         Command.check_response(response, 400, success_message="Rejected program with end date before start date.",
                             error_message="Program creation should have failed due to invalid start/end dates.",
                             total_tests=total_tests, passed_tests=passed_tests, failed_tests=failed_tests, warnings=warnings)
@@ -298,7 +320,7 @@ class Command(BaseCommand):
         # Invalid date format
         bad_program_data["start_date"] = "invalid-date"  # Invalid date format
         bad_program_data["end_date"] = now().date() + timedelta(days=10)
-        response = client.post("/api/programs/", bad_program_data)
+        response = client.post("/api/programs/", bad_program_data, format="json")
         Command.check_response(response, 400, success_message="Rejected program with invalid date format.",
                             error_message="Program creation should have failed due to invalid date format.",
                             total_tests=total_tests, passed_tests=passed_tests, failed_tests=failed_tests, warnings=warnings)
@@ -319,7 +341,7 @@ class Command(BaseCommand):
             "start_date": (now().date() + timedelta(days=20)).strftime("%Y-%m-%d"),
             "end_date": (now().date() + timedelta(days=30)).strftime("%Y-%m-%d"),
         }
-        response = client.post("/api/programs/", valid_program_data)
+        response = client.post("/api/programs/", valid_program_data, format="json")
         Command.check_response(response, 201, success_message="Program created successfully by admin.",
                             error_message="Program creation failed for admin.",
                             total_tests=total_tests, passed_tests=passed_tests, failed_tests=failed_tests, warnings=warnings)
@@ -332,7 +354,8 @@ class Command(BaseCommand):
                             total_tests=total_tests, passed_tests=passed_tests, failed_tests=failed_tests, warnings=warnings)
 
         # Attempt to update program as an admin
-        response = client.patch(f"/api/programs/{program_id}/", {"description": "Updated description"})
+        # Updates validate the full set of dates, as the program form sends them
+        response = client.put(f"/api/programs/{program_id}/", {**valid_program_data, "description": "Updated description"}, format="json")
         Command.check_response(response, 200, success_message="Program updated successfully by admin.",
                             error_message="Program update failed for admin.",
                             total_tests=total_tests, passed_tests=passed_tests, failed_tests=failed_tests, warnings=warnings)
@@ -343,12 +366,42 @@ class Command(BaseCommand):
                             error_message="Fetching applicant counts failed.",
                             total_tests=total_tests, passed_tests=passed_tests, failed_tests=failed_tests, warnings=warnings)
 
+        # Retrieve applicant counts for several programs at once
+        response = client.get(f"/api/programs/applicant_counts/?ids={program_id}")
+        Command.check_response(response, 200, success_message="Fetched batch applicant counts successfully.",
+                            error_message="Fetching batch applicant counts failed.",
+                            total_tests=total_tests, passed_tests=passed_tests, failed_tests=failed_tests, warnings=warnings)
+
+        response = client.get("/api/programs/applicant_counts/?ids=abc")
+        Command.check_response(response, 400, success_message="Rejected batch applicant counts with invalid ids.",
+                            error_message="Batch applicant counts should have failed for invalid ids.",
+                            total_tests=total_tests, passed_tests=passed_tests, failed_tests=failed_tests, warnings=warnings)
+
         # Retrieve program questions (open to all)
         response = client.get(f"/api/programs/{program_id}/questions/")
         Command.check_response(response, 200, success_message="Fetched application questions successfully.",
                             error_message="Fetching application questions failed.",
                             total_tests=total_tests, passed_tests=passed_tests, failed_tests=failed_tests, warnings=warnings)
 
+        # The program list must render in a constant number of queries,
+        # no matter how many programs, faculty leads and partners there are
+        query_counts = []
+        for i in range(3):
+            extra_program = Program.objects.create(
+                title=f"Query Count Program {i}",
+                year="2025", semester="Fall",
+                end_date=now().date() + timedelta(days=30),
+            )
+            extra_lead = User.objects.create_user(username=f"query_count_faculty_{i}", password="facultypass", is_faculty=True)
+            extra_program.faculty_leads.add(admin, extra_lead)
+            # Paginated lists are not served from the catalog cache
+            with CaptureQueriesContext(connection) as queries:
+                response = client.get("/api/programs/?page_size=100")
+            query_counts.append(len(queries))
+        Command.check_query_count(query_counts, success_message="Program list query count is constant.",
+                            error_message="Program list query count grows with the number of programs.",
+                            total_tests=total_tests, passed_tests=passed_tests, failed_tests=failed_tests, warnings=warnings)
+
         # Attempt to delete program as a student (unauthorized)
         client.force_authenticate(user=student)
         response = client.delete(f"/api/programs/{program_id}/")
@@ -424,6 +477,17 @@ class Command(BaseCommand):
 
         application_id = response.data["id"]
 
+        # Student applies to the same program again (should be rejected)
+        response = client.post("/api/applications/", {
+            "program": program.id,
+            "date_of_birth": "2000-01-01",
+            "gpa": 3.8,
+            "major": "Computer Science",
+        })
+        Command.check_response(response, 400, success_message="Duplicate application was correctly rejected.",
+                            error_message="Duplicate application should have been rejected.",
+                            total_tests=total_tests, passed_tests=passed_tests, failed_tests=failed_tests, warnings=warnings)
+
         # Student attempts to enroll themselves (should be denied)
         response = client.patch(f"/api/applications/{application_id}/", {"status": "Enrolled"})
         Command.check_response(response, 403, success_message="Student was correctly prevented from enrolling themselves.",
@@ -455,6 +519,12 @@ class Command(BaseCommand):
                             error_message="Admin failed to cancel application.",
                             total_tests=total_tests, passed_tests=passed_tests, failed_tests=failed_tests, warnings=warnings)
 
+        # Admin lists the program's applicants with embedded student and program details
+        response = client.get(f"/api/applications/?program={program.id}&expand=student,program")
+        Command.check_response(response, 200, success_message="Listed applications with expanded student and program.",
+                            error_message="Listing applications with expand failed.",
+                            total_tests=total_tests, passed_tests=passed_tests, failed_tests=failed_tests, warnings=warnings)
+
         # Validate date of birth must be at least 10 years ago
         invalid_dob = (now().date() - timedelta(days=9 * 365)).strftime("%Y-%m-%d")  # 9 years old
         response = client.post("/api/applications/", {
@@ -535,11 +605,13 @@ class Command(BaseCommand):
             "essential_document_deadline": now().date() + timedelta(days=10),
             "start_date": now().date() + timedelta(days=20),
             "end_date": now().date() + timedelta(days=30),
+            # Sent by the program form, which pre-fills the default questions
+            "questions": ["Why do you want to join this program?", "What do you hope to learn?"],
         }
         
-        response = client.post("/api/programs/", program_data)
-        Command.check_response(response, 201, success_message="Program created successfully (questions should be auto-generated).",
-                            error_message="Failed to create program and auto-generate questions.",
+        response = client.post("/api/programs/", program_data, format="json")
+        Command.check_response(response, 201, success_message="Program created successfully with its questions.",
+                            error_message="Failed to create program with its questions.",
                             total_tests=total_tests, passed_tests=passed_tests, failed_tests=failed_tests, warnings=warnings)
 
         program_id = response.data["id"]
@@ -552,7 +624,7 @@ class Command(BaseCommand):
                             total_tests=total_tests, passed_tests=passed_tests, failed_tests=failed_tests, warnings=warnings)
 
         # Ensure questions exist
-        assert len(response.data) > 0, "No questions were automatically generated when the program was created."
+        assert len(response.data) > 0, "No questions were created with the program."
         
         question_id = response.data[0]["id"]  # Take the first question
 
@@ -632,11 +704,13 @@ class Command(BaseCommand):
             "essential_document_deadline": now().date() + timedelta(days=10),
             "start_date": now().date() + timedelta(days=20),
             "end_date": now().date() + timedelta(days=30),
+            # Sent by the program form, which pre-fills the default questions
+            "questions": ["Why do you want to join this program?", "What do you hope to learn?"],
         }
         
-        response = client.post("/api/programs/", program_data)
-        Command.check_response(response, 201, success_message="Program created successfully (questions should be auto-generated).",
-                            error_message="Failed to create program and auto-generate questions.",
+        response = client.post("/api/programs/", program_data, format="json")
+        Command.check_response(response, 201, success_message="Program created successfully with its questions.",
+                            error_message="Failed to create program with its questions.",
                             total_tests=total_tests, passed_tests=passed_tests, failed_tests=failed_tests, warnings=warnings)
 
         program_id = response.data["id"]
@@ -648,7 +722,7 @@ class Command(BaseCommand):
                             error_message="Failed to retrieve questions.",
                             total_tests=total_tests, passed_tests=passed_tests, failed_tests=failed_tests, warnings=warnings)
 
-        assert len(response.data) > 0, "No questions were automatically generated when the program was created."
+        assert len(response.data) > 0, "No questions were created with the program."
         question_id = response.data[0]["id"]
 
         # Student submits an application for the program
@@ -743,6 +817,7 @@ class Command(BaseCommand):
         API Endpoints:
         Method Endpoint                         Description                     Permission Classes Arguments                 Expected Response Errors
         GET    /api/announcements/              List all active announcements   AllowAny          None                     List of announcements None
+        GET    /api/announcements/?fields=summary List announcements without content AllowAny        fields=summary          List of announcements 400 for unknown fields
         POST   /api/announcements/              Create new announcement         IsAuthenticated, IsAdmin Announcement fields (JSON) Created announcement details 403 if unauthorized
         GET    /api/announcements/{id}/         Retrieve specific announcement  AllowAny          id (Announcement ID)    Announcement details 404 if not found
         PATCH  /api/announcements/{id}/         Update an announcement         IsAuthenticated, IsAdmin Announcement fields Updated announcement details 403 if unauthorized, 404 if not found
@@ -775,11 +850,12 @@ class Command(BaseCommand):
         client.force_authenticate(user=admin)
         announcement_data = {
             "title": "Test Announcement",
-            "content": {"text": "This is a test announcement."},  # Ensure valid JSON
+            "content": json.dumps({"text": "This is a test announcement."}),  # Sent as a JSON string, like the admin form
             "importance": "medium",
             "is_active": True
         }
-        response = client.post("/api/announcements/", announcement_data, format='json')
+        # Announcements accept form data only, for the cover image upload
+        response = client.post("/api/announcements/", announcement_data, format='multipart')
         Command.check_response(response, 201, success_message="Admin successfully created an announcement.",
                             error_message="Admin failed to create an announcement.",
                             total_tests=total_tests, passed_tests=passed_tests, failed_tests=failed_tests, warnings=warnings)
@@ -792,6 +868,21 @@ class Command(BaseCommand):
                             error_message="Failed to retrieve a specific announcement.",
                             total_tests=total_tests, passed_tests=passed_tests, failed_tests=failed_tests, warnings=warnings)
 
+        # Fetch the announcement list without content
+        response = client.get("/api/announcements/?fields=summary")
+        Command.check_response(response, 200, success_message="Successfully retrieved the announcement summaries.",
+                            error_message="Failed to retrieve the announcement summaries.",
+                            total_tests=total_tests, passed_tests=passed_tests, failed_tests=failed_tests, warnings=warnings)
+        if response.status_code == 200 and any("content" in announcement for announcement in response.json()):
+            print("WARNING: Announcement summaries should not include the content.")
+            warnings[0] += 1
+
+        # Request an unknown field (should fail)
+        response = client.get("/api/announcements/?fields=not_a_field")
+        Command.check_response(response, 400, success_message="Requesting an unknown field failed as expected.",
+                            error_message="Requesting an unknown field should have failed.",
+                            total_tests=total_tests, passed_tests=passed_tests, failed_tests=failed_tests, warnings=warnings)
+
         # Update an announcement (admin only)
         client.force_authenticate(user=admin)
         updated_data = {"title": "Updated Announcement Title"}
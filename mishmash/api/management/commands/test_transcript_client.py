@@ -0,0 +1,228 @@
+"""
+Study Abroad Program - Test Transcript Client Command
+=====================================================
+To run this use:
+    docker compose exec backend python manage.py test_transcript_client
+
+This Django management command checks the transcript provider HTTP client
+(api/transcript_providers/http.py) and the Ulink scraper against a local stub
+server that mimics Ulink's `view-pin.pl` and `view-schedule.pl` pages. It does
+not contact the real Ulink or use the database.
+
+The stub's behaviour is chosen by the requested username:
+    slow-*   answers after the client's read timeout
+    flaky-*  answers 503 twice, then normally
+    down-*   always answers 500
+    anything else answers normally
+
+Checked: PIN and transcript parsing, connection reuse, retries, timeouts and
+the circuit breaker.
+
+Usage:
+    python manage.py test_transcript_client
+"""
+
+import threading
+import time
+from base64 import b64encode
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from django.core.management.base import BaseCommand, CommandError
+from api.transcript_providers.http import (
+    ProviderHTTPClient,
+    ProviderUnavailableError,
+    TranscriptProviderError,
+)
+from api.transcript_providers.ulink import UlinkProvider
+from api.transcript_providers.ulink_scraper import (
+    ULINK_AUTH,
+    ULINK_PIN_ENDPOINT,
+    ULINK_SCHEDULE_ENDPOINT,
+    get_ulink_pin,
+    refresh_ulink_transcript,
+)
+
+STUB_PIN = "4581"
+STUB_SCHEDULE = """siss% schedule
+SISS Record for {username}
+-----------------------------------------------
+BIOL 101             GENERAL BIOLOGY                A-
+ECE 458              SOFTWARE ENGINEERING           IP
+MATH 212             MULTIVARIABLE CALCULUS         S
+"""
+READ_TIMEOUT = 0.5
+
+
+class StubUlinkHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 so connections are kept alive between requests
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        username = parse_qs(url.query).get("username", [""])[0]
+        self.server.hits[username] = self.server.hits.get(username, 0) + 1
+
+        expected_auth = "Basic " + b64encode(":".join(ULINK_AUTH).encode()).decode()
+        if self.headers.get("Authorization") != expected_auth:
+            return self.reply(401, "Unauthorized")
+        if username.startswith("down-"):
+            return self.reply(500, "Internal Server Error")
+        if username.startswith("flaky-") and self.server.hits[username] <= 2:
+            return self.reply(503, "Service Unavailable")
+        if username.startswith("slow-"):
+            time.sleep(READ_TIMEOUT * 2)
+
+        if url.path == ULINK_PIN_ENDPOINT:
+            return self.reply(200, f"<html><body>PIN for '{username}': <b>{STUB_PIN}</b></body></html>")
+        if url.path == ULINK_SCHEDULE_ENDPOINT:
+            return self.reply(200, f"<html><body><pre>{STUB_SCHEDULE.format(username=username)}</pre></body></html>")
+        return self.reply(404, "Not Found")
+
+    def reply(self, status, body):
+        content = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        try:
+            self.wfile.write(content)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up waiting (slow-* users)
+            pass
+
+
+class Command(BaseCommand):
+    help = 'Tests the transcript provider HTTP client against a local stub of Ulink.'
+
+    def handle(self, *args, **options):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), StubUlinkHandler)
+        server.daemon_threads = True
+        server.connections = 0
+        server.hits = {}
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+        self.passed = 0
+        self.failed = 0
+        try:
+            self.test_parsing(server)
+            self.test_retries(server)
+            self.test_timeout(server)
+            self.test_circuit_breaker(server)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        self.stdout.write(f'\nPassed: {self.passed}, Failed: {self.failed}')
+        if self.failed:
+            raise CommandError(f'{self.failed} transcript client check(s) failed.')
+        self.stdout.write(self.style.SUCCESS('All transcript client checks passed.'))
+
+    def make_client(self, **overrides):
+        options = dict(
+            name="Ulink stub",
+            auth=ULINK_AUTH,
+            connect_timeout=1,
+            read_timeout=READ_TIMEOUT,
+            retries=2,
+            backoff_factor=0,
+            failure_threshold=3,
+            reset_timeout=0.5,
+        )
+        options.update(overrides)
+        return ProviderHTTPClient(self.base_url, **options)
+
+    def expect(self, condition, message):
+        if condition:
+            self.passed += 1
+            self.stdout.write(f'PASSED: {message}')
+        else:
+            self.failed += 1
+            self.stdout.write(self.style.ERROR(f'FAILED: {message}'))
+
+    def test_parsing(self, server):
+        client = self.make_client()
+        provider = UlinkProvider(client=client)
+        connections_before = server.connections
+
+        pin = get_ulink_pin("jdoe", client=client)
+        self.expect(pin == STUB_PIN, f"PIN is scraped from view-pin.pl (got {pin!r})")
+        self.expect(
+            provider.validate_account({"ulink_username": "jdoe", "ulink_pin": STUB_PIN}),
+            "UlinkProvider validates the account through the client",
+        )
+
+        transcript = refresh_ulink_transcript("jdoe", client=client)
+        expected = {"BIOL 101": "A-", "ECE 458": "IP", "MATH 212": "S"}
+        self.expect(transcript == expected, f"Transcript is parsed from view-schedule.pl (got {transcript})")
+
+        self.expect(
+            server.connections - connections_before == 1,
+            f"Requests reuse one kept-alive connection ({server.connections - connections_before} opened)",
+        )
+
+        wrong_auth = self.make_client(auth=("abroad", "wrong"))
+        try:
+            get_ulink_pin("jdoe", client=wrong_auth)
+            self.expect(False, "Rejected credentials raise an error")
+        except TranscriptProviderError:
+            self.expect(False, "Rejected credentials are not treated as an outage")
+        except ConnectionError:
+            self.expect(wrong_auth.breaker.state == "closed", "Rejected credentials raise an error but do not trip the breaker")
+
+    def test_retries(self, server):
+        client = self.make_client()
+        transcript = refresh_ulink_transcript("flaky-1", client=client)
+        self.expect(
+            bool(transcript) and server.hits["flaky-1"] == 3,
+            f"503 responses are retried ({server.hits['flaky-1']} attempts)",
+        )
+
+        try:
+            refresh_ulink_transcript("down-1", client=client)
+            self.expect(False, "500 responses raise TranscriptProviderError")
+        except TranscriptProviderError:
+            self.expect(server.hits["down-1"] == 1, f"500 responses fail without retrying ({server.hits['down-1']} attempts)")
+
+    def test_timeout(self, server):
+        client = self.make_client(retries=1)
+        started = time.monotonic()
+        try:
+            get_ulink_pin("slow-1", client=client)
+            self.expect(False, "A slow response raises TranscriptProviderError")
+        except TranscriptProviderError:
+            elapsed = time.monotonic() - started
+            # Two attempts, each bounded by the read timeout
+            self.expect(elapsed < READ_TIMEOUT * 3, f"A slow response times out after {elapsed:.2f}s")
+
+    def test_circuit_breaker(self, server):
+        client = self.make_client(retries=0)
+        for _ in range(3):
+            try:
+                get_ulink_pin("down-2", client=client)
+            except TranscriptProviderError:
+                pass
+        self.expect(client.breaker.state == "open", "The breaker opens after 3 consecutive failures")
+
+        hits = server.hits["down-2"]
+        try:
+            get_ulink_pin("down-2", client=client)
+            self.expect(False, "An open breaker rejects calls")
+        except ProviderUnavailableError:
+            self.expect(server.hits["down-2"] == hits, "An open breaker rejects calls without contacting the provider")
+
+        time.sleep(client.breaker.reset_timeout)
+        self.expect(client.breaker.state == "half-open", "The breaker lets a trial call through after the reset timeout")
+        pin = get_ulink_pin("jdoe", client=client)
+        self.expect(
+            pin == STUB_PIN and client.breaker.state == "closed",
+            "A successful trial call closes the breaker",
+        )
@@ -0,0 +1,157 @@
+"""
+Query Instrumentation Middleware
+================================
+
+Measures the database work done by every request:
+- the number of SQL queries and the total time spent executing them
+- duplicate query shapes, i.e. the same parameterized SQL run more than once,
+  which is how N+1 query loops show up
+
+The numbers are logged with structured `extra` fields. They are also returned
+in a `Server-Timing` header (visible in the browser dev tools network tab), in
+DEBUG or to signed-in admins only, since they reveal how much work a request
+does to anyone who can see the response.
+
+Views can declare a query budget, either for every action or per viewset
+action, counting every query made while handling the request (including the
+session and user lookups done by authentication):
+
+    class ProgramViewSet(viewsets.ModelViewSet):
+        query_budget = {"list": 5, "retrieve": 5}
+
+When `settings.QUERY_BUDGET_ENFORCE` is on (the default in DEBUG), a request
+that exceeds its budget raises `QueryBudgetExceeded`, so regressions fail
+loudly in development and in test_api_endpoints. Otherwise they are logged.
+"""
+
+import logging
+import re
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+# Collapses "IN (%s, %s, %s)" so that queries differing only in list length share a shape
+_PLACEHOLDER_LIST = re.compile(r"\((?:\s*%s\s*,)+\s*%s\s*\)")
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class QueryStats:
+    """A `connection.execute_wrapper` that records every query it runs."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.shapes[_PLACEHOLDER_LIST.sub("(%s)", sql)] += 1
+
+    @property
+    def duplicates(self):
+        """Number of queries that repeated an earlier query shape."""
+        return sum(count - 1 for count in self.shapes.values())
+
+    def most_repeated(self):
+        sql, count = self.shapes.most_common(1)[0] if self.shapes else ("", 0)
+        return sql, count
+
+
+def get_query_budget(view_func, method):
+    """
+    Return the query budget declared on a view, or None.
+
+    `query_budget` may be set on a function view, or on a class-based view as an
+    int or a dict keyed by viewset action name.
+    """
+    view_class = getattr(view_func, "cls", None) or getattr(view_func, "view_class", None)
+    budget = getattr(view_class, "query_budget", None) or getattr(view_func, "query_budget", None)
+    if isinstance(budget, dict):
+        actions = getattr(view_func, "actions", None) or {}
+        return budget.get(actions.get(method.lower()))
+    return budget
+
+
+def can_see_timings(request):
+    """Whether the Server-Timing header may be sent in response to `request`."""
+    if settings.DEBUG:
+        return True
+    # Set by AuthenticationMiddleware, and already loaded by any view that checked permissions
+    user = getattr(request, "user", None)
+    return bool(user is not None and user.is_authenticated and getattr(user, "is_admin", False))
+
+
+class QueryInstrumentationMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.QUERY_INSTRUMENTATION:
+            return self.get_response(request)
+
+        stats = QueryStats()
+        request.query_budget = None
+        start = time.perf_counter()
+        with connection.execute_wrapper(stats):
+            response = self.get_response(request)
+        total_ms = (time.perf_counter() - start) * 1000
+        db_ms = stats.duration * 1000
+
+        if can_see_timings(request):
+            response["Server-Timing"] = (
+                f'db;dur={db_ms:.1f};desc="{stats.count} queries", '
+                f'dup;desc="{stats.duplicates} duplicate queries", '
+                f"total;dur={total_ms:.1f}"
+            )
+
+        log_fields = {
+            "method": request.method,
+            "path": request.path,
+            "status_code": response.status_code,
+            "db_queries": stats.count,
+            "db_time_ms": round(db_ms, 1),
+            "duplicate_queries": stats.duplicates,
+            "total_time_ms": round(total_ms, 1),
+        }
+        message = (
+            f"{request.method} {request.path} {stats.count} queries "
+            f"({db_ms:.1f} ms, {stats.duplicates} duplicates) in {total_ms:.1f} ms"
+        )
+
+        budget = request.query_budget
+        if budget is not None and stats.count > budget:
+            sql, repeats = stats.most_repeated()
+            error = (
+                f"{request.method} {request.path} ran {stats.count} queries, "
+                f"over its budget of {budget}. Most repeated ({repeats}x): {sql}"
+            )
+            if settings.QUERY_BUDGET_ENFORCE:
+                raise QueryBudgetExceeded(error)
+            logger.warning(error, extra={**log_fields, "query_budget": budget})
+        elif stats.duplicates >= settings.QUERY_DUPLICATE_THRESHOLD:
+            sql, repeats = stats.most_repeated()
+            logger.warning(
+                f"Possible N+1 queries: {message}. Most repeated ({repeats}x): {sql}",
+                extra=log_fields,
+            )
+        else:
+            logger.debug(message, extra=log_fields)
+
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if settings.QUERY_INSTRUMENTATION:
+            request.query_budget = get_query_budget(view_func, request.method)
+        return None
@@ -1,11 +1,16 @@
 from django.db import models
-from django.contrib.auth.models import AbstractUser
+from django.db.models import Exists, OuterRef
+from django.contrib.auth.models import AbstractUser, UserManager as DjangoUserManager
 from django.utils.timezone import now
 from allauth.socialaccount.models import SocialAccount
 import uuid
 
 from auditlog.registry import auditlog
 
+from .grade_scale import MIN_GRADE_CHOICES
+from .rich_text import extract_plain_text, make_excerpt
+from . import signatures
+
 
 def site_branding_logo_upload_path(instance, filename):
     """
@@ -14,6 +19,23 @@ def site_branding_logo_upload_path(instance, filename):
     return f"branding/{filename}"
 
 
+class UserQuerySet(models.QuerySet):
+    def with_sso(self):
+        """
+        Annotate each user with whether they have a linked SSO account, so that
+        reading `is_sso` does not cost one query per user.
+        """
+        return self.annotate(
+            sso_linked=Exists(SocialAccount.objects.filter(user=OuterRef("pk")))
+        )
+
+
+class UserManager(DjangoUserManager.from_queryset(UserQuerySet)):
+    def get_by_natural_key(self, username):
+        # Used by authenticate(); login checks is_sso right after
+        return self.with_sso().get(**{self.model.USERNAME_FIELD: username})
+
+
 class User(AbstractUser):
     display_name = models.CharField(max_length=100, default="New User")
     is_admin = models.BooleanField(default=False)
@@ -34,6 +56,17 @@ class User(AbstractUser):
         blank=True,
         help_text="Cached dict mapping course code (e.g. 'BIOL 101') to grade (e.g. 'A-', 'IP')"
     )
+    ulink_transcript_fetched_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When ulink_transcript was last fetched from Ulink (see api/transcripts.py)"
+    )
+    ulink_transcript_etag = models.CharField(
+        max_length=64,
+        blank=True,
+        default="",
+        help_text="SHA-256 of ulink_transcript, identifying its version"
+    )
 
     groups = models.ManyToManyField(
         "auth.Group",
@@ -48,11 +81,16 @@ class User(AbstractUser):
         help_text="Specific permissions for this user.",
     )
 
+    objects = UserManager()
+
     @property
     def is_sso(self):
         """Check if user logged in via SSO."""
         if not self.pk:
             return False
+        # Set by User.objects.with_sso()
+        if "sso_linked" in self.__dict__:
+            return self.sso_linked
         return SocialAccount.objects.filter(user=self).exists()
 
     @property
@@ -64,13 +102,26 @@ class User(AbstractUser):
         }
     
     def save(self, *args, **kwargs):
-        if self.is_sso and not self.ulink_username:
+        # Check the cheap condition first so is_sso is only queried when needed
+        if not self.ulink_username and self.is_sso:
             conflict = User.objects.filter(ulink_username=self.username).exclude(id=self.id).exists()
             if not conflict:
                 self.ulink_username = self.username
         super().save(*args, **kwargs)
 
 
+class ProgramQuerySet(models.QuerySet):
+    def with_people(self):
+        """
+        Prefetch faculty leads and provider partners (with their SSO flag) so that
+        ProgramSerializer renders any number of programs in a constant number of queries.
+        """
+        return self.prefetch_related(
+            models.Prefetch("faculty_leads", queryset=User.objects.with_sso()),
+            models.Prefetch("provider_partners", queryset=User.objects.with_sso()),
+        )
+
+
 class Program(models.Model):
     title = models.CharField(max_length=200)
     year = models.CharField(max_length=4)
@@ -87,7 +138,7 @@ class Program(models.Model):
     essential_document_deadline = models.DateField(null=True, blank=True)
     payment_deadline = models.DateField(null=True, blank=True)
     start_date = models.DateField(null=True, blank=True)
-    end_date = models.DateField(null=True, blank=True)
+    end_date = models.DateField(null=True, blank=True, db_index=True)
     track_payment = models.BooleanField(default=False)
     provider_partners = models.ManyToManyField(
         "User",
@@ -100,6 +151,20 @@ class Program(models.Model):
         default=list,
         help_text="List of required course codes like 'BIOL 101', 'PHYS 101'."
     )
+    prerequisite_min_grade = models.CharField(
+        max_length=2,
+        blank=True,
+        default="",
+        choices=MIN_GRADE_CHOICES,
+        help_text="Lowest grade that satisfies a prerequisite. Blank accepts any passing grade."
+    )
+    prerequisite_equivalents = models.JSONField(
+        blank=True,
+        default=dict,
+        help_text="Courses that also satisfy a prerequisite, e.g. {'BIOL 101': ['BIOL 110']}."
+    )
+
+    objects = ProgramQuerySet.as_manager()
 
     @property
     def year_semester(self):
@@ -148,6 +213,17 @@ class Application(models.Model):
         default="Unpaid"
     )
 
+    class Meta:
+        constraints = [
+            # Also serves lookups by student, and by (student, program)
+            models.UniqueConstraint(
+                fields=["student", "program"], name="unique_application_per_program"
+            )
+        ]
+        indexes = [
+            models.Index(fields=["program", "status"]),
+        ]
+
     def __str__(self):
         return f"{self.student.display_name} - {self.program.title}"
 
@@ -179,6 +255,11 @@ class ConfidentialNote(models.Model):
     )
     timestamp = models.DateTimeField(default=now, editable=False)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["application", "-timestamp"]),
+        ]
+
     def get_author_display(self):
         return self.author.display_name if self.author else "Deleted user"
 
@@ -213,11 +294,25 @@ class Announcement(models.Model):
         ("high", "High"),
         ("urgent", "Urgent"),
     ]
+    EXCERPT_LENGTH = 280
 
     title = models.CharField(max_length=200)
     content = models.JSONField(
         help_text="JSON representation of rich text content (compatible with Tiptap/ProseMirror)"
     )
+    plain_text = models.TextField(
+        blank=True,
+        default="",
+        editable=False,
+        help_text="Plain text extracted from `content` on save, used for search.",
+    )
+    excerpt = models.CharField(
+        max_length=EXCERPT_LENGTH,
+        blank=True,
+        default="",
+        editable=False,
+        help_text="Single-line preview of `plain_text`, maintained on save.",
+    )
     # New fields:
     cover_image = models.ImageField(
         upload_to="announcements/",
@@ -225,6 +320,12 @@ class Announcement(models.Model):
         blank=True,
         help_text="Optional cover image file for the announcement",
     )
+    cover_image_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text="Resized copies of the cover image, maintained by api/thumbnails.py",
+    )
     pinned = models.BooleanField(
         default=False,
         help_text="If true, this announcement will be pinned to the top of listings.",
@@ -247,12 +348,38 @@ class Announcement(models.Model):
         indexes = [
             models.Index(fields=["-created_at"]),
             models.Index(fields=["importance", "-created_at"]),
+            # Default listing order, paginated with an id tiebreaker
+            models.Index(fields=["-pinned", "-created_at", "-id"]),
         ]
 
+    def save(self, *args, **kwargs):
+        self.plain_text = extract_plain_text(self.content)
+        self.excerpt = make_excerpt(self.plain_text, self.EXCERPT_LENGTH)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "content" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "plain_text", "excerpt"}
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.title} ({self.get_importance_display()})"
 
 
+class DocumentQuerySet(models.QuerySet):
+    def with_signature_flags(self):
+        """
+        Skip loading inline signatures that migrate_signatures has not moved out
+        yet, annotating whether each document has one instead.
+        """
+        flags = {}
+        for kind, (_, inline_field) in signatures.SIGNATURE_KINDS.items():
+            flags[f"has_inline_{kind}_signature"] = models.ExpressionWrapper(
+                models.Q(**{f"{inline_field}__isnull": False}) & ~models.Q(**{inline_field: ""}),
+                output_field=models.BooleanField(),
+            )
+        inline_fields = [inline_field for _, inline_field in signatures.SIGNATURE_KINDS.values()]
+        return self.defer(*inline_fields).annotate(**flags)
+
+
 class Document(models.Model):
     TYPES_OF_DOCS = [
         ("Assumption of risk form", "Assumption of risk form"),
@@ -281,15 +408,32 @@ class Document(models.Model):
         null=True, 
         help_text="JSON data for electronic form fields"
     )
+    signature_file = models.FileField(
+        storage=signatures.get_storage,
+        max_length=255,
+        blank=True,
+        null=True,
+        editable=False,
+        help_text="Signature image, stored by content hash (see api/signatures.py)"
+    )
+    parent_guardian_signature_file = models.FileField(
+        storage=signatures.get_storage,
+        max_length=255,
+        blank=True,
+        null=True,
+        editable=False,
+        help_text="Parent/guardian signature image (if under 18), stored by content hash"
+    )
+    # Inline signatures from before signature_file existed; emptied by migrate_signatures
     signature = models.TextField(
         blank=True, 
         null=True, 
-        help_text="SVG or base64 encoded PNG signature data"
+        help_text="Legacy SVG or base64 encoded PNG signature data"
     )
     parent_guardian_signature = models.TextField(
         blank=True, 
         null=True, 
-        help_text="SVG or base64 encoded PNG signature data for parent/guardian (if under 18)"
+        help_text="Legacy SVG or base64 encoded PNG signature data for parent/guardian"
     )
     is_electronic = models.BooleanField(
         default=False,
@@ -300,6 +444,13 @@ class Document(models.Model):
         help_text="Timestamp of the last modification"
     )
 
+    objects = DocumentQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["application", "type"]),
+        ]
+
     def __str__(self):
         return f"{self.title}"
 
@@ -342,6 +493,11 @@ class LetterOfRecommendation(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["application", "letter_timestamp"]),
+        ]
+
     def __str__(self):
         return f"Letter for {self.application.student.username} to {self.writer_name}({self.writer_email}) is {'fulfilled' if self.is_fulfilled else 'not fulfilled'}"
 
@@ -350,6 +506,78 @@ class LetterOfRecommendation(models.Model):
         return bool(self.pdf and self.letter_timestamp)
 
 
+class TranscriptRefreshJob(models.Model):
+    """
+    A queued refresh of a user's Ulink transcript, run by the workers in
+    api/transcript_jobs.py. A user has at most one queued or running job.
+    """
+
+    STATUS_QUEUED = "queued"
+    STATUS_RUNNING = "running"
+    STATUS_SUCCEEDED = "succeeded"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, "Queued"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_SUCCEEDED, "Succeeded"),
+        (STATUS_FAILED, "Failed"),
+    ]
+    ACTIVE_STATUSES = (STATUS_QUEUED, STATUS_RUNNING)
+
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="transcript_refresh_jobs"
+    )
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    attempts = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True, default="")
+    worker = models.CharField(
+        max_length=100, blank=True, default="", help_text="Worker that ran the last attempt"
+    )
+    run_after = models.DateTimeField(
+        default=now, help_text="Not picked up before this time (used to back off retries)"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["status", "run_after"]),
+            models.Index(fields=["user", "status"]),
+        ]
+
+    def __str__(self):
+        return f"Transcript refresh for {self.user.username} ({self.status})"
+
+    @property
+    def is_active(self):
+        return self.status in self.ACTIVE_STATUSES
+
+
+class TranscriptSnapshot(models.Model):
+    """
+    A version of a user's Ulink transcript. A snapshot is only recorded when a
+    fetch returns a transcript that differs from the cached one.
+    """
+
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="transcript_snapshots"
+    )
+    transcript = models.JSONField()
+    etag = models.CharField(max_length=64, help_text="SHA-256 of the transcript")
+    fetched_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ["-fetched_at"]
+        indexes = [
+            models.Index(fields=["user", "fetched_at"]),
+        ]
+
+    def __str__(self):
+        return f"Transcript of {self.user.username} fetched {self.fetched_at:%Y-%m-%d %H:%M}"
+
+
 class SiteBranding(models.Model):
     """
     Stores site branding information for white-label support.
@@ -385,7 +613,8 @@ class SiteBranding(models.Model):
         return f"Branding: {self.site_name}"
 
 
-auditlog.register(User)
+# Transcript versions are kept in TranscriptSnapshot
+auditlog.register(User, exclude_fields=["ulink_transcript_fetched_at", "ulink_transcript_etag"])
 auditlog.register(Program)
 auditlog.register(Application)
 auditlog.register(ApplicationResponse)
@@ -0,0 +1,198 @@
+"""
+Pagination for the API list endpoints.
+
+Pagination is opt-in so existing frontend callers, which expect a plain JSON
+array, keep working. A client opts in by passing `?page_size=<n>` (and then
+follows the `next`/`previous` links, which carry `?cursor=`):
+
+    GET /api/applications/?program=3&page_size=100
+    → {"next": "...?cursor=cD0xMjM%3D&page_size=100", "previous": null, "results": [...]}
+
+Paginated lists are ordered like unpaginated ones, i.e. by the ordering the
+view's filter backends gave the queryset (`?ordering=` where the view allows
+it, or relevance for `?search=`), with `-id` appended as a tiebreaker.
+"""
+
+import json
+from dataclasses import dataclass
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import F, Q
+from django.db.models.constants import LOOKUP_SEP
+from rest_framework.exceptions import NotFound
+from rest_framework.exceptions import ValidationError as BadRequest
+from rest_framework.pagination import CursorPagination
+
+# Orderings ending in one of these are already unique
+UNIQUE_ORDERINGS = ("id", "-id", "pk", "-pk")
+
+
+@dataclass(frozen=True)
+class CursorColumn:
+    """One ordering column of a cursor: a field, a related field or an annotation."""
+
+    path: str  # lookup, e.g. "created_at", "program__title" or "search_rank"
+    attrs: tuple  # attributes read from a row to get its value
+    field: object  # model field or annotation output field, for to_python()
+    descending: bool
+    null: bool  # whether the value can be NULL (also through a nullable relation)
+
+
+class OptionalCursorPagination(CursorPagination):
+    """
+    Cursor pagination applied only when `page_size` or `cursor` is in the query string.
+
+    Pages are ordered like the filtered queryset (by OrderingFilter, or by
+    relevance after FullTextSearchFilter) when it is ordered, otherwise by
+    `view.cursor_ordering` or `-id`. Unlike DRF's cursor, which positions on
+    the first ordering column only and falls back to offsets within ties, the
+    cursor holds the last row's value for every ordering column, so pages stay
+    stable and cheap for non-unique columns such as `pinned` or
+    `application_deadline`. NULLs sort last. Orderings through multi-valued
+    relations cannot be paginated this way and are rejected with 400.
+    """
+
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
+    ordering = "-id"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if (
+            self.cursor_query_param not in request.query_params
+            and self.page_size_query_param not in request.query_params
+        ):
+            # Backwards-compatible unpaginated response
+            return None
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.columns = [self._get_column(queryset, order) for order in self.ordering]
+
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            offset, reverse, current_position = 0, False, None
+        else:
+            offset, reverse, current_position = self.cursor
+
+        queryset = queryset.order_by(*self._order_by(reverse))
+        if current_position is not None:
+            queryset = queryset.filter(self._after(self._decode_position(current_position), reverse))
+
+        # One extra row tells whether there is a following page
+        results = list(queryset[offset:offset + self.page_size + 1])
+        self.page = results[:self.page_size]
+        if len(results) > len(self.page):
+            following_position = self._get_position_from_instance(results[-1], self.ordering)
+        else:
+            following_position = None
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = current_position is not None or offset > 0
+            self.has_previous = following_position is not None
+            self.next_position = current_position
+            self.previous_position = following_position
+        else:
+            self.has_next = following_position is not None
+            self.has_previous = current_position is not None or offset > 0
+            self.next_position = following_position
+            self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def get_ordering(self, request, queryset, view):
+        # The filter backends have already ordered the queryset (ordering, search rank)
+        ordering = queryset.query.order_by or getattr(view, "cursor_ordering", self.ordering)
+        ordering = (ordering,) if isinstance(ordering, str) else tuple(ordering)
+        if not all(isinstance(order, str) for order in ordering):
+            raise BadRequest({"ordering": "This ordering cannot be paginated."})
+        if ordering[-1] not in UNIQUE_ORDERINGS:
+            ordering += ("-id",)
+        return ordering
+
+    def _get_column(self, queryset, order):
+        descending = order.startswith("-")
+        path = order.lstrip("-")
+        if path in queryset.query.annotations:
+            field = queryset.query.annotations[path].output_field
+            return CursorColumn(path, (path,), field, descending, field.null)
+
+        model, attrs, null = queryset.model, [], False
+        parts = path.split(LOOKUP_SEP)
+        try:
+            for index, part in enumerate(parts):
+                field = model._meta.pk if part == "pk" else model._meta.get_field(part)
+                if field.many_to_many or field.one_to_many:
+                    raise BadRequest({"ordering": f"'{path}' cannot be paginated."})
+                null = null or field.null
+                if index == len(parts) - 1:
+                    attrs.append(field.attname)
+                elif field.is_relation:
+                    attrs.append(field.name)
+                    model = field.related_model
+                else:
+                    raise FieldDoesNotExist(path)
+        except FieldDoesNotExist:
+            raise BadRequest({"ordering": f"Unknown ordering '{path}'."})
+        return CursorColumn(path, tuple(attrs), field, descending, null)
+
+    def _order_by(self, reverse):
+        # Reverse cursors walk the same order backwards, so NULLs come first.
+        # Only nullable columns get a NULLS clause, which MySQL cannot serve from an index.
+        nulls = {"nulls_first": True} if reverse else {"nulls_last": True}
+        order_by = []
+        for column in self.columns:
+            expression = F(column.path)
+            kwargs = nulls if column.null else {}
+            if column.descending != reverse:
+                order_by.append(expression.desc(**kwargs))
+            else:
+                order_by.append(expression.asc(**kwargs))
+        return order_by
+
+    def _after(self, position, reverse):
+        """Rows following `position` in the (possibly reversed) page order."""
+        condition = Q(pk__in=[])
+        equal = Q()
+        for column, value in zip(self.columns, position):
+            if value is None:
+                # NULLs are last going forwards, so only reverse scans find rows past them
+                if reverse:
+                    condition |= equal & Q(**{f"{column.path}__isnull": False})
+                equal &= Q(**{f"{column.path}__isnull": True})
+                continue
+            lookup = "lt" if column.descending != reverse else "gt"
+            beyond = Q(**{f"{column.path}__{lookup}": value})
+            if column.null and not reverse:
+                beyond |= Q(**{f"{column.path}__isnull": True})
+            condition |= equal & beyond
+            equal &= Q(**{column.path: value})
+        return condition
+
+    def _get_position_from_instance(self, instance, ordering):
+        position = []
+        for column in self.columns:
+            value = instance
+            for attr in column.attrs:
+                if value is None:
+                    break
+                value = value[attr] if isinstance(value, dict) else getattr(value, attr)
+            position.append(None if value is None else str(value))
+        return json.dumps(position)
+
+    def _decode_position(self, position):
+        try:
+            values = json.loads(position)
+            if not isinstance(values, list) or len(values) != len(self.columns):
+                raise ValueError
+            return [
+                None if value is None else column.field.to_python(value)
+                for column, value in zip(self.columns, values)
+            ]
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
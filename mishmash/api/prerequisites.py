@@ -0,0 +1,130 @@
+"""
+Program Prerequisites
+=====================
+
+A program lists the courses it requires (`Program.prerequisites`), and a
+student meets them when their cached Ulink transcript (see api/transcripts.py)
+has a grade at or above the program's minimum grade for each, or for a course
+accepted in its place (see api/grade_scale.py).
+
+- `evaluate_prerequisites()`: the courses one transcript is missing, used by
+  `check_prerequisites` (one student).
+- `build_prerequisite_report()`: evaluates every applicant of a program from
+  their cached transcripts, reading all applications and students with one
+  query and compiling the program's prerequisites once. Optionally queues
+  refreshes, in one batch, for applicants whose transcript is stale or was
+  never fetched, except those whose last refresh failed recently.
+"""
+
+from .grade_scale import get_program_matcher
+from .transcript_jobs import enqueue_transcript_refreshes
+from .transcripts import is_transcript_stale
+
+# Transcript states reported per applicant
+TRANSCRIPT_FRESH = "fresh"
+TRANSCRIPT_STALE = "stale"
+TRANSCRIPT_MISSING = "missing"  # never fetched
+TRANSCRIPT_UNLINKED = "unlinked"  # no Ulink account, cannot be fetched
+
+
+def evaluate_prerequisites(program, transcript):
+    """
+    Return the prerequisite courses of `program` that `transcript` does not
+    satisfy, in the order they are listed.
+
+    Args:
+        program (Program): The program.
+        transcript (dict): Course code to grade, e.g. {"BIOL 101": "A-"}.
+    """
+    return get_program_matcher(program).missing(transcript)
+
+
+def build_prerequisite_report(program, refresh=False, now=None):
+    """
+    Evaluate the prerequisites of every applicant of `program`.
+
+    Args:
+        program (Program): The program.
+        refresh (bool): Queue transcript refreshes for applicants whose
+            transcript is stale or missing (one batch, deduplicated per user,
+            see `enqueue_transcript_refreshes()`).
+        now (datetime, optional): Reference time for staleness.
+
+    Returns:
+        dict: {"prerequisites": [...], "min_grade": ..., "equivalents": {...},
+        "summary": {...}, "applicants": [...]}.
+        `meets_all` and `missing` are None for applicants without a transcript.
+    """
+    from .models import Application
+
+    applications = (
+        Application.objects.filter(program=program)
+        .select_related("student")
+        .only(
+            "id",
+            "status",
+            "student__id",
+            "student__username",
+            "student__display_name",
+            "student__ulink_username",
+            "student__ulink_transcript",
+            "student__ulink_transcript_fetched_at",
+        )
+        .order_by("id")
+    )
+
+    prerequisites = program.prerequisites or []
+    matcher = get_program_matcher(program)
+    applicants = []
+    to_refresh = set()
+    for application in applications:
+        student = application.student
+        if not student.ulink_username:
+            transcript_status = TRANSCRIPT_UNLINKED
+        elif student.ulink_transcript is None:
+            transcript_status = TRANSCRIPT_MISSING
+        elif is_transcript_stale(student, now=now):
+            transcript_status = TRANSCRIPT_STALE
+        else:
+            transcript_status = TRANSCRIPT_FRESH
+
+        if not prerequisites:
+            missing = []
+        elif student.ulink_transcript is None:
+            missing = None
+        else:
+            missing = matcher.missing(student.ulink_transcript)
+
+        if prerequisites and transcript_status in (TRANSCRIPT_STALE, TRANSCRIPT_MISSING):
+            to_refresh.add(student.id)
+
+        applicants.append(
+            {
+                "application_id": application.id,
+                "application_status": application.status,
+                "student_id": student.id,
+                "student_display_name": student.display_name,
+                "transcript_status": transcript_status,
+                "transcript_fetched_at": student.ulink_transcript_fetched_at,
+                "meets_all": None if missing is None else not missing,
+                "missing": missing,
+            }
+        )
+
+    queued = enqueue_transcript_refreshes(to_refresh) if refresh else set()
+    for applicant in applicants:
+        applicant["refresh_queued"] = applicant["student_id"] in queued
+
+    return {
+        "prerequisites": prerequisites,
+        "min_grade": program.prerequisite_min_grade,
+        "equivalents": program.prerequisite_equivalents or {},
+        "summary": {
+            "total": len(applicants),
+            "meets_all": sum(1 for a in applicants if a["meets_all"] is True),
+            "missing_prerequisites": sum(1 for a in applicants if a["meets_all"] is False),
+            "unknown": sum(1 for a in applicants if a["meets_all"] is None),
+            "refreshes_queued": len(queued),
+        },
+        "applicants": applicants,
+    }
@@ -0,0 +1,90 @@
+"""
+Program Catalog Cache
+=====================
+
+`GET /api/programs/` is public and the most requested endpoint, and it spikes
+when applications open. The serialized (unpaginated) list is cached per
+combination of its filter parameters, tagged "programs", and the tag is
+invalidated whenever anything that appears in the list changes:
+
+- a Program is saved or deleted
+- faculty leads or provider partners are added/removed (m2m_changed, and
+  `backfill_faculty_leads`, which bulk inserts and so sends no signals)
+- a faculty lead or provider partner is saved (they are serialized inline),
+  unless the save only touched fields outside `CATALOG_USER_FIELDS`, such as
+  `last_login` or the cached transcript; or any User is deleted
+- an SSO account of a lead or partner is linked or unlinked (`is_sso` is
+  serialized inline)
+
+Students and new users never appear in the list, so signups, SSO logins
+(allauth saves the SocialAccount on every login) and student profile changes
+keep the cache.
+
+The signal handlers live in signals.py. Invalidation waits for the surrounding
+transaction to commit, so a concurrent request cannot re-cache the old rows.
+"""
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from . import cache as app_cache
+
+CACHE_NAMESPACE = "programs"
+CACHE_TIMEOUT = 10 * 60
+# Query parameters that change the list; anything else is ignored by the view
+KEY_PARAMS = (
+    "exclude_ended",
+    "search",
+    "faculty_ids",
+    "partner_ids",
+    "track_payment",
+    "ordering",
+    "fields",
+    "omit",
+)
+
+# User columns rendered by UserSerializer for leads and partners
+CATALOG_USER_FIELDS = frozenset({
+    "username",
+    "display_name",
+    "email",
+    "is_admin",
+    "is_faculty",
+    "is_reviewer",
+    "is_provider_partner",
+    "is_mfa_enabled",
+    "ulink_username",
+})
+
+
+def is_catalog_user(user_id):
+    """Whether the user is a faculty lead or provider partner of any program."""
+    from .models import Program
+
+    return Program.objects.filter(
+        Q(faculty_leads=user_id) | Q(provider_partners=user_id)
+    ).exists()
+
+
+def get_cached_catalog(query_params, compute):
+    """
+    Return the serialized program list for `query_params`, calling `compute()`
+    on a cache miss.
+    """
+    # exclude_ended depends on the date, so the date is part of every key
+    key_parts = [timezone.now().date().isoformat()] + [
+        query_params.get(param, "") for param in KEY_PARAMS
+    ]
+    return app_cache.get_or_set(
+        CACHE_NAMESPACE,
+        key_parts,
+        compute,
+        timeout=CACHE_TIMEOUT,
+        tags=[CACHE_NAMESPACE],
+    )
+
+
+def invalidate_program_catalog():
+    """Drop every cached program list once the current transaction commits."""
+    transaction.on_commit(lambda: app_cache.invalidate_tags(CACHE_NAMESPACE))
@@ -0,0 +1,86 @@
+"""
+Rich Text Helpers
+=================
+
+Announcement content is stored as Tiptap/ProseMirror JSON, e.g.:
+
+    {"type": "doc", "content": [
+        {"type": "heading", "content": [{"type": "text", "text": "Deadline"}]},
+        {"type": "paragraph", "content": [{"type": "text", "text": "Apply by May 1."}]}
+    ]}
+
+These helpers turn that tree into plain text for search indexing and previews.
+"""
+
+import json
+import re
+
+# Nodes that render inline; every other node with children starts a new line
+INLINE_NODE_TYPES = {"text", "hardBreak", "mention", "emoji"}
+WHITESPACE = re.compile(r"\s+")
+ELLIPSIS = "\u2026"
+
+
+def _collect_text(node, lines):
+    if isinstance(node, list):
+        for child in node:
+            _collect_text(child, lines)
+        return
+    if not isinstance(node, dict):
+        return
+
+    node_type = node.get("type")
+    if node_type == "text":
+        lines[-1] += node.get("text", "")
+    elif node_type == "hardBreak":
+        lines.append("")
+    elif node_type in INLINE_NODE_TYPES:
+        lines[-1] += node.get("attrs", {}).get("label") or ""
+    else:
+        if lines[-1]:
+            lines.append("")
+        _collect_text(node.get("content", []), lines)
+        if lines[-1]:
+            lines.append("")
+
+
+def extract_plain_text(content):
+    """
+    Return the plain text of a Tiptap/ProseMirror document, one line per block.
+
+    Args:
+        content (dict | list | str): The document, or its JSON encoding. A string
+            that is not valid JSON is returned unchanged.
+
+    Returns:
+        str: The text, with blocks separated by newlines.
+    """
+    if isinstance(content, str):
+        try:
+            content = json.loads(content)
+        except ValueError:
+            return content.strip()
+        if isinstance(content, str):
+            return content.strip()
+
+    lines = [""]
+    _collect_text(content, lines)
+    return "\n".join(line.strip() for line in lines if line.strip())
+
+
+def make_excerpt(text, max_length):
+    """
+    Return `text` on a single line, shortened to at most `max_length` characters.
+
+    Whitespace runs (including line breaks) are collapsed to single spaces. Text
+    that is too long is cut at the last word boundary and ends with an ellipsis.
+    """
+    text = WHITESPACE.sub(" ", text or "").strip()
+    if len(text) <= max_length:
+        return text
+    cut = text[: max_length - len(ELLIPSIS) + 1]
+    if " " in cut:
+        cut = cut[: cut.rindex(" ")]
+    else:
+        cut = cut[:-1]
+    return cut.rstrip(" .,;:") + ELLIPSIS
@@ -0,0 +1,323 @@
+"""
+Full-Text Search
+================
+
+Ranked, prefix-matching search over:
+- programs: title, description
+- users: username, display name, email
+- announcements: title and the plain text extracted from their content
+
+On MySQL the search uses FULLTEXT indexes (created after `migrate` by
+`ensure_search_indexes`, since Django cannot declare them) queried with
+`MATCH ... AGAINST` in boolean mode. Every word of the query must match, and
+each word also matches longer words it is a prefix of ("bio" finds "Biology").
+InnoDB does not index words shorter than `MYSQL_MIN_TOKEN_LENGTH` or its
+stopwords, so those words are matched with `icontains` instead.
+
+Other databases (SQLite in development and tests) use an in-process inverted
+index per model with the same matching rules. It is updated by model signals
+and rebuilt at least every `FALLBACK_REBUILD_INTERVAL` seconds to pick up
+changes made by other processes or by bulk operations.
+
+Usage:
+    queryset = search_queryset(User.objects.all(), "user", "emma wil")
+    # -> only matching users, annotated with `search_rank`, best match first
+
+Views can use `FullTextSearchFilter` with a `search_index` attribute.
+"""
+
+import bisect
+import hashlib
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+
+from django.apps import apps
+from django.db import connection, connections
+from django.db.models import Case, FloatField, Q, Value, When
+from django.db.models.expressions import RawSQL
+from rest_framework.filters import BaseFilterBackend
+
+SEARCH_PARAM = "search"
+TOKEN_PATTERN = re.compile(r"\w+")
+
+MYSQL_MIN_TOKEN_LENGTH = 3
+# InnoDB's default FULLTEXT stopword list
+MYSQL_STOPWORDS = {
+    "a", "about", "an", "are", "as", "at", "be", "by", "com", "de", "en", "for",
+    "from", "how", "i", "in", "is", "it", "la", "of", "on", "or", "that", "the",
+    "this", "to", "was", "what", "when", "where", "who", "will", "with", "und", "www",
+}
+
+FALLBACK_REBUILD_INTERVAL = 300
+# The fallback passes matching ids to the database, so only the best ones are kept
+FALLBACK_MAX_RESULTS = 2000
+
+
+@dataclass(frozen=True)
+class SearchIndex:
+    model_label: str
+    fields: tuple
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    @property
+    def index_name(self):
+        digest = hashlib.sha1(",".join(self.fields).encode()).hexdigest()[:8]
+        return f"ft_{self.model._meta.model_name}_{digest}"
+
+
+SEARCH_INDEXES = {
+    "program": SearchIndex("api.Program", ("title", "description")),
+    "user": SearchIndex("api.User", ("username", "display_name", "email")),
+    "announcement": SearchIndex("api.Announcement", ("title", "plain_text")),
+}
+
+
+def tokenize(text):
+    return [token.lower() for token in TOKEN_PATTERN.findall(text or "")]
+
+
+def _icontains_filter(fields, token):
+    condition = Q()
+    for field in fields:
+        condition |= Q(**{f"{field}__icontains": token})
+    return condition
+
+
+def _mysql_search(queryset, index, tokens):
+    fulltext_tokens = [
+        token
+        for token in tokens
+        if len(token) >= MYSQL_MIN_TOKEN_LENGTH and token not in MYSQL_STOPWORDS
+    ]
+    for token in tokens:
+        if token not in fulltext_tokens:
+            queryset = queryset.filter(_icontains_filter(index.fields, token))
+
+    if not fulltext_tokens:
+        return queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+    model = queryset.model
+    qn = connection.ops.quote_name
+    columns = ", ".join(
+        f"{qn(model._meta.db_table)}.{qn(model._meta.get_field(field).column)}"
+        for field in index.fields
+    )
+    boolean_query = " ".join(f"+{token}*" for token in fulltext_tokens)
+    rank = RawSQL(
+        f"MATCH ({columns}) AGAINST (%s IN BOOLEAN MODE)",
+        [boolean_query],
+        output_field=FloatField(),
+    )
+    return queryset.annotate(search_rank=rank).filter(search_rank__gt=0)
+
+
+class InvertedIndex:
+    """
+    In-process token index for one model, used when FULLTEXT is unavailable.
+    Each token maps to the documents containing it and how often.
+    """
+
+    def __init__(self, index):
+        self.index = index
+        self.lock = threading.Lock()
+        self.postings = {}
+        self.doc_tokens = {}
+        self.sorted_tokens = []
+        self.built_at = None
+
+    def _document_tokens(self, values):
+        return Counter(token for value in values for token in tokenize(str(value or "")))
+
+    def _add(self, pk, values, keep_sorted=True):
+        tokens = self._document_tokens(values)
+        self.doc_tokens[pk] = tokens
+        for token, count in tokens.items():
+            if token not in self.postings:
+                self.postings[token] = {}
+                if keep_sorted:
+                    bisect.insort(self.sorted_tokens, token)
+            self.postings[token][pk] = count
+
+    def _remove(self, pk):
+        for token in self.doc_tokens.pop(pk, ()):
+            documents = self.postings.get(token)
+            if documents is not None:
+                documents.pop(pk, None)
+                if not documents:
+                    del self.postings[token]
+                    position = bisect.bisect_left(self.sorted_tokens, token)
+                    del self.sorted_tokens[position]
+
+    def _ensure_built(self):
+        if self.built_at is not None and time.monotonic() - self.built_at < FALLBACK_REBUILD_INTERVAL:
+            return
+        self.postings = {}
+        self.doc_tokens = {}
+        rows = self.index.model._default_manager.values_list("pk", *self.index.fields)
+        for pk, *values in rows.iterator():
+            self._add(pk, values, keep_sorted=False)
+        self.sorted_tokens = sorted(self.postings)
+        self.built_at = time.monotonic()
+
+    def update(self, instance):
+        with self.lock:
+            if self.built_at is None:
+                return
+            self._remove(instance.pk)
+            self._add(instance.pk, [getattr(instance, field) for field in self.index.fields])
+
+    def remove(self, pk):
+        with self.lock:
+            if self.built_at is None:
+                return
+            self._remove(pk)
+
+    def search(self, tokens):
+        """Return {pk: score} for documents matching every token as a prefix."""
+        with self.lock:
+            self._ensure_built()
+            scores = None
+            for query_token in tokens:
+                token_scores = Counter()
+                position = bisect.bisect_left(self.sorted_tokens, query_token)
+                while position < len(self.sorted_tokens):
+                    token = self.sorted_tokens[position]
+                    if not token.startswith(query_token):
+                        break
+                    position += 1
+                    # Exact matches rank above prefix matches
+                    weight = 2 if token == query_token else 1
+                    for pk, count in self.postings[token].items():
+                        token_scores[pk] += count * weight
+                if scores is None:
+                    scores = token_scores
+                else:
+                    scores = Counter(
+                        {pk: score + token_scores[pk] for pk, score in scores.items() if pk in token_scores}
+                    )
+                if not scores:
+                    break
+            return dict(scores or {})
+
+
+_fallback_indexes = {name: InvertedIndex(index) for name, index in SEARCH_INDEXES.items()}
+
+
+def _fallback_search(queryset, name, tokens):
+    scores = _fallback_indexes[name].search(tokens)
+    best = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:FALLBACK_MAX_RESULTS]
+    if not best:
+        return queryset.none().annotate(search_rank=Value(0.0, output_field=FloatField()))
+    rank = Case(
+        *[When(pk=pk, then=Value(float(score))) for pk, score in best],
+        default=Value(0.0),
+        output_field=FloatField(),
+    )
+    return queryset.filter(pk__in=[pk for pk, _ in best]).annotate(search_rank=rank)
+
+
+def search_queryset(queryset, name, query, order=True):
+    """
+    Filter `queryset` to the rows of search index `name` matching `query`.
+
+    Args:
+        queryset (QuerySet): Queryset of the index's model.
+        name (str): Key of SEARCH_INDEXES ("program", "user" or "announcement").
+        query (str): The user's search text.
+        order (bool): Order the result by relevance, best first.
+
+    Returns:
+        QuerySet: The matching rows, annotated with `search_rank`. The queryset is
+        returned unchanged if `query` contains no words.
+    """
+    tokens = list(dict.fromkeys(tokenize(query)))
+    if not tokens:
+        return queryset
+
+    if connection.vendor == "mysql":
+        queryset = _mysql_search(queryset, SEARCH_INDEXES[name], tokens)
+    else:
+        queryset = _fallback_search(queryset, name, tokens)
+
+    if order:
+        queryset = queryset.order_by("-search_rank", "pk")
+    return queryset
+
+
+class FullTextSearchFilter(BaseFilterBackend):
+    """
+    DRF filter backend searching the view's `search_index` with `?search=`.
+
+    Results are ordered by relevance unless the request also has `?ordering=`,
+    so place this backend after OrderingFilter.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(SEARCH_PARAM, "")
+        return search_queryset(
+            queryset,
+            view.search_index,
+            query,
+            order="ordering" not in request.query_params,
+        )
+
+
+def update_search_index(sender, instance, update_fields=None, **kwargs):
+    """post_save handler keeping the fallback index current."""
+    if connection.vendor == "mysql":
+        return
+    for name, index in SEARCH_INDEXES.items():
+        if index.model is not sender:
+            continue
+        # e.g. logins, which only save last_login
+        if update_fields is not None and not set(update_fields) & set(index.fields):
+            continue
+        _fallback_indexes[name].update(instance)
+
+
+def remove_from_search_index(sender, instance, **kwargs):
+    """post_delete handler keeping the fallback index current."""
+    if connection.vendor == "mysql":
+        return
+    for name, index in SEARCH_INDEXES.items():
+        if index.model is sender:
+            _fallback_indexes[name].remove(instance.pk)
+
+
+def ensure_search_indexes(using="default", **kwargs):
+    """
+    post_migrate handler: fill in missing announcement plain text and excerpts,
+    then create any missing FULLTEXT index on MySQL.
+    """
+    Announcement = apps.get_model("api.Announcement")
+    missing = Announcement.objects.using(using).filter(Q(plain_text="") | Q(excerpt=""))
+    for announcement in missing:
+        announcement.save(update_fields=["plain_text", "excerpt"])
+
+    db = connections[using]
+    if db.vendor != "mysql":
+        return
+
+    qn = db.ops.quote_name
+    with db.cursor() as cursor:
+        for index in SEARCH_INDEXES.values():
+            table = index.model._meta.db_table
+            cursor.execute(
+                "SELECT 1 FROM information_schema.STATISTICS "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s LIMIT 1",
+                [table, index.index_name],
+            )
+            if cursor.fetchone() is not None:
+                continue
+            columns = ", ".join(
+                qn(index.model._meta.get_field(field).column) for field in index.fields
+            )
+            cursor.execute(
+                f"CREATE FULLTEXT INDEX {qn(index.index_name)} ON {qn(table)} ({columns})"
+            )
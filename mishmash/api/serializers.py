@@ -10,11 +10,17 @@ from .models import (
     ConfidentialNote,
     LetterOfRecommendation,
     SiteBranding,
+    TranscriptRefreshJob,
+    TranscriptSnapshot,
 )
 from allauth.socialaccount.models import SocialAccount
+from .fieldsets import DynamicFieldsMixin
+from .grade_scale import normalize_course
+from .signatures import SIGNATURE_KINDS, decode_signature, has_signature, store_signature
+from .thumbnails import get_srcsets
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     is_sso = serializers.ReadOnlyField()
 
     class Meta:
@@ -33,9 +39,13 @@ class UserSerializer(serializers.ModelSerializer):
             "roles_object",
             "ulink_username",
         ]
+        field_dependencies = {
+            "is_sso": (),  # annotated by User.objects.with_sso()
+            "roles_object": ("is_admin", "is_faculty", "is_reviewer"),
+        }
 
 
-class ProgramSerializer(serializers.ModelSerializer):
+class ProgramSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     faculty_leads = UserSerializer(many=True, read_only=True)
     provider_partners = UserSerializer(many=True, read_only=True)
     faculty_lead_ids = serializers.PrimaryKeyRelatedField(
@@ -74,16 +84,68 @@ class ProgramSerializer(serializers.ModelSerializer):
             "end_date",
             "track_payment",
             "prerequisites",
+            "prerequisite_min_grade",
+            "prerequisite_equivalents",
         ]
-
-
-class ApplicationQuestionSerializer(serializers.ModelSerializer):
+        field_dependencies = {"year_semester": ("year", "semester")}
+
+    def validate_prerequisite_equivalents(self, value):
+        """Must map course codes to lists of course codes; codes are normalized."""
+        if not isinstance(value, dict) or not all(
+            isinstance(options, list) and all(isinstance(option, str) for option in options)
+            for options in value.values()
+        ):
+            raise serializers.ValidationError(
+                "Must map each course code to a list of equivalent course codes."
+            )
+        equivalents = {}
+        for course, options in value.items():
+            options = [normalize_course(option) for option in options if option.strip()]
+            if options:
+                equivalents[normalize_course(course)] = options
+        return equivalents
+
+
+class ApplicationQuestionSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = ApplicationQuestion
         fields = ["id", "text", "program", "is_required"]
 
 
-class ApplicationSerializer(serializers.ModelSerializer):
+class StudentSummarySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    """Compact user representation embedded in application lists."""
+
+    class Meta:
+        model = User
+        fields = [
+            "id",
+            "username",
+            "display_name",
+            "email",
+            "is_admin",
+            "is_faculty",
+            "is_reviewer",
+            "is_provider_partner",
+        ]
+
+
+class ProgramSummarySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    """Compact program representation embedded in application lists."""
+
+    class Meta:
+        model = Program
+        fields = ["id", "title", "year_semester"]
+
+
+class ApplicationSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    """
+    Supports `expand` in the serializer context (a set containing "student"
+    and/or "program") to embed `student_details` / `program_details`. The view
+    is responsible for select_related()-ing the expanded relations.
+    """
+
+    EXPANDABLE_FIELDS = ("student", "program")
+
     student = serializers.PrimaryKeyRelatedField(read_only=True)
     gpa = serializers.DecimalField(
         max_digits=4, decimal_places=3, coerce_to_string=True
@@ -103,18 +165,28 @@ class ApplicationSerializer(serializers.ModelSerializer):
             "applied_on",
         ]
 
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        expand = self.context.get("expand", ())
+        if "student" in expand:
+            data["student_details"] = StudentSummarySerializer(instance.student).data
+        if "program" in expand:
+            data["program_details"] = ProgramSummarySerializer(instance.program).data
+        return data
+
 
-class ApplicationResponseSerializer(serializers.ModelSerializer):
+class ApplicationResponseSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = ApplicationResponse
         fields = ["id", "application", "question", "response"]
 
 
-class AnnouncementSerializer(serializers.ModelSerializer):
+class AnnouncementSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     created_by_name = serializers.CharField(
         source="created_by.display_name", read_only=True
     )
     cover_image_url = serializers.SerializerMethodField(read_only=True)
+    cover_image_srcset = serializers.SerializerMethodField(read_only=True)
 
     class Meta:
         model = Announcement
@@ -122,8 +194,10 @@ class AnnouncementSerializer(serializers.ModelSerializer):
             "id",
             "title",
             "content",
+            "excerpt",
             "cover_image",  # Accept the uploaded file
             "cover_image_url",  # For retrieving the image URL
+            "cover_image_srcset",  # Resized copies, by format
             "pinned",
             "importance",
             "is_active",
@@ -133,6 +207,28 @@ class AnnouncementSerializer(serializers.ModelSerializer):
             "updated_at",
         ]
         read_only_fields = ["created_at", "updated_at", "created_by"]
+        # Cards only show a preview, so the summary leaves out the rich text
+        field_presets = {
+            "summary": [
+                "id",
+                "title",
+                "excerpt",
+                "cover_image",
+                "cover_image_url",
+                "cover_image_srcset",
+                "pinned",
+                "importance",
+                "is_active",
+                "created_by",
+                "created_by_name",
+                "created_at",
+                "updated_at",
+            ]
+        }
+        field_dependencies = {
+            "cover_image_url": ("cover_image",),
+            "cover_image_srcset": ("cover_image", "cover_image_variants"),
+        }
 
     def get_cover_image_url(self, obj):
         request = self.context.get("request")
@@ -140,6 +236,12 @@ class AnnouncementSerializer(serializers.ModelSerializer):
             return request.build_absolute_uri(obj.cover_image.url)
         return None
 
+    def get_cover_image_srcset(self, obj):
+        request = self.context.get("request")
+        if not request:
+            return {}
+        return get_srcsets(obj, request.build_absolute_uri)
+
     def create(self, validated_data):
         # If is_active is missing or falsy (empty string, None, etc.), default to True.
         if not validated_data.get("is_active"):
@@ -153,7 +255,7 @@ class AnnouncementSerializer(serializers.ModelSerializer):
         return super().update(instance, validated_data)
 
 
-class ConfidentialNoteSerializer(serializers.ModelSerializer):
+class ConfidentialNoteSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     author_display = serializers.SerializerMethodField()
 
     class Meta:
@@ -167,14 +269,25 @@ class ConfidentialNoteSerializer(serializers.ModelSerializer):
             "content",
         ]
         read_only_fields = ["id", "author", "author_display", "timestamp"]
+        field_dependencies = {"author_display": ("author",)}
 
     def get_author_display(self, obj):
         """Returns 'Deleted user' if author is null."""
         return obj.author.display_name if obj.author else "Deleted User"
 
 
-class DocumentSerializer(serializers.ModelSerializer):
+class DocumentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     pdf_url = serializers.SerializerMethodField()
+    # Accepted as a data URL, SVG or base64 PNG and stored as a file (see
+    # api/signatures.py); read back through the *_signature_url endpoints
+    signature = serializers.CharField(
+        write_only=True, required=False, allow_blank=True, allow_null=True
+    )
+    parent_guardian_signature = serializers.CharField(
+        write_only=True, required=False, allow_blank=True, allow_null=True
+    )
+    signature_url = serializers.SerializerMethodField()
+    parent_guardian_signature_url = serializers.SerializerMethodField()
 
     class Meta:
         model = Document
@@ -188,10 +301,17 @@ class DocumentSerializer(serializers.ModelSerializer):
             "type", 
             "form_data", 
             "signature", 
+            "signature_url",
             "parent_guardian_signature", 
+            "parent_guardian_signature_url",
             "is_electronic", 
             "last_modified"
         ]
+        field_dependencies = {
+            "pdf_url": ("pdf",),
+            "signature_url": ("signature_file",),
+            "parent_guardian_signature_url": ("parent_guardian_signature_file",),
+        }
 
     def get_pdf_url(self, obj):
         """Generate the URL for securely accessing the PDF file."""
@@ -200,8 +320,51 @@ class DocumentSerializer(serializers.ModelSerializer):
             return f"/api/documents/{obj.id}/secure_file/"
         return None
 
+    def _signature_url(self, obj, kind):
+        if has_signature(obj, kind):
+            return f"/api/documents/{obj.id}/signature/?kind={kind}"
+        return None
+
+    def get_signature_url(self, obj):
+        return self._signature_url(obj, "student")
+
+    def get_parent_guardian_signature_url(self, obj):
+        return self._signature_url(obj, "parent_guardian")
+
+    def _validate_signature(self, value):
+        if value:
+            try:
+                decode_signature(value)
+            except ValueError as e:
+                raise serializers.ValidationError(str(e))
+        return value
+
+    def validate_signature(self, value):
+        return self._validate_signature(value)
+
+    def validate_parent_guardian_signature(self, value):
+        return self._validate_signature(value)
+
+    def _store_signatures(self, validated_data):
+        """Replace submitted signature images with the names of their stored files."""
+        for file_field, inline_field in SIGNATURE_KINDS.values():
+            if inline_field in validated_data:
+                value = validated_data.pop(inline_field)
+                validated_data[file_field] = store_signature(value) if value else None
+                validated_data[inline_field] = None
+        return validated_data
+
+    def create(self, validated_data):
+        return super().create(self._store_signatures(validated_data))
+
+    def update(self, instance, validated_data):
+        for kind in SIGNATURE_KINDS:
+            # The with_signature_flags() annotation is stale once the signature changes
+            instance.__dict__.pop(f"has_inline_{kind}_signature", None)
+        return super().update(instance, self._store_signatures(validated_data))
 
-class LetterOfRecommendationSerializer(serializers.ModelSerializer):
+
+class LetterOfRecommendationSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     pdf_url = serializers.SerializerMethodField()
     is_fulfilled = serializers.ReadOnlyField()
     student_name = serializers.SerializerMethodField()
@@ -237,6 +400,12 @@ class LetterOfRecommendationSerializer(serializers.ModelSerializer):
             "student_name",
             "program_title",
         ]
+        field_dependencies = {
+            "pdf_url": ("pdf", "letter_timestamp"),
+            "is_fulfilled": ("pdf", "letter_timestamp"),
+            "student_name": ("application",),
+            "program_title": ("application",),
+        }
 
     def get_pdf_url(self, obj):
         request = self.context.get("request")
@@ -257,7 +426,7 @@ class LetterOfRecommendationSerializer(serializers.ModelSerializer):
         return obj.is_fulfilled
 
 
-class SiteBrandingSerializer(serializers.ModelSerializer):
+class SiteBrandingSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     logo_url = serializers.SerializerMethodField(read_only=True)
     
     class Meta:
@@ -270,6 +439,7 @@ class SiteBrandingSerializer(serializers.ModelSerializer):
             "logo_url", 
             "welcome_message"
         ]
+        field_dependencies = {"logo_url": ("logo",)}
     
     def get_logo_url(self, obj):
         request = self.context.get("request")
@@ -281,3 +451,25 @@ class SiteBrandingSerializer(serializers.ModelSerializer):
                 print(f"Error generating logo URL: {e}")
                 return None
         return None
+
+
+class TranscriptRefreshJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = TranscriptRefreshJob
+        fields = [
+            "id",
+            "status",
+            "attempts",
+            "error",
+            "created_at",
+            "started_at",
+            "finished_at",
+        ]
+        read_only_fields = fields
+
+
+class TranscriptSnapshotSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = TranscriptSnapshot
+        fields = ["id", "etag", "fetched_at", "transcript"]
+        read_only_fields = fields
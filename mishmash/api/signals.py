@@ -0,0 +1,101 @@
+"""
+Model signal handlers for the api app. Connected in ApiConfig.ready().
+"""
+
+from allauth.socialaccount.models import SocialAccount
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .branding import invalidate_branding_cache
+from .faculty_leads import backfill_faculty_leads
+from .models import Announcement, Program, SiteBranding, User
+from .program_catalog import CATALOG_USER_FIELDS, invalidate_program_catalog, is_catalog_user
+from .search import remove_from_search_index, update_search_index
+from .thumbnails import delete_variants, schedule_cover_variants
+
+
+@receiver(pre_delete, sender=User)
+def remember_led_programs(sender, instance, **kwargs):
+    """Record which programs the user leads before the m2m rows are cascaded away."""
+    instance._led_program_ids = list(
+        Program.objects.filter(faculty_leads=instance).values_list("id", flat=True)
+    )
+
+
+@receiver(post_delete, sender=User)
+def backfill_led_programs(sender, instance, **kwargs):
+    """Give programs that lost their only faculty lead the default lead."""
+    led_program_ids = getattr(instance, "_led_program_ids", None)
+    if led_program_ids:
+        backfill_faculty_leads(led_program_ids)
+
+
+@receiver(post_save, sender=SiteBranding)
+@receiver(post_delete, sender=SiteBranding)
+def clear_branding_cache(sender, instance, **kwargs):
+    invalidate_branding_cache()
+
+
+@receiver(post_save, sender=Program)
+@receiver(post_delete, sender=Program)
+@receiver(post_delete, sender=User)
+def clear_program_catalog(sender, instance, **kwargs):
+    invalidate_program_catalog()
+
+
+@receiver(post_save, sender=User)
+def clear_program_catalog_on_user_save(sender, instance, created=False, update_fields=None, **kwargs):
+    # New users lead nothing yet, and saves of fields the catalog does not show
+    # (logins, transcripts) keep it
+    if created or (update_fields is not None and not set(update_fields) & CATALOG_USER_FIELDS):
+        return
+    if is_catalog_user(instance.pk):
+        invalidate_program_catalog()
+
+
+@receiver(post_save, sender=SocialAccount)
+@receiver(post_delete, sender=SocialAccount)
+def clear_program_catalog_on_sso_change(sender, instance, created=True, **kwargs):
+    # allauth saves the account on every login; only linking changes is_sso
+    if created and is_catalog_user(instance.user_id):
+        invalidate_program_catalog()
+
+
+@receiver(m2m_changed, sender=Program.faculty_leads.through)
+@receiver(m2m_changed, sender=Program.provider_partners.through)
+def clear_program_catalog_on_people_change(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        invalidate_program_catalog()
+
+
+@receiver(post_save, sender=Program)
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=Announcement)
+def refresh_search_index(sender, instance, **kwargs):
+    update_search_index(sender, instance, **kwargs)
+
+
+@receiver(post_delete, sender=Program)
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=Announcement)
+def clear_search_index(sender, instance, **kwargs):
+    remove_from_search_index(sender, instance, **kwargs)
+
+
+@receiver(post_save, sender=Announcement)
+def refresh_cover_thumbnails(sender, instance, update_fields=None, raw=False, **kwargs):
+    """Generate thumbnails for a new cover image, or drop them with a removed one."""
+    if raw or (update_fields is not None and "cover_image" not in update_fields):
+        return
+    variants = instance.cover_image_variants or {}
+    if instance.cover_image:
+        if variants.get("source") != instance.cover_image.name:
+            schedule_cover_variants(instance)
+    elif variants:
+        delete_variants(instance.cover_image.storage, variants)
+        Announcement.objects.filter(pk=instance.pk).update(cover_image_variants={})
+
+
+@receiver(post_delete, sender=Announcement)
+def delete_cover_thumbnails(sender, instance, **kwargs):
+    delete_variants(instance.cover_image.storage, instance.cover_image_variants)
@@ -0,0 +1,153 @@
+"""
+Document Signatures
+===================
+
+Electronic forms are signed on a canvas whose image is sent as a data URL
+(`data:image/png;base64,...` or `data:image/svg+xml;base64,...`), raw SVG
+markup or bare base64 PNG. The images used to be stored inline in the
+`Document.signature` / `parent_guardian_signature` TEXT columns, which made
+every document row (and list response, and backup) carry them.
+
+They are now stored as files in the "signatures" storage (see STORAGES in
+settings), named by the SHA-256 of their content:
+
+    signatures/3f/3f9a...c1.png
+
+so identical images are stored once and a name never changes meaning. The
+document only keeps the name, in `signature_file` /
+`parent_guardian_signature_file`, and the image is fetched on demand from
+`GET /api/documents/{id}/signature/?kind=student|parent_guardian`.
+
+Rows written before this change keep their inline image until
+`python manage.py migrate_signatures` moves it out; until then the inline
+value is still served.
+"""
+
+import base64
+import binascii
+import hashlib
+import re
+from urllib.parse import unquote
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import storages
+from django.db.models import Q
+
+STORAGE_ALIAS = "signatures"
+
+# kind: (file field, legacy inline field)
+SIGNATURE_KINDS = {
+    "student": ("signature_file", "signature"),
+    "parent_guardian": ("parent_guardian_signature_file", "parent_guardian_signature"),
+}
+
+CONTENT_TYPES = {
+    "png": "image/png",
+    "svg": "image/svg+xml",
+}
+PNG_MAGIC = b"\x89PNG\r\n\x1a\n"
+DATA_URL = re.compile(r"^data:(?P<type>[\w/+.-]+)(?P<base64>;base64)?,(?P<data>.*)$", re.S)
+
+
+def get_storage():
+    return storages[STORAGE_ALIAS]
+
+
+def decode_signature(value):
+    """
+    Decode a submitted signature.
+
+    Args:
+        value (str): A data URL, SVG markup or base64 encoded PNG.
+
+    Returns:
+        tuple: (content bytes, file extension)
+
+    Raises:
+        ValueError: If the value is not a PNG or SVG image.
+    """
+    value = value.strip()
+    match = DATA_URL.match(value)
+    if match:
+        data = match.group("data")
+        if match.group("base64"):
+            content = _b64decode(data)
+        else:
+            content = unquote(data).encode()
+    elif value.startswith("<"):
+        content = value.encode()
+    else:
+        content = _b64decode(value)
+
+    if content.startswith(PNG_MAGIC):
+        return content, "png"
+    head = content[:1024].lstrip().lower()
+    if head.startswith(b"<svg") or (head.startswith(b"<?xml") and b"<svg" in head):
+        return content, "svg"
+    raise ValueError("Signature must be a PNG or SVG image.")
+
+
+def _b64decode(data):
+    try:
+        return base64.b64decode(data, validate=True)
+    except (binascii.Error, ValueError):
+        raise ValueError("Signature is not valid base64.")
+
+
+def store_signature(value):
+    """
+    Store a submitted signature (see decode_signature) and return its file name.
+    Storing an image that is already stored only returns the existing name.
+    """
+    content, extension = decode_signature(value)
+    digest = hashlib.sha256(content).hexdigest()
+    name = f"signatures/{digest[:2]}/{digest}.{extension}"
+    storage = get_storage()
+    if not storage.exists(name):
+        saved = storage.save(name, ContentFile(content))
+        if saved != name:
+            # Another request stored the same image first
+            storage.delete(saved)
+    return name
+
+
+def has_signature(document, kind):
+    """Whether the document has a signature of the given kind, stored or inline."""
+    file_field, inline_field = SIGNATURE_KINDS[kind]
+    if getattr(document, file_field):
+        return True
+    # Annotated by Document.objects.with_signature_flags()
+    flag = f"has_inline_{kind}_signature"
+    if flag in document.__dict__:
+        return document.__dict__[flag]
+    return bool(getattr(document, inline_field))
+
+
+def open_signature(document, kind):
+    """
+    Return the signature image of the given kind.
+
+    Returns:
+        tuple: (content bytes, content type, etag), or None if there is none.
+    """
+    file_field, inline_field = SIGNATURE_KINDS[kind]
+    stored = getattr(document, file_field)
+    if stored:
+        with get_storage().open(stored.name, "rb") as signature:
+            content = signature.read()
+        digest, extension = stored.name.rsplit("/", 1)[-1].split(".", 1)
+        return content, CONTENT_TYPES[extension], digest
+
+    inline = getattr(document, inline_field)
+    if not inline:
+        return None
+    content, extension = decode_signature(inline)
+    return content, CONTENT_TYPES[extension], hashlib.sha256(content).hexdigest()
+
+
+def inline_signature_filter():
+    """Documents that still have an inline signature of any kind."""
+    condition = Q()
+    for _, inline_field in SIGNATURE_KINDS.values():
+        condition |= Q(**{f"{inline_field}__isnull": False}) & ~Q(**{inline_field: ""})
+    return condition
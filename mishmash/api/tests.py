@@ -1,3 +1,177 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from allauth.socialaccount.models import SocialAccount
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .models import Application, Program, User
+from .program_catalog import get_cached_catalog
+from .transcripts import save_transcript
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class ProgramCatalogInvalidationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="student", password="password", display_name="Student"
+        )
+        self.lead = User.objects.create_user(
+            username="lead", password="password", display_name="Lead", is_faculty=True
+        )
+        program = Program.objects.create(title="Program", year="2025", semester="Fall")
+        program.faculty_leads.set([self.lead])
+
+        self.compute = mock.Mock(return_value=[{"id": 1}])
+        get_cached_catalog({}, self.compute)
+        self.assertEqual(self.compute.call_count, 1)
+
+    def assertCatalogComputed(self, count):
+        get_cached_catalog({}, self.compute)
+        self.assertEqual(self.compute.call_count, count)
+
+    def test_transcript_save_keeps_catalog(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            save_transcript(self.user, {"BIOL 101": "A"})
+
+        self.assertCatalogComputed(1)
+
+    def test_sso_login_keeps_catalog(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            account = SocialAccount.objects.create(user=self.user, provider="duke", uid="student")
+            # allauth saves the account and the login time on every login
+            account.extra_data = {"dukeNetID": "student"}
+            account.save()
+            self.user.last_login = timezone.now()
+            self.user.save(update_fields=["last_login"])
+
+        self.assertCatalogComputed(1)
+
+    def test_student_signup_and_save_keep_catalog(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            student = User.objects.create_user(username="new", password="password")
+            student.display_name = "New Student"
+            student.save()
+
+        self.assertCatalogComputed(1)
+
+    def test_lead_save_clears_catalog(self):
+        self.lead.display_name = "Renamed"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.lead.save(update_fields=["display_name"])
+
+        self.assertCatalogComputed(2)
+
+    def test_lead_sso_link_clears_catalog(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            SocialAccount.objects.create(user=self.lead, provider="duke", uid="lead")
+
+        self.assertCatalogComputed(2)
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class QueryCountTests(TestCase):
+    """The list endpoints take a fixed number of queries, however many rows they return."""
+
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_user(
+            username="admin", password="password", is_admin=True
+        )
+        self.student = User.objects.create_user(
+            username="student", password="password", ulink_username="student"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+        self.programs = []
+
+    def add_programs(self, count):
+        """Add programs with two leads, a partner (one of them linked to SSO) and two applicants."""
+        for _ in range(count):
+            index = len(self.programs)
+            program = Program.objects.create(
+                title=f"Program {index}",
+                year="2025",
+                semester="Fall",
+                prerequisites=["BIOL 101"],
+            )
+            lead = User.objects.create_user(
+                username=f"lead{index}", password="password", is_faculty=True
+            )
+            SocialAccount.objects.create(user=lead, provider="duke", uid=f"lead{index}")
+            partner = User.objects.create_user(
+                username=f"partner{index}", password="password", is_provider_partner=True
+            )
+            program.faculty_leads.set([self.admin, lead])
+            program.provider_partners.set([partner])
+
+            applicant = User.objects.create_user(
+                username=f"applicant{index}",
+                password="password",
+                ulink_username=f"applicant{index}",
+                ulink_transcript={"BIOL 101": "A"},
+                ulink_transcript_fetched_at=timezone.now(),
+            )
+            Application.objects.create(student=applicant, program=program)
+            Application.objects.create(student=self.student, program=program)
+            self.programs.append(program)
+
+    def assertConstantQueries(self, num, url):
+        for count in (1, 5):
+            self.add_programs(count)
+            cache.clear()
+            with self.assertNumQueries(num):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_program_list(self):
+        response = self.assertConstantQueries(
+            # Programs, then the leads and the partners with their SSO flag
+            3, "/api/programs/"
+        )
+
+        program = next(p for p in response.json() if p["title"] == "Program 0")
+        self.assertEqual(len(program["faculty_leads"]), 2)
+        self.assertEqual(len(program["provider_partners"]), 1)
+
+    def test_dashboard(self):
+        self.client.force_authenticate(user=self.student)
+        response = self.assertConstantQueries(
+            # Programs, leads, partners, applications, documents and letter counts
+            6, "/api/users/me/dashboard/"
+        )
+
+        programs = response.json()["programs"]
+        self.assertEqual(len(programs), 6)
+        self.assertTrue(all(entry["application"] for entry in programs))
+
+    def test_batch_applicant_counts(self):
+        response = self.assertConstantQueries(
+            # Program ids, then one GROUP BY program, status
+            2, "/api/programs/applicant_counts/"
+        )
+
+        self.assertEqual(len(response.json()), 6)
+        self.assertEqual(response.json()[str(self.programs[0].id)]["applied"], 2)
+
+    def test_prerequisite_report(self):
+        program = Program.objects.create(
+            title="Report", year="2025", semester="Fall", prerequisites=["BIOL 101"]
+        )
+        url = f"/api/programs/{program.id}/prerequisite_report/"
+        for count in (1, 5):
+            self.add_programs(count)
+            for other in self.programs[-count:]:
+                for application in other.application_set.exclude(student=self.student):
+                    Application.objects.create(student=application.student, program=program)
+            # The program, then the applications with their students' transcripts
+            with self.assertNumQueries(2):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+
+        applicants = response.json()["applicants"]
+        self.assertEqual(len(applicants), 6)
+        self.assertTrue(all(applicant["meets_all"] for applicant in applicants))
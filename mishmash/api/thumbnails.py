@@ -0,0 +1,213 @@
+"""
+Announcement Cover Thumbnails
+=============================
+
+Cover images are uploaded at whatever size the author had, but the
+announcements browser shows them on small cards. When a cover image is saved,
+resized copies are generated at `THUMBNAIL_WIDTHS` in WebP and JPEG and stored
+next to the original:
+
+    announcements/cover.png
+    announcements/thumbnails/cover-<hash>/320w.webp
+    announcements/thumbnails/cover-<hash>/320w.jpg
+    ...
+
+Their names are recorded in `Announcement.cover_image_variants`:
+
+    {"source": "announcements/cover.png",
+     "webp": {"320": "announcements/thumbnails/...", ...},
+     "jpeg": {"320": "announcements/thumbnails/...", ...}}
+
+Resizing is too slow for the request cycle, so it runs on a small thread pool
+once the upload is committed (`THUMBNAIL_WORKERS`, see settings). With
+THUMBNAIL_ASYNC off it runs inline instead. Variants of images uploaded
+earlier can be (re)generated with `python manage.py generate_thumbnails`.
+"""
+
+import hashlib
+import logging
+import posixpath
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+from PIL import Image, ImageOps
+
+logger = logging.getLogger("api")
+
+THUMBNAIL_WIDTHS = (320, 640, 1280)
+THUMBNAIL_DIR = "thumbnails"
+# variant key: (Pillow format, file extension, save options)
+THUMBNAIL_FORMATS = {
+    "webp": ("WEBP", "webp", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", "jpg", {"quality": 82, "optimize": True, "progressive": True}),
+}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        # Uploads are committed on several gunicorn threads at once; only one creates the pool
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.THUMBNAIL_WORKERS, thread_name_prefix="thumbnails"
+                )
+    return _executor
+
+
+def _target_widths(original_width):
+    """Widths to generate; images are never scaled up."""
+    widths = [width for width in THUMBNAIL_WIDTHS if width < original_width]
+    return widths or [original_width]
+
+
+def _variant_dir(source_name):
+    directory, filename = posixpath.split(source_name)
+    stem = posixpath.splitext(filename)[0]
+    digest = hashlib.sha1(source_name.encode()).hexdigest()[:8]
+    return posixpath.join(directory, THUMBNAIL_DIR, f"{stem}-{digest}")
+
+
+def _encode(image, image_format, options):
+    if image_format == "JPEG" and image.mode != "RGB":
+        # JPEG has no transparency, so flatten onto white
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        rgba = image.convert("RGBA")
+        background.paste(rgba, mask=rgba.getchannel("A"))
+        image = background
+    elif image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA")
+    buffer = BytesIO()
+    image.save(buffer, image_format, **options)
+    return buffer.getvalue()
+
+
+def build_variants(field_file):
+    """
+    Generate and store the thumbnails of an image file.
+
+    Args:
+        field_file (FieldFile): The stored original, e.g. `announcement.cover_image`.
+
+    Returns:
+        dict: The variant map stored in `Announcement.cover_image_variants`.
+    """
+    storage = field_file.storage
+    with field_file.open("rb") as source:
+        image = Image.open(source)
+        image.load()
+    # Phones record the rotation in EXIF instead of rotating the pixels
+    image = ImageOps.exif_transpose(image)
+
+    directory = _variant_dir(field_file.name)
+    variants = {"source": field_file.name}
+    for key in THUMBNAIL_FORMATS:
+        variants[key] = {}
+
+    for width in _target_widths(image.width):
+        height = max(1, round(image.height * width / image.width))
+        resized = image.resize((width, height), Image.LANCZOS) if width != image.width else image
+        for key, (image_format, extension, options) in THUMBNAIL_FORMATS.items():
+            name = posixpath.join(directory, f"{width}w.{extension}")
+            if storage.exists(name):
+                storage.delete(name)
+            variants[key][str(width)] = storage.save(
+                name, ContentFile(_encode(resized, image_format, options))
+            )
+    return variants
+
+
+def delete_variants(storage, variants):
+    """Delete the files of a variant map, ignoring ones that are already gone."""
+    for key in THUMBNAIL_FORMATS:
+        for name in (variants or {}).get(key, {}).values():
+            try:
+                storage.delete(name)
+            except OSError:
+                logger.warning("Could not delete thumbnail %s", name)
+
+
+def generate_cover_variants(announcement_id):
+    """
+    Build the thumbnails of an announcement's current cover image and record them.
+
+    Returns:
+        bool: False if the announcement is gone, has no cover image, or its cover
+        image was replaced while the thumbnails were generated.
+    """
+    from .models import Announcement
+
+    announcement = Announcement.objects.filter(pk=announcement_id).first()
+    if announcement is None or not announcement.cover_image:
+        return False
+
+    source_name = announcement.cover_image.name
+    variants = build_variants(announcement.cover_image)
+
+    # update() so the cover image is compared atomically and no signals are sent
+    updated = Announcement.objects.filter(
+        pk=announcement_id, cover_image=source_name
+    ).update(cover_image_variants=variants)
+    if not updated:
+        delete_variants(announcement.cover_image.storage, variants)
+        return False
+
+    previous = announcement.cover_image_variants or {}
+    if previous.get("source") != source_name:
+        delete_variants(announcement.cover_image.storage, previous)
+    return True
+
+
+def _run_generate_cover_variants(announcement_id):
+    try:
+        generate_cover_variants(announcement_id)
+    except Exception:
+        logger.exception(
+            "Could not generate cover thumbnails for announcement %s", announcement_id
+        )
+    finally:
+        # Worker threads open their own database connections
+        close_old_connections()
+
+
+def schedule_cover_variants(announcement):
+    """
+    Generate the thumbnails of `announcement` in the background once the current
+    transaction commits, or right away when THUMBNAIL_ASYNC is off.
+    """
+    announcement_id = announcement.pk
+    if settings.THUMBNAIL_ASYNC:
+        transaction.on_commit(
+            lambda: _get_executor().submit(_run_generate_cover_variants, announcement_id)
+        )
+    else:
+        transaction.on_commit(lambda: generate_cover_variants(announcement_id))
+
+
+def get_srcsets(announcement, build_url):
+    """
+    Return the `srcset` attribute value of each thumbnail format, e.g.
+    {"webp": "https://.../320w.webp 320w, https://.../640w.webp 640w", ...}.
+
+    Empty until the thumbnails of the current cover image have been generated.
+    """
+    variants = announcement.cover_image_variants or {}
+    if not announcement.cover_image or variants.get("source") != announcement.cover_image.name:
+        return {}
+
+    storage = announcement.cover_image.storage
+    srcsets = {}
+    for key in THUMBNAIL_FORMATS:
+        by_width = sorted(variants.get(key, {}).items(), key=lambda item: int(item[0]))
+        if by_width:
+            srcsets[key] = ", ".join(
+                f"{build_url(storage.url(name))} {width}w" for width, name in by_width
+            )
+    return srcsets
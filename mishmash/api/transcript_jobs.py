@@ -0,0 +1,311 @@
+"""
+Transcript Refresh Jobs
+=======================
+
+Fetching a transcript means scraping Ulink, which can take seconds (or, when
+Ulink is struggling, up to the provider client's timeouts and retries). The
+API therefore never fetches transcripts inside a request. It queues a
+`TranscriptRefreshJob` and answers 202; the client polls
+`GET /api/users/{id}/refresh_transcript/` until the job has finished.
+
+The queue is the database table itself, so no broker is needed:
+
+- `enqueue_transcript_refresh()` creates a job, unless the user already has a
+  queued or running one, or one that failed in the last
+  TRANSCRIPT_REFRESH_FAILURE_COOLDOWN seconds, which is returned instead. The
+  user row is locked while checking, so concurrent requests cannot queue two jobs.
+- Workers claim the oldest due job with `SELECT ... FOR UPDATE SKIP LOCKED`,
+  so any number of threads and processes can share the queue and each job is
+  run by exactly one of them.
+- Provider outages (`TranscriptProviderError`) are retried with exponential
+  backoff up to TRANSCRIPT_REFRESH_MAX_ATTEMPTS times. Other errors (no linked
+  Ulink account, unparsable page) fail the job right away.
+- A job left "running" for longer than TRANSCRIPT_REFRESH_JOB_TIMEOUT (its
+  worker died) is queued again.
+
+Each web server process runs TRANSCRIPT_REFRESH_WORKERS worker threads
+(started from `ApiConfig.ready` when RUN_BACKGROUND_THREADS is set), which bounds how many Ulink requests a
+process makes at once. They are woken as soon as a job is queued in the same
+process and otherwise poll every TRANSCRIPT_REFRESH_POLL_INTERVAL seconds.
+With TRANSCRIPT_REFRESH_IN_PROCESS off, run the workers separately instead:
+
+    python manage.py run_transcript_worker --concurrency 4
+"""
+
+import logging
+import os
+import socket
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import close_old_connections, connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .transcript_providers.http import TranscriptProviderError
+from .transcripts import save_transcript
+
+logger = logging.getLogger("api")
+
+_workers_lock = threading.Lock()
+_worker_threads = []
+# Set when a job is queued, so idle workers of this process pick it up at once
+_wake_event = threading.Event()
+
+
+def failure_cooldown_start():
+    """Jobs that failed after this time are not retried yet."""
+    return timezone.now() - timedelta(seconds=settings.TRANSCRIPT_REFRESH_FAILURE_COOLDOWN)
+
+
+def enqueue_transcript_refresh(user):
+    """
+    Queue a transcript refresh for `user`.
+
+    Returns:
+        tuple: (TranscriptRefreshJob, created). `created` is False when the
+        user already had a queued or running job, or when their latest job
+        failed within TRANSCRIPT_REFRESH_FAILURE_COOLDOWN (retrying right away
+        would most likely fail again); that job is returned instead.
+    """
+    from .models import TranscriptRefreshJob, User
+
+    with transaction.atomic():
+        # Serializes enqueues for the same user
+        User.objects.select_for_update().filter(pk=user.pk).values_list("pk").get()
+        job = (
+            TranscriptRefreshJob.objects.filter(
+                Q(status__in=TranscriptRefreshJob.ACTIVE_STATUSES)
+                | Q(status=TranscriptRefreshJob.STATUS_FAILED, finished_at__gte=failure_cooldown_start()),
+                user=user,
+            )
+            .order_by("-created_at", "-id")
+            .first()
+        )
+        if job is not None:
+            return job, False
+        job = TranscriptRefreshJob.objects.create(user=user)
+        transaction.on_commit(_wake_event.set)
+    return job, True
+
+
+def enqueue_transcript_refreshes(user_ids):
+    """
+    Queue transcript refreshes for many users at once, skipping users that
+    already have a queued or running job, and users whose refresh failed in
+    the last TRANSCRIPT_REFRESH_FAILURE_COOLDOWN seconds (retrying them right
+    away would most likely fail again). Runs a fixed number of queries
+    however many users are given.
+
+    Returns:
+        set: The ids of the given users that now have a queued or running job.
+    """
+    from .models import TranscriptRefreshJob, User
+
+    user_ids = set(user_ids)
+    if not user_ids:
+        return set()
+
+    cooldown_start = failure_cooldown_start()
+    with transaction.atomic():
+        # Same lock as enqueue_transcript_refresh(), taken in id order to avoid deadlocks
+        locked = set(
+            User.objects.select_for_update()
+            .filter(pk__in=user_ids)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+        active, failed = set(), set()
+        for user_id, job_status in TranscriptRefreshJob.objects.filter(
+            Q(status__in=TranscriptRefreshJob.ACTIVE_STATUSES)
+            | Q(status=TranscriptRefreshJob.STATUS_FAILED, finished_at__gte=cooldown_start),
+            user_id__in=locked,
+        ).values_list("user_id", "status"):
+            (failed if job_status == TranscriptRefreshJob.STATUS_FAILED else active).add(user_id)
+        # A user can have a failed job and a newer active one
+        failed -= active
+        to_queue = locked - active - failed
+        TranscriptRefreshJob.objects.bulk_create(
+            [TranscriptRefreshJob(user_id=user_id) for user_id in sorted(to_queue)]
+        )
+        if to_queue:
+            transaction.on_commit(_wake_event.set)
+    return locked - failed
+
+
+def get_latest_job(user):
+    """The user's most recent transcript refresh job, or None."""
+    return user.transcript_refresh_jobs.order_by("-created_at", "-id").first()
+
+
+def claim_next_job(worker):
+    """
+    Mark the oldest due job as running and return it, or None if there is none.
+    Jobs locked by another worker's claim are skipped rather than waited for.
+    """
+    from .models import TranscriptRefreshJob
+
+    now = timezone.now()
+    with transaction.atomic():
+        job = (
+            TranscriptRefreshJob.objects.select_for_update(skip_locked=True, of=("self",))
+            .select_related("user")
+            .filter(status=TranscriptRefreshJob.STATUS_QUEUED, run_after__lte=now)
+            .order_by("run_after", "id")
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = TranscriptRefreshJob.STATUS_RUNNING
+        job.attempts += 1
+        job.worker = worker
+        job.started_at = now
+        job.save(update_fields=["status", "attempts", "worker", "started_at"])
+    return job
+
+
+def requeue_stale_jobs():
+    """
+    Queue again the jobs whose worker stopped while running them, or fail them
+    if they have no attempts left.
+
+    Returns:
+        int: Number of jobs requeued or failed.
+    """
+    from .models import TranscriptRefreshJob
+
+    now = timezone.now()
+    stale = TranscriptRefreshJob.objects.filter(
+        status=TranscriptRefreshJob.STATUS_RUNNING,
+        started_at__lt=now - timedelta(seconds=settings.TRANSCRIPT_REFRESH_JOB_TIMEOUT),
+    )
+    failed = stale.filter(attempts__gte=settings.TRANSCRIPT_REFRESH_MAX_ATTEMPTS).update(
+        status=TranscriptRefreshJob.STATUS_FAILED,
+        error="The transcript refresh timed out.",
+        finished_at=now,
+    )
+    requeued = stale.update(status=TranscriptRefreshJob.STATUS_QUEUED, run_after=now)
+    if failed or requeued:
+        logger.warning(f"Recovered {failed + requeued} stale transcript refresh jobs")
+    return failed + requeued
+
+
+def run_job(job, provider=None):
+    """
+    Fetch the transcript of a claimed job's user and record the outcome.
+
+    Returns:
+        str: The status the job ended in ("succeeded", "failed" or "queued"
+        when it will be retried), or None if it was requeued as stale meanwhile.
+    """
+    from .models import TranscriptRefreshJob
+    from .transcript_providers.ulink import UlinkProvider
+
+    user = job.user
+    provider = provider or UlinkProvider()
+    now = timezone.now
+
+    try:
+        if not user.ulink_username:
+            user.save(update_fields=["ulink_username"])  # re-attempts to connect ulink for sso users
+        transcript = provider.fetch_transcript(user)
+    except TranscriptProviderError as e:
+        if job.attempts < settings.TRANSCRIPT_REFRESH_MAX_ATTEMPTS:
+            delay = settings.TRANSCRIPT_REFRESH_RETRY_DELAY * 2 ** (job.attempts - 1)
+            outcome = dict(
+                status=TranscriptRefreshJob.STATUS_QUEUED,
+                run_after=now() + timedelta(seconds=delay),
+                error=str(e),
+            )
+        else:
+            outcome = dict(status=TranscriptRefreshJob.STATUS_FAILED, error=str(e))
+    except ValidationError as e:
+        outcome = dict(status=TranscriptRefreshJob.STATUS_FAILED, error=" ".join(e.messages))
+    except Exception as e:
+        logger.exception(f"Transcript refresh for user {user.id} failed")
+        outcome = dict(status=TranscriptRefreshJob.STATUS_FAILED, error=str(e))
+    else:
+        save_transcript(user, transcript)
+        outcome = dict(status=TranscriptRefreshJob.STATUS_SUCCEEDED, error="")
+
+    if outcome["status"] != TranscriptRefreshJob.STATUS_QUEUED:
+        outcome["finished_at"] = now()
+    # A job requeued as stale meanwhile belongs to another attempt now
+    updated = TranscriptRefreshJob.objects.filter(
+        pk=job.pk, status=TranscriptRefreshJob.STATUS_RUNNING, attempts=job.attempts
+    ).update(**outcome)
+    return outcome["status"] if updated else None
+
+
+def run_worker(name, stop_event=None, poll_interval=None, exit_when_idle=False):
+    """
+    Claim and run jobs until `stop_event` is set (or the queue is empty, with
+    `exit_when_idle`).
+
+    Returns:
+        int: Number of jobs run.
+    """
+    if poll_interval is None:
+        poll_interval = settings.TRANSCRIPT_REFRESH_POLL_INTERVAL
+    stop_event = stop_event or threading.Event()
+
+    processed = 0
+    while not stop_event.is_set():
+        # Cleared before claiming, so a job queued from now on wakes us again
+        _wake_event.clear()
+        job = None
+        try:
+            close_old_connections()
+            job = claim_next_job(name)
+            if job is None:
+                requeue_stale_jobs()
+        except Exception as e:
+            logger.error(f"Transcript worker {name} could not claim a job: {str(e)}")
+
+        if job is not None:
+            try:
+                run_job(job)
+            except Exception as e:
+                # Left running; requeue_stale_jobs() picks it up after the timeout
+                logger.error(f"Transcript worker {name} failed on job {job.id}: {str(e)}")
+            processed += 1
+            continue
+
+        if exit_when_idle:
+            break
+        # Don't hold a database connection open while idle
+        connection.close()
+        _wake_event.wait(poll_interval)
+    connection.close()
+    return processed
+
+
+def worker_name(index):
+    return f"{socket.gethostname()}:{os.getpid()}:{index}"
+
+
+def start_transcript_workers(count=None):
+    """
+    Start the in-process transcript worker threads, if they are not already running.
+
+    Args:
+        count (int, optional): Number of threads. Defaults to
+            `settings.TRANSCRIPT_REFRESH_WORKERS`.
+    """
+    if count is None:
+        count = settings.TRANSCRIPT_REFRESH_WORKERS
+
+    with _workers_lock:
+        _worker_threads[:] = [thread for thread in _worker_threads if thread.is_alive()]
+        for index in range(len(_worker_threads), count):
+            thread = threading.Thread(
+                target=run_worker,
+                args=(worker_name(index),),
+                name=f"transcript-worker-{index}",
+                daemon=True,
+            )
+            thread.start()
+            _worker_threads.append(thread)
+    return list(_worker_threads)
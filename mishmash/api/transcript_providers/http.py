@@ -0,0 +1,217 @@
+"""
+Transcript Provider HTTP Client
+===============================
+
+Shared HTTP client for transcript providers that are scraped over HTTP (Ulink).
+Provider calls happen inside API requests, so a slow or dead provider must not
+hold a gunicorn thread for long. The client adds:
+
+- keep-alive connection pooling (one `requests.Session` per thread, since
+  sessions are not thread-safe)
+- connect and read timeouts on every request
+- a bounded number of retries with exponential backoff, for connection errors
+  and 502/503/504 responses only (all requests are idempotent GETs)
+- a circuit breaker: after `failure_threshold` consecutive failures the
+  provider is considered down, and calls fail immediately with
+  `ProviderUnavailableError` for `reset_timeout` seconds. The next call is
+  then let through as a trial; if it succeeds the circuit closes again.
+
+Defaults come from the TRANSCRIPT_PROVIDER_* settings.
+
+Usage:
+    client = ProviderHTTPClient("http://ulink.example.edu", auth=("user", "pass"))
+    response = client.get("/cgi-bin/view-pin.pl", params={"username": "jdoe"})
+"""
+
+import logging
+import threading
+import time
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger("api")
+
+RETRY_STATUSES = (502, 503, 504)
+
+
+class TranscriptProviderError(ConnectionError):
+    """The provider could not be reached or returned a server error."""
+
+
+class ProviderUnavailableError(TranscriptProviderError):
+    """The circuit breaker is open; the provider was not contacted."""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker, shared by all threads of a process.
+
+    closed:    calls go through; failures are counted
+    open:      calls are rejected until `reset_timeout` seconds have passed
+    half-open: one trial call goes through; success closes, failure re-opens
+    """
+
+    def __init__(self, failure_threshold, reset_timeout, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.failures = 0
+        self.opened_at = None
+        self.trial_running = False
+
+    @property
+    def state(self):
+        with self.lock:
+            return self._state()
+
+    def _state(self):
+        if self.opened_at is None:
+            return "closed"
+        if self.clock() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self):
+        """Return whether a call may go through now."""
+        with self.lock:
+            state = self._state()
+            if state == "closed":
+                return True
+            if state == "half-open" and not self.trial_running:
+                self.trial_running = True
+                return True
+            return False
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_running = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            self.trial_running = False
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                self.opened_at = self.clock()
+                return True
+            return False
+
+
+class ProviderHTTPClient:
+    """HTTP client for one provider; see the module docstring."""
+
+    def __init__(
+        self,
+        base_url,
+        *,
+        name="provider",
+        auth=None,
+        connect_timeout=None,
+        read_timeout=None,
+        retries=None,
+        backoff_factor=None,
+        failure_threshold=None,
+        reset_timeout=None,
+    ):
+        def setting(value, name):
+            return value if value is not None else getattr(settings, name)
+
+        self.base_url = base_url.rstrip("/")
+        self.name = name
+        self.auth = auth
+        self.timeout = (
+            setting(connect_timeout, "TRANSCRIPT_PROVIDER_CONNECT_TIMEOUT"),
+            setting(read_timeout, "TRANSCRIPT_PROVIDER_READ_TIMEOUT"),
+        )
+        self.retries = setting(retries, "TRANSCRIPT_PROVIDER_RETRIES")
+        self.backoff_factor = setting(backoff_factor, "TRANSCRIPT_PROVIDER_BACKOFF")
+        self.breaker = CircuitBreaker(
+            setting(failure_threshold, "TRANSCRIPT_PROVIDER_FAILURE_THRESHOLD"),
+            setting(reset_timeout, "TRANSCRIPT_PROVIDER_RESET_TIMEOUT"),
+        )
+        self._local = threading.local()
+
+    def _build_session(self):
+        retry = Retry(
+            total=self.retries,
+            connect=self.retries,
+            read=self.retries,
+            status=self.retries,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset({"GET"}),
+            backoff_factor=self.backoff_factor,
+            # Give up with the last response instead of raising, so the status is reported
+            raise_on_status=False,
+        )
+        # Each thread has its own session and makes one request at a time
+        adapter = HTTPAdapter(max_retries=retry, pool_connections=1, pool_maxsize=1)
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.auth = self.auth
+        return session
+
+    @property
+    def session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = self._build_session()
+        return session
+
+    def get(self, path, params=None):
+        """
+        GET `path` from the provider.
+
+        Returns:
+            requests.Response: Any response below 500.
+
+        Raises:
+            ProviderUnavailableError: The circuit breaker is open.
+            TranscriptProviderError: The request failed or timed out after all
+                retries, or the provider answered with a server error.
+        """
+        if not self.breaker.allow():
+            raise ProviderUnavailableError(
+                f"{self.name} is unavailable; retrying in up to {self.breaker.reset_timeout} seconds"
+            )
+
+        try:
+            response = self.session.get(
+                f"{self.base_url}{path}", params=params, timeout=self.timeout
+            )
+        except requests.RequestException as e:
+            self._record_failure()
+            raise TranscriptProviderError(f"{self.name} request failed: {e}") from e
+        except Exception:
+            # Never leave a half-open trial call unaccounted for
+            self._record_failure()
+            raise
+
+        if response.status_code >= 500:
+            self._record_failure()
+            raise TranscriptProviderError(
+                f"{self.name} request failed with status {response.status_code}"
+            )
+
+        self.breaker.record_success()
+        return response
+
+    def _record_failure(self):
+        if self.breaker.record_failure():
+            logger.warning(
+                "%s circuit breaker opened for %s seconds",
+                self.name,
+                self.breaker.reset_timeout,
+            )
+
+    def close(self):
+        """Close this thread's pooled connections."""
+        session = getattr(self._local, "session", None)
+        if session is not None:
+            session.close()
+            self._local.session = None
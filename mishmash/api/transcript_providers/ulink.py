@@ -1,9 +1,13 @@
 from .base import TranscriptProvider
-from .ulink_scraper import get_ulink_pin, refresh_ulink_transcript
+from .ulink_scraper import get_ulink_client, get_ulink_pin, refresh_ulink_transcript
 from django.core.exceptions import ValidationError
 from ..models import User
 
 class UlinkProvider(TranscriptProvider):
+    def __init__(self, client=None):
+        # Shared, pooled client with timeouts, retries and a circuit breaker
+        self.client = client or get_ulink_client()
+
     def is_account_required(self):
         return True
 
@@ -13,7 +17,7 @@ class UlinkProvider(TranscriptProvider):
         if not username or not pin:
             raise ValidationError("Ulink username and PIN are required.")
 
-        real_pin = get_ulink_pin(username)
+        real_pin = get_ulink_pin(username, client=self.client)
         if str(real_pin) != str(pin):
             return False
         return True
@@ -21,7 +25,7 @@ class UlinkProvider(TranscriptProvider):
     def fetch_transcript(self, user):
         if not user.ulink_username:
             raise ValidationError("User does not have a linked Ulink account.")
-        return refresh_ulink_transcript(user.ulink_username)
+        return refresh_ulink_transcript(user.ulink_username, client=self.client)
 
     def connect_account(self, user, credentials):
         if user.is_sso:
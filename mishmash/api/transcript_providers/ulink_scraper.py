@@ -1,25 +1,40 @@
 import re
-import requests
+import threading
+
 from bs4 import BeautifulSoup
 
+from ..grade_scale import PASSING_GRADES
+from .http import ProviderHTTPClient
+
 ULINK_BASE_URL = "http://ulink.colab.duke.edu:8000"
 ULINK_PIN_ENDPOINT = "/cgi-bin/view-pin.pl"
+ULINK_SCHEDULE_ENDPOINT = "/cgi-bin/view-schedule.pl"
 ULINK_AUTH = ("abroad", "ece@458")
 
 COURSE_CODE_REGEX = re.compile(r"^[A-Z0-9]{1,8} \d{3}$")
-PASSING_GRADES = {"A+", "A", "A-", "B+", "B", "B-", "C+", "C", "C-", "D+", "D", "D-", "S", "IP"}
+
+_ulink_client = None
+_ulink_client_lock = threading.Lock()
+
+
+def get_ulink_client():
+    """Return the process-wide pooled Ulink client (see http.py)."""
+    global _ulink_client
+    if _ulink_client is None:
+        # Request threads and transcript workers may ask for it at the same time
+        with _ulink_client_lock:
+            if _ulink_client is None:
+                _ulink_client = ProviderHTTPClient(ULINK_BASE_URL, name="Ulink", auth=ULINK_AUTH)
+    return _ulink_client
 
 
-def get_ulink_pin(username):
+def get_ulink_pin(username, client=None):
     """
     Retrieve the PIN for a Ulink username via screen scraping.
     """
+    client = client or get_ulink_client()
     params = {"username": username}
-    response = requests.get(
-        f"{ULINK_BASE_URL}{ULINK_PIN_ENDPOINT}",
-        params=params,
-        auth=ULINK_AUTH
-    )
+    response = client.get(ULINK_PIN_ENDPOINT, params=params)
 
     if response.status_code != 200:
         raise ConnectionError(f"Ulink request failed with status {response.status_code}")
@@ -33,17 +48,14 @@ def get_ulink_pin(username):
 
     raise ValueError("PIN not found in Ulink response")
 
-def refresh_ulink_transcript(ulink_username):
+def refresh_ulink_transcript(ulink_username, client=None):
     """
     Retrieves and parses the user's course history from Ulink.
     Returns a dict mapping course codes to grades.
     """
+    client = client or get_ulink_client()
     params = {"username": ulink_username}
-    response = requests.get(
-        f"{ULINK_BASE_URL}/cgi-bin/view-schedule.pl",
-        params=params,
-        auth=ULINK_AUTH
-    )
+    response = client.get(ULINK_SCHEDULE_ENDPOINT, params=params)
 
     if response.status_code != 200:
         raise ConnectionError(f"Ulink transcript request failed with status {response.status_code}")
@@ -0,0 +1,96 @@
+"""
+Transcript Cache
+================
+
+A user's Ulink transcript is cached on the user (`ulink_transcript`) together
+with when it was fetched (`ulink_transcript_fetched_at`) and an etag: the
+SHA-256 of its canonical JSON, so two fetches of an unchanged transcript have
+the same etag.
+
+The cached copy is fresh for TRANSCRIPT_FRESHNESS seconds. Readers such as
+`check_prerequisites` use it whether or not it is fresh (stale-while-
+revalidate): they answer from the cache right away and, when it is stale,
+queue a background refresh (see api/transcript_jobs.py) so the next read is
+up to date. Only a user who has never had a transcript fetched has to wait
+for Ulink.
+
+Each fetch that changes the transcript also adds a `TranscriptSnapshot`, so
+past versions can be compared with `diff_transcripts` without contacting
+Ulink again. Fetches that return the same transcript only update
+`ulink_transcript_fetched_at`.
+"""
+
+import hashlib
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+
+def transcript_etag(transcript):
+    """SHA-256 of the transcript's canonical JSON."""
+    canonical = json.dumps(transcript, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def is_transcript_stale(user, now=None):
+    """
+    Whether the user's cached transcript is older than TRANSCRIPT_FRESHNESS.
+    Transcripts cached before fetch times were recorded count as stale.
+    """
+    if user.ulink_transcript_fetched_at is None:
+        return True
+    now = now or timezone.now()
+    max_age = timedelta(seconds=settings.TRANSCRIPT_FRESHNESS)
+    return now - user.ulink_transcript_fetched_at > max_age
+
+
+def save_transcript(user, transcript, fetched_at=None):
+    """
+    Cache a freshly fetched transcript on `user`, and record a snapshot if it
+    differs from the cached one.
+
+    Returns:
+        TranscriptSnapshot: The new snapshot, or None if the transcript is unchanged.
+    """
+    from .models import TranscriptSnapshot
+
+    fetched_at = fetched_at or timezone.now()
+    etag = transcript_etag(transcript)
+    changed = etag != user.ulink_transcript_etag
+
+    with transaction.atomic():
+        user.ulink_transcript = transcript
+        user.ulink_transcript_etag = etag
+        user.ulink_transcript_fetched_at = fetched_at
+        user.save(
+            update_fields=["ulink_transcript", "ulink_transcript_etag", "ulink_transcript_fetched_at"]
+        )
+        if not changed:
+            return None
+        return TranscriptSnapshot.objects.create(
+            user=user, transcript=transcript, etag=etag, fetched_at=fetched_at
+        )
+
+
+def diff_transcripts(old, new):
+    """
+    Compare two transcripts.
+
+    Returns:
+        dict: {"added": {course: grade}, "removed": {course: grade},
+               "changed": {course: [old grade, new grade]}}
+    """
+    old = old or {}
+    new = new or {}
+    return {
+        "added": {course: grade for course, grade in new.items() if course not in old},
+        "removed": {course: grade for course, grade in old.items() if course not in new},
+        "changed": {
+            course: [old[course], grade]
+            for course, grade in new.items()
+            if course in old and old[course] != grade
+        },
+    }
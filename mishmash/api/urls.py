@@ -69,6 +69,13 @@ Available Endpoints:
 - /users/current_user/:
     - GET: Return the current user's details
 
+Pagination:
+-----------
+- Every list endpoint returns a plain list by default.
+- Passing `?page_size=<n>` (max 200) switches to cursor pagination:
+  `{"next": <url>, "previous": <url>, "results": [...]}`. Follow the `next`
+  link (which carries `?cursor=`) to fetch the following page.
+
 Used by:
 --------
 - Frontend React components for API communication
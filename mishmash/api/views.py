@@ -48,6 +48,7 @@ from .models import (
     ConfidentialNote,
     LetterOfRecommendation,
     SiteBranding,
+    TranscriptRefreshJob,
 )
 from .serializers import (
     UserSerializer,
@@ -60,6 +61,8 @@ from .serializers import (
     AnnouncementSerializer,
     LetterOfRecommendationSerializer,
     SiteBrandingSerializer,
+    TranscriptRefreshJobSerializer,
+    TranscriptSnapshotSerializer,
 )
 from django.shortcuts import render, redirect
 from api.models import User
@@ -69,7 +72,7 @@ from datetime import datetime, timedelta
 from decimal import Decimal
 from django.shortcuts import get_object_or_404
 from django.core.exceptions import ValidationError
-from django.http import JsonResponse, FileResponse
+from django.http import JsonResponse, FileResponse, HttpResponse
 from django.db.models import Count, Q
 from django.shortcuts import get_object_or_404
 from rest_framework.exceptions import ValidationError, NotFound, PermissionDenied
@@ -92,6 +95,18 @@ from allauth.socialaccount.models import SocialAccount
 from django.contrib.auth import logout as django_logout
 import os
 from .transcript_providers.ulink import UlinkProvider
+from .faculty_leads import backfill_faculty_leads
+from .branding import get_current_branding
+from .program_catalog import get_cached_catalog
+from .fieldsets import SparseFieldsetMixin
+from .search import FullTextSearchFilter
+from .signatures import SIGNATURE_KINDS, open_signature
+from .transcript_jobs import enqueue_transcript_refresh, get_latest_job
+from .transcripts import diff_transcripts, is_transcript_stale
+from .prerequisites import build_prerequisite_report, evaluate_prerequisites
+import hashlib
+import json
+from django.utils.http import parse_etags, quote_etag
 from .email_utils import (
     send_recommendation_request_email,
     send_recommendation_retraction_email,
@@ -144,6 +159,17 @@ class IsAdminOrSelf(permissions.BasePermission):
         return request.user.is_admin or obj.id == request.user.id
 
 
+class IsAdminOrSelfOrStaffReadOnly(permissions.BasePermission):
+    """Like IsAdminOrSelf, but faculty and reviewers may also read any user's data."""
+
+    def has_object_permission(self, request, view, obj):
+        if request.method in permissions.SAFE_METHODS and (
+            request.user.is_faculty or request.user.is_reviewer
+        ):
+            return True
+        return request.user.is_admin or obj.id == request.user.id
+
+
 class IsFacultyOrSelf(permissions.BasePermission):
     """Custom permission to allow users to access their own data, while faculty can access any user's data."""
 
@@ -347,7 +373,7 @@ class IsLetterRequestorOrStaff(permissions.BasePermission):
 ### ViewSet classes for the API interface ###
 
 
-class ProgramViewSet(viewsets.ModelViewSet):
+class ProgramViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing study abroad programs.
 
@@ -366,13 +392,24 @@ class ProgramViewSet(viewsets.ModelViewSet):
     - `DELETE /api/programs/{id}/` → Delete a program (admin only)
     - `GET /api/programs/{id}/application_status/` → Get current user's application status (authenticated users)
     - `GET /api/programs/{id}/applicant_counts/` → Get applicant counts for a program (admin only)
+    - `GET /api/programs/applicant_counts/?ids=1,2` → Get applicant counts for many programs (admin only)
     - `GET /api/programs/{id}/questions/` → Get application questions for a program (public)
+    - `GET /api/programs/{id}/prerequisite_report/` → Evaluate the prerequisites of all applicants (admin, faculty and reviewers)
     """
 
     serializer_class = ProgramSerializer
     permission_classes = [IsAdminOrReadOnly]
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ["title"]
+    # Max SQL queries per request, including 2 for session authentication (see api/middleware.py)
+    query_budget = {
+        "list": 5,
+        "retrieve": 5,
+        "applicant_counts": 4,
+        "batch_applicant_counts": 4,
+        "prerequisite_report": 7,
+    }
+    # ?search= is a ranked full-text search (see api/search.py)
+    filter_backends = [filters.OrderingFilter, FullTextSearchFilter]
+    search_index = "program"
     ordering_fields = ["application_deadline"]
     ordering = ["application_deadline"]
 
@@ -383,7 +420,8 @@ class ProgramViewSet(viewsets.ModelViewSet):
         ## Filters:
         - Optional exclude_ended parameter (default=false). When true, filters programs where `end_date >= today`
           (only current and future programs are shown). When false or not specified, all programs are shown including past ones.
-        - Optional search filter for `title` or `faculty_leads`
+        - Optional search filter on `title` and `description` (full-text, prefix
+          matching; results are ranked by relevance unless `ordering` is given)
         - Optional faculty_ids filter for specific faculty members
 
         ## Returns:
@@ -405,14 +443,10 @@ class ProgramViewSet(viewsets.ModelViewSet):
             today = timezone.now().date()
             queryset = queryset.filter(end_date__gte=today)
 
-        search = self.request.query_params.get("search", None)
         faculty_ids = self.request.query_params.get("faculty_ids", None)
         partner_ids = self.request.query_params.get("partner_ids", None)
         track_payment = self.request.query_params.get("track_payment", None)
 
-        if search:
-            queryset = queryset.filter(Q(title__icontains=search))
-
         if faculty_ids:
             faculty_id_list = [int(id) for id in faculty_ids.split(",") if id.isdigit()]
             if faculty_id_list:
@@ -429,23 +463,44 @@ class ProgramViewSet(viewsets.ModelViewSet):
             elif track_payment.lower() == "false":
                 queryset = queryset.filter(track_payment=False)
 
-        # TODO this might be where the bug is for faculty not updating when no fauclty
-        # Check for programs with no faculty leads and add admin user as default
-        for program in queryset:
-            # Check if program has any faculty leads
-            if not program.faculty_leads.exists():
-                # Find admin user
-                try:
-                    admin_user = User.objects.get(username="admin")
-                    # Add admin user as faculty lead
-                    program.faculty_leads.add(admin_user)
-                    program.save()
-                except User.DoesNotExist:
-                    # Handle case where admin user doesn't exist
-                    pass
+        # Programs always have a faculty lead (enforced on write, see api/faculty_leads.py)
+        if self.action in ("list", "retrieve"):
+            queryset = queryset.with_people()
 
         return queryset.distinct()
 
+    def list(self, request, *args, **kwargs):
+        """
+        List programs (see get_queryset for the filters).
+
+        Unpaginated responses are served from a cache keyed by the filter
+        parameters and invalidated on program, faculty lead, provider partner
+        and user changes (see api/program_catalog.py).
+        """
+        if "cursor" in request.query_params or "page_size" in request.query_params:
+            return super().list(request, *args, **kwargs)
+
+        def serialize_catalog():
+            queryset = self.filter_queryset(self.get_queryset())
+            # A plain list, so the cached value does not reference the serializer
+            return list(self.get_serializer(queryset, many=True).data)
+
+        return Response(get_cached_catalog(request.query_params, serialize_catalog))
+
+    def perform_create(self, serializer):
+        """
+        Save the program and make sure it has at least one faculty lead.
+        """
+        super().perform_create(serializer)
+        backfill_faculty_leads([serializer.instance.id])
+
+    def perform_update(self, serializer):
+        """
+        Save the program and make sure it still has at least one faculty lead.
+        """
+        super().perform_update(serializer)
+        backfill_faculty_leads([serializer.instance.id])
+
     def create(self, request, *args, **kwargs):
         """
         Create a new study abroad program.
@@ -817,25 +872,85 @@ class ProgramViewSet(viewsets.ModelViewSet):
         """
         program = self.get_object()
 
-        all_apps = Application.objects.filter(program=program)
+        # Enrolled -> Completed transitions are handled by api/lifecycle.py
+        status_counts = dict(
+            Application.objects.filter(program=program)
+            .values_list("status")
+            .annotate(count=Count("id"))
+            .order_by()
+        )
 
-        for app in all_apps:
-            if (
-                app.program.end_date < datetime.today().date()
-                and app.status == "Enrolled"
-            ):
-                app.status = "Completed"
-                app.save()
-
-        applicant_counts = all_apps.aggregate(
-            applied=Count("id", filter=Q(status="Applied")),
-            eligible=Count("id", filter=Q(status="Eligible")),
-            approved=Count("id", filter=Q(status="Approved")),
-            enrolled=Count("id", filter=Q(status="Enrolled")),
-            completed=Count("id", filter=Q(status="Completed")),
-            withdrawn=Count("id", filter=Q(status="Withdrawn")),
-            canceled=Count("id", filter=Q(status="Canceled")),
+        return Response(self._summarize_applicant_counts(status_counts))
+
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="applicant_counts",
+        permission_classes=[IsAdminOrReadOnly],
+    )
+    def batch_applicant_counts(self, request):
+        """
+        Retrieve applicant counts for many programs at once, keyed by program ID.
+
+        ## Query Parameters:
+        - `ids=<id>,<id>,...` → Only include these programs
+        - Otherwise the program list filters (`exclude_ended`, `faculty_ids`,
+          `partner_ids`, `track_payment`, `search`; see get_queryset) select the
+          programs, so a table can request the counts of the programs it lists
+          with the same parameters instead of sending every ID (default: all programs)
+
+        ## Returns:
+        - 200 OK: `{ "3": { "applied": 10, "enrolled": 5, ..., "total_active": 15 }, "4": {...} }`
+        - 400 Bad Request: If `ids` contains something other than program IDs
+
+        ## Example:
+        - `GET /api/programs/applicant_counts/?ids=3,4,7`
+        - `GET /api/programs/applicant_counts/?exclude_ended=true&faculty_ids=2`
+
+        ## Permissions:
+        - Admin only
+        """
+        ids = request.query_params.get("ids", None)
+        programs = self.filter_queryset(self.get_queryset())
+        if ids:
+            programs = Program.objects.all()
+            id_list = [id.strip() for id in ids.split(",") if id.strip()]
+            if not all(id.isdigit() for id in id_list):
+                return Response(
+                    {"detail": "ids must be a comma-separated list of program IDs."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            programs = programs.filter(id__in=[int(id) for id in id_list])
+
+        program_ids = list(programs.values_list("id", flat=True))
+
+        # One GROUP BY program, status query for all requested programs
+        status_counts = {program_id: {} for program_id in program_ids}
+        rows = (
+            Application.objects.filter(program_id__in=program_ids)
+            .values_list("program_id", "status")
+            .annotate(count=Count("id"))
+            .order_by()
         )
+        for program_id, app_status, count in rows:
+            status_counts[program_id][app_status] = count
+
+        return Response(
+            {
+                str(program_id): self._summarize_applicant_counts(counts)
+                for program_id, counts in status_counts.items()
+            }
+        )
+
+    @staticmethod
+    def _summarize_applicant_counts(status_counts):
+        """
+        Build the applicant counts response from a `{status: count}` mapping.
+        """
+        applicant_counts = {
+            app_status.lower(): status_counts.get(app_status, 0)
+            for app_status in ALL_STATUSES
+        }
 
         applicant_counts["total_active"] = (
             applicant_counts["applied"]
@@ -844,17 +959,11 @@ class ProgramViewSet(viewsets.ModelViewSet):
             + applicant_counts["approved"]
         )
 
-        applicant_counts["total_participants"] = (
-            applicant_counts["applied"]
-            + applicant_counts["enrolled"]
-            + applicant_counts["eligible"]
-            + applicant_counts["approved"]
-            + applicant_counts["completed"]
-            + applicant_counts["withdrawn"]
-            + applicant_counts["canceled"]
+        applicant_counts["total_participants"] = sum(
+            applicant_counts[app_status.lower()] for app_status in ALL_STATUSES
         )
 
-        return Response(applicant_counts)
+        return applicant_counts
 
     @action(detail=True, methods=["get"], permission_classes=[IsAdminOrReadOnly])
     def questions(self, request, pk=None):
@@ -912,33 +1021,71 @@ class ProgramViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        if not student.ulink_transcript:
-            student.save()  # this will re-attempt to connect ulink for sso users
+        if student.ulink_transcript is None:
+            # Fetched in the background; the client polls the job and checks again.
+            # A recently failed job is returned as is rather than retried.
+            job, _ = enqueue_transcript_refresh(student)
+            return Response(
+                {
+                    "detail": "The transcript is being fetched from Ulink. Check again once the refresh has finished.",
+                    "job": TranscriptRefreshJobSerializer(job).data,
+                },
+                status=status.HTTP_202_ACCEPTED,
+            )
+
+        # Stale-while-revalidate: answer from the cached transcript, refresh it in the background
+        refresh_job = None
+        if is_transcript_stale(student):
+            refresh_job, _ = enqueue_transcript_refresh(student)
 
-            provider = UlinkProvider()
+        missing = evaluate_prerequisites(program, student.ulink_transcript)
 
-            try:
-                transcript_data = provider.fetch_transcript(student)
-                student.ulink_transcript = transcript_data
-                student.save()
-                return Response({"message": "Transcript updated.", "transcript": transcript_data}, status=200)
-            except Exception as e:
-                return Response({
-                    "error": f"Transcript refresh failed: {str(e)}",
-                    "transcript": student.ulink_transcript or {}
-                }, status=502)
-
-        transcript = student.ulink_transcript
-        missing = []
-        for course in program.prerequisites:
-            grade = transcript.get(course)
-            if not grade or (grade not in ["IP", "S"] and grade > "D-"):
-                missing.append(course)
-
-        return Response({"meets_all": len(missing) == 0, "missing": missing})
-
-
-class ApplicationViewSet(viewsets.ModelViewSet):
+        return Response(
+            {
+                "meets_all": len(missing) == 0,
+                "missing": missing,
+                "transcript_fetched_at": student.ulink_transcript_fetched_at,
+                "stale": refresh_job is not None,
+                "refresh_job": TranscriptRefreshJobSerializer(refresh_job).data if refresh_job else None,
+            }
+        )
+
+    @action(detail=True, methods=["get", "post"], permission_classes=[IsAuthenticated])
+    def prerequisite_report(self, request, pk=None):
+        """
+        Evaluate the prerequisites of every applicant of a program at once, from
+        their cached transcripts (see api/prerequisites.py).
+
+        - `GET` only reads the cached transcripts.
+        - `POST` also queues transcript refreshes, in one batch, for applicants
+          whose transcript is stale or has never been fetched, skipping those
+          whose last refresh failed recently. Their rows have
+          `refresh_queued: true`; GET the report again once the refreshes have finished.
+
+        ## Returns:
+        - 200 OK: `{"prerequisites": [...], "summary": {...}, "applicants": [{"application_id": 4,
+          "student_id": 9, "transcript_status": "fresh", "meets_all": false, "missing": ["BIOL 101"], ...}]}`
+          `meets_all` and `missing` are `null` for applicants without a transcript.
+        - 403 Forbidden: If the user is not an admin, faculty member or reviewer
+
+        ## Example:
+        - `GET /api/programs/3/prerequisite_report/`
+        - `POST /api/programs/3/prerequisite_report/`
+
+        ## Permissions:
+        - Admins, faculty and reviewers
+        """
+        if not (request.user.is_admin or request.user.is_faculty or request.user.is_reviewer):
+            return Response(
+                {"detail": "You do not have permission to perform this action."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        program = self.get_object()
+        return Response(build_prerequisite_report(program, refresh=request.method == "POST"))
+
+
+class ApplicationViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing study abroad applications.
 
@@ -947,6 +1094,7 @@ class ApplicationViewSet(viewsets.ModelViewSet):
     - Students can only view their own applications.
     - Supports filtering by student ID (`GET /api/applications/?student=<id>`)
     - Supports filtering by program ID (`GET /api/applications/?program=<id>`).
+    - Supports embedding related objects (`GET /api/applications/?expand=student,program`).
     - Ensures applicants must be at least 10 years old.
 
     ## Permissions:
@@ -970,6 +1118,7 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         | IsOwnerOrReviewer
         | IsOwnerOrProviderPartner,
     ]
+    query_budget = {"list": 3}
 
     def get_queryset(self):
         """
@@ -982,12 +1131,18 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         ## Query Parameters:
         - `student=<id>` → Filters by student ID (admin only).
         - `program=<id>` → Filters by program ID.
+        - `expand=student,program` → Embeds `student_details` (display name, email,
+          role flags) and/or `program_details` (title) in each application.
 
         ## Returns:
         - List of applications matching the filters.
         """
         queryset = Application.objects.all()
 
+        expand = self.get_expand()
+        if expand:
+            queryset = queryset.select_related(*expand)
+
         student_id = self.request.query_params.get("student", None)
         if student_id:
             queryset = queryset.filter(student_id=student_id)
@@ -996,16 +1151,23 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         if program_id:
             queryset = queryset.filter(program_id=program_id)
 
-        for app in queryset:
-            if (
-                app.program.end_date < datetime.today().date()
-                and app.status == "Enrolled"
-            ):
-                app.status = "Completed"
-                app.save()
-
         return queryset
 
+    def get_expand(self):
+        """
+        Parse the `expand` query parameter into the set of relations to embed.
+        """
+        expand = self.request.query_params.get("expand", "")
+        return sorted(
+            {field.strip() for field in expand.split(",")}
+            & set(ApplicationSerializer.EXPANDABLE_FIELDS)
+        )
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["expand"] = self.get_expand()
+        return context
+
     def perform_create(self, serializer):
         """
         Automatically assign the authenticated user as the applicant.
@@ -1033,6 +1195,7 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         ## Validation:
         - `date_of_birth` must be at least 10 years ago.
         - `program` must exist.
+        - The student must not already have an application for `program`.
 
         ## Returns:
         - `201 Created` with `{"message": "Application created", "id": <id>}`
@@ -1064,6 +1227,18 @@ class ApplicationViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+        program_id = str(request.data.get("program", ""))
+        if (
+            program_id.isdigit()
+            and Application.objects.filter(
+                student=request.user, program_id=program_id
+            ).exists()
+        ):
+            return Response(
+                {"detail": "You have already applied to this program."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
         return super().create(request, *args, **kwargs)
 
     def update(self, request, *args, **kwargs):
@@ -1170,7 +1345,7 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         return super().update(request, *args, **kwargs)
 
 
-class ApplicationQuestionViewSet(viewsets.ModelViewSet):
+class ApplicationQuestionViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
 
     queryset = ApplicationQuestion.objects.all()
 
@@ -1196,7 +1371,7 @@ class ApplicationQuestionViewSet(viewsets.ModelViewSet):
         return queryset
 
 
-class ApplicationResponseViewSet(viewsets.ModelViewSet):
+class ApplicationResponseViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing responses to application questions.
 
@@ -1348,12 +1523,16 @@ class ApplicationResponseViewSet(viewsets.ModelViewSet):
         return super().update(request, *args, **kwargs)
 
 
-class AnnouncementViewSet(viewsets.ModelViewSet):
+class AnnouncementViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing announcements.
 
     - Public & Students: Can view active announcements.
     - Admins: Can create, update, delete, and view all announcements.
+
+    `GET /api/announcements/?fields=summary` lists announcements without their
+    rich text `content` (see api/fieldsets.py); use `excerpt` as the preview and
+    retrieve a single announcement for the full document.
     """
 
     serializer_class = AnnouncementSerializer
@@ -1362,18 +1541,19 @@ class AnnouncementViewSet(viewsets.ModelViewSet):
     ordering_fields = ["created_at", "importance", "pinned"]
     # Use model ordering: pinned first, then creation date descending
     ordering = ["-pinned", "-created_at"]
+    query_budget = {"list": 3}
 
     # Add parsers to support file uploads
     parser_classes = [MultiPartParser, FormParser]
 
     def get_queryset(self):
-        queryset = Announcement.objects.all()
+        queryset = Announcement.objects.select_related("created_by")
         if not self.request.user.is_authenticated or not self.request.user.is_admin:
             queryset = queryset.filter(is_active=True)
         return queryset
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing users.
 
@@ -1395,6 +1575,7 @@ class UserViewSet(viewsets.ModelViewSet):
     - `POST /api/users/login/` → Authenticate user and provide token
     - `POST /api/users/logout/` → Log out current user
     - `GET /api/users/current_user/` → Retrieve current user details
+    - `GET /api/users/me/dashboard/` → Current user's programs with application, document and letter status
     - `PATCH /api/users/change_password/` → Change current user's password
 
     ## Permissions:
@@ -1405,6 +1586,7 @@ class UserViewSet(viewsets.ModelViewSet):
 
     queryset = User.objects.all()
     serializer_class = UserSerializer
+    query_budget = {"list": 3, "dashboard": 8}
     permission_classes = [
         IsAuthenticated,
         IsAdminOrReadOnly
@@ -1412,8 +1594,8 @@ class UserViewSet(viewsets.ModelViewSet):
         | IsReviewerOrSelf
         | IsProviderPartnerOrSelf,
     ]
-    filter_backends = [filters.SearchFilter]
-    search_fields = ["username", "display_name", "email"]
+    filter_backends = [FullTextSearchFilter]
+    search_index = "user"
 
     def get_permissions(self):
         """
@@ -1427,7 +1609,7 @@ class UserViewSet(viewsets.ModelViewSet):
         """
         Return all users for admins, but only faculty for public faculty list
         """
-        queryset = User.objects.all()
+        queryset = User.objects.with_sso()
         is_faculty = self.request.query_params.get("is_faculty")
         is_provider_partner = self.request.query_params.get("is_provider_partner")
 
@@ -1479,15 +1661,13 @@ class UserViewSet(viewsets.ModelViewSet):
         # it shoiuld be FACULTY not ADMIN
         if user.is_faculty and not new_is_faculty or new_is_provider_partner:
             # User is being demoted from admin, remove them from faculty lead roles
-            programs = Program.objects.filter(faculty_leads=user)
-            for program in programs:
-                program.faculty_leads.remove(user)
-                if program.faculty_leads.count() == 0:
-                    admin_user = User.objects.get(username="admin")
-                    program.faculty_leads.add(admin_user)
-                program.save()
+            led_program_ids = list(
+                Program.objects.filter(faculty_leads=user).values_list("id", flat=True)
+            )
+            user.led_programs.clear()
+            backfill_faculty_leads(led_program_ids)
             print(
-                f"Removed {user.username} from faculty leads of {programs.count()} programs"
+                f"Removed {user.username} from faculty leads of {len(led_program_ids)} programs"
             )
 
         if not user.is_provider_partner and new_is_provider_partner:
@@ -1651,7 +1831,7 @@ class UserViewSet(viewsets.ModelViewSet):
 
         if user.is_admin and "user_id" in request.data:
             try:
-                user = User.objects.get(id=request.data["user_id"])
+                user = User.objects.with_sso().get(id=request.data["user_id"])
             except User.DoesNotExist:
                 return Response(
                     {"detail": "User not found."}, status=status.HTTP_404_NOT_FOUND
@@ -1699,10 +1879,133 @@ class UserViewSet(viewsets.ModelViewSet):
         ## Permissions:
         - Public access (any user can view faculty list)
         """
-        faculty = User.objects.filter(is_faculty=True).order_by("display_name")
+        faculty = User.objects.with_sso().filter(is_faculty=True).order_by("display_name")
         serializer = UserSerializer(faculty, many=True)
         return Response(serializer.data)
 
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="me/dashboard",
+        permission_classes=[permissions.IsAuthenticated],
+    )
+    def dashboard(self, request):
+        """
+        ## Student Dashboard
+        **URL:** `GET /api/users/me/dashboard/`
+        **Permissions:** Authenticated users only.
+        **Query Parameters:**
+        - `exclude_ended=true` → Only include current and future programs.
+
+        Returns every program together with the current user's application for it
+        (status, payment status, submitted documents and letter counts), computed
+        with a fixed number of aggregated queries instead of several requests per program.
+
+        **Response:**
+        ```json
+        {
+            "programs": [
+                {
+                    "program": {...program details...},
+                    "application": {
+                        "id": 12,
+                        "status": "Applied",
+                        "payment_status": "Unpaid",
+                        "documents": [{"id": 3, "title": "...", "type": "Housing questionnaire", "application": 12, "pdf_url": "..."}],
+                        "documents_submitted": 1,
+                        "documents_required": 4,
+                        "documents_complete": false,
+                        "letters_requested": 2,
+                        "letters_fulfilled": 1
+                    }
+                },
+                {"program": {...}, "application": null}
+            ]
+        }
+        ```
+        """
+        user = request.user
+
+        programs = Program.objects.with_people().order_by("application_deadline")
+        if request.query_params.get("exclude_ended", "false").lower() == "true":
+            programs = programs.filter(end_date__gte=timezone.now().date())
+
+        applications = {
+            app.program_id: app
+            for app in Application.objects.filter(student=user).only(
+                "id", "program_id", "status", "payment_status"
+            )
+        }
+        application_ids = [app.id for app in applications.values()]
+
+        # Submitted documents, without the form data and signature columns
+        documents = {app_id: [] for app_id in application_ids}
+        for doc in Document.objects.filter(application_id__in=application_ids).only(
+            "id", "title", "type", "application_id", "pdf"
+        ):
+            documents[doc.application_id].append(
+                {
+                    "id": doc.id,
+                    "title": doc.title,
+                    "type": doc.type,
+                    "application": doc.application_id,
+                    "pdf_url": (
+                        f"/api/documents/{doc.id}/secure_file/" if doc.pdf else None
+                    ),
+                }
+            )
+
+        letters = {
+            row["application_id"]: row
+            for row in LetterOfRecommendation.objects.filter(
+                application_id__in=application_ids
+            )
+            .values("application_id")
+            .annotate(
+                requested=Count("id"),
+                fulfilled=Count(
+                    "id",
+                    filter=Q(letter_timestamp__isnull=False)
+                    & Q(pdf__isnull=False)
+                    & ~Q(pdf=""),
+                ),
+            )
+            .order_by()
+        }
+
+        required_types = [doc_type for doc_type, _ in Document.TYPES_OF_DOCS]
+        results = []
+        for program in programs:
+            app = applications.get(program.id)
+            application_data = None
+            if app:
+                app_documents = documents[app.id]
+                submitted_types = {doc["type"] for doc in app_documents}
+                app_letters = letters.get(app.id, {})
+                application_data = {
+                    "id": app.id,
+                    "status": app.status,
+                    "payment_status": (
+                        app.payment_status if program.track_payment else None
+                    ),
+                    "documents": app_documents,
+                    "documents_submitted": len(submitted_types),
+                    "documents_required": len(required_types),
+                    "documents_complete": all(
+                        doc_type in submitted_types for doc_type in required_types
+                    ),
+                    "letters_requested": app_letters.get("requested", 0),
+                    "letters_fulfilled": app_letters.get("fulfilled", 0),
+                }
+            results.append(
+                {
+                    "program": ProgramSerializer(program).data,
+                    "application": application_data,
+                }
+            )
+
+        return Response({"programs": results})
+
     @action(
         detail=True,
         methods=["get"],
@@ -1744,32 +2047,100 @@ class UserViewSet(viewsets.ModelViewSet):
                 {"error": f"Error accessing provider: {str(e)}"}, status=502
             )
 
-    @action(detail=True, methods=["post"], permission_classes=[IsAdminOrSelf])
+    @action(detail=True, methods=["get", "post"], permission_classes=[IsAdminOrSelfOrStaffReadOnly])
     def refresh_transcript(self, request, pk=None):
+        """
+        Queue a refresh of the user's Ulink transcript, or poll its progress.
+        The transcript is fetched by a background worker (see api/transcript_jobs.py);
+        a user has at most one queued or running refresh.
+
+        ## Returns:
+        - POST 202 Accepted: The queued (or already queued) job and the current transcript
+        - POST 400 Bad Request: If the user has no linked Ulink account
+        - POST 429 Too Many Requests: If the last refresh failed within
+          TRANSCRIPT_REFRESH_FAILURE_COOLDOWN; the failed job is returned
+        - GET 200 OK: The user's latest job (`null` if none), and the current transcript
+          with its fetch time and etag
+
+        ## Example:
+        - `POST /api/users/5/refresh_transcript/`
+        - `GET /api/users/5/refresh_transcript/` → `{"job": {"status": "succeeded", ...}, "transcript": {...}}`
+
+        ## Permissions:
+        - POST: Admins or the user themself
+        - GET: Admins, faculty, reviewers or the user themself (faculty and reviewers
+          poll the refreshes queued by `check_prerequisites`)
+        """
         user = self.get_object()
-        user.save()  # this will re-attempt to connect ulink for sso users
 
-        provider = UlinkProvider()
+        if request.method == "GET":
+            job = get_latest_job(user)
+            return Response(
+                {
+                    "job": TranscriptRefreshJobSerializer(job).data if job else None,
+                    "transcript": user.ulink_transcript or {},
+                    "transcript_fetched_at": user.ulink_transcript_fetched_at,
+                    "transcript_etag": user.ulink_transcript_etag,
+                }
+            )
 
-        try:
-            transcript_data = provider.fetch_transcript(user)
-            user.ulink_transcript = transcript_data
-            user.save()
+        if not user.ulink_username and not user.is_sso:
             return Response(
-                {"message": "Transcript updated.", "transcript": transcript_data},
-                status=200,
+                {"detail": "This user does not have a Ulink username linked."},
+                status=status.HTTP_400_BAD_REQUEST,
             )
-        except Exception as e:
+
+        job, created = enqueue_transcript_refresh(user)
+        if job.status == TranscriptRefreshJob.STATUS_FAILED:
             return Response(
                 {
-                    "error": f"Transcript refresh failed: {str(e)}",
-                    "transcript": user.ulink_transcript or {},
+                    "detail": "The last transcript refresh failed. Try again in a few minutes.",
+                    "job": TranscriptRefreshJobSerializer(job).data,
                 },
-                status=502,
+                status=status.HTTP_429_TOO_MANY_REQUESTS,
             )
+        return Response(
+            {
+                "message": "Transcript refresh queued." if created else "Transcript refresh already in progress.",
+                "job": TranscriptRefreshJobSerializer(job).data,
+                "transcript": user.ulink_transcript or {},
+                "transcript_fetched_at": user.ulink_transcript_fetched_at,
+                "transcript_etag": user.ulink_transcript_etag,
+            },
+            status=status.HTTP_202_ACCEPTED,
+        )
 
+    @action(detail=True, methods=["get"], permission_classes=[IsAdminOrSelf])
+    def transcript_history(self, request, pk=None):
+        """
+        List the recorded versions of the user's Ulink transcript, newest first.
+        Each version carries its `changes` from the version before it (see
+        api/transcripts.py), so transcripts can be compared without re-fetching.
+
+        ## Returns:
+        - 200 OK: List of snapshots
 
-class ConfidentialNoteViewSet(viewsets.ModelViewSet):
+        ## Example:
+        - `GET /api/users/5/transcript_history/` →
+          `[{"etag": "...", "fetched_at": "...", "transcript": {...},
+             "changes": {"added": {}, "removed": {}, "changed": {"ECE 458": ["IP", "A"]}}}, ...]`
+
+        ## Permissions:
+        - Admins or the user themself
+        """
+        user = self.get_object()
+        snapshots = TranscriptSnapshotSerializer(
+            user.transcript_snapshots.order_by("-fetched_at", "-id"), many=True
+        ).data
+
+        for snapshot, previous in zip(snapshots, snapshots[1:] + [None]):
+            snapshot["changes"] = diff_transcripts(
+                previous["transcript"] if previous else {}, snapshot["transcript"]
+            )
+        return Response(snapshots)
+
+
+class ConfidentialNoteViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing confidential notes on applications.
 
@@ -1881,7 +2252,7 @@ class ConfidentialNoteViewSet(viewsets.ModelViewSet):
         )
 
 
-class DocumentViewSet(viewsets.ModelViewSet):
+class DocumentViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = Document.objects.all()
     serializer_class = DocumentSerializer
     parser_classes = [MultiPartParser, FormParser, JSONParser]
@@ -1937,7 +2308,7 @@ class DocumentViewSet(viewsets.ModelViewSet):
         - If a `program_id` query parameter is provided, filters the questions for that specific program.
         - If the provided `program_id` does not exist, returns a 404 error.
         """
-        queryset = Document.objects.all()
+        queryset = Document.objects.with_signature_flags()
         application_id = self.request.query_params.get("application", None)
 
         if application_id is not None:
@@ -1999,8 +2370,64 @@ class DocumentViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
+    @action(detail=True, methods=["get"])
+    def signature(self, request, pk=None):
+        """
+        Serve one of a document's signature images (see api/signatures.py).
 
-class LetterOfRecommendationViewSet(viewsets.ModelViewSet):
+        ## Query Parameters:
+        - `kind`: "student" (default) or "parent_guardian"
+
+        ## Returns:
+        - The PNG or SVG image, with an `ETag` of its content hash
+        - `304 Not Modified` if the `If-None-Match` header matches
+        - `400 Bad Request` if `kind` is not valid
+        - `404 Not Found` if the document has no such signature
+
+        ## Permissions:
+        - The student who submitted the document, admins and faculty (as for `secure_file`)
+        """
+        kind = request.query_params.get("kind", "student")
+        if kind not in SIGNATURE_KINDS:
+            return Response(
+                {"detail": f"Invalid kind. Choose from: {', '.join(SIGNATURE_KINDS)}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        document = self.get_object()
+        user = request.user
+        if not (user.is_admin or user.is_faculty or document.application.student_id == user.id):
+            return Response(
+                {"detail": "You do not have permission to access this signature."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        try:
+            signature = open_signature(document, kind)
+        except ValueError:
+            # An inline signature from before they were validated
+            signature = None
+        if signature is None:
+            return Response(
+                {"detail": "This document has no such signature."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        content, content_type, digest = signature
+        etag = quote_etag(digest)
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = HttpResponse(content, content_type=content_type)
+        response["ETag"] = etag
+        response["Cache-Control"] = "private, no-cache"
+        # SVG can carry scripts; never run them or let the browser guess the type
+        response["Content-Security-Policy"] = "default-src 'none'; style-src 'unsafe-inline'; sandbox"
+        response["X-Content-Type-Options"] = "nosniff"
+        return response
+
+
+class LetterOfRecommendationViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing Letters of Recommendation.
     Students create requests, system emails the writer, writer uploads PDF using token-based link.
@@ -2384,7 +2811,7 @@ class MFAViewSet(viewsets.ViewSet):
         )
 
 
-class SiteBrandingViewSet(viewsets.ModelViewSet):
+class SiteBrandingViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing site branding settings (white-label support).
     Only administrators can modify branding settings, but all users can view them.
@@ -2393,25 +2820,35 @@ class SiteBrandingViewSet(viewsets.ModelViewSet):
     queryset = SiteBranding.objects.all()
     serializer_class = SiteBrandingSerializer
     permission_classes = [IsAdminOrReadOnly]
+    # The very first request also creates the default record
+    query_budget = {"current": 7}
 
     @action(detail=False, methods=["get"])
     def current(self, request):
         """
         Get the current active branding settings. Creates default settings if none exist.
+
+        The branding is served from a cache (see api/branding.py). Responses carry
+        an `ETag` and `Cache-Control: no-cache`, so browsers revalidate with
+        `If-None-Match` and get `304 Not Modified` while the branding is unchanged.
         """
         try:
-            # Try to get the first branding record, or create a default one if none exists
-            branding, created = SiteBranding.objects.get_or_create(
-                id=1,  # Always use ID 1 for consistency
-                defaults={
-                    "site_name": "Study Abroad College",
-                    "primary_color": "#1976d2",
-                },
-            )
+            branding = get_current_branding()
             serializer = self.get_serializer(branding, context={"request": request})
-            return Response(serializer.data)
+            data = serializer.data
         except Exception as e:
             return Response(
                 {"error": f"Error retrieving branding settings: {str(e)}"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
+
+        etag = quote_etag(
+            hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
+        )
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(data)
+        response["ETag"] = etag
+        response["Cache-Control"] = "no-cache"
+        return response
@@ -16,6 +16,7 @@ import {
 } from "@mui/material";
 import { useParams, useNavigate } from "react-router-dom";
 import axiosInstance from "../utils/axios";
+import { checkPrerequisites, refreshTranscript } from "../utils/transcript";
 import {
   ALL_ADMIN_EDITABLE_STATUSES,
   ALL_PAYMENT_APPLICATION_STATUSES,
@@ -106,13 +107,14 @@ const AdminAppView = () => {
       // Fetch pre-requisite data
       if (appResponse.data && programResponse.data && userResponse.data) {
         try {
-          const prereqResponse = await axiosInstance.get(
-            `/api/programs/${appResponse.data.program}/check_prerequisites/?student_id=${appResponse.data.student}`
+          const prereqData = await checkPrerequisites(
+            appResponse.data.program,
+            appResponse.data.student
           );
-          setPrereqCheck(prereqResponse.data);
+          setPrereqCheck(prereqData);
         } catch (err) {
           console.error("Error fetching prerequisite check:", err);
-          setPrereqCheck({ error: err.response.data.detail });
+          setPrereqCheck({ error: err.response?.data?.detail || err.message });
         }
       }
       setError(null);
@@ -209,13 +211,14 @@ const AdminAppView = () => {
 
   const refreshPrerequisites = async () => {
     try {
-      await axiosInstance.post(`/api/users/${student.id}/refresh_transcript/`);
+      await refreshTranscript(student.id);
 
-      const response = await axiosInstance.get(
-        `/api/programs/${application.program}/check_prerequisites/?student_id=${application.student}`
+      const prereqData = await checkPrerequisites(
+        application.program,
+        application.student
       );
 
-      setPrereqCheck(response.data);
+      setPrereqCheck(prereqData);
       setError(null);
     } catch (err) {
       console.error("Failed to refresh prerequisites:", err);
@@ -55,7 +55,12 @@ const TruncatedTypography = styled(Typography)({
   textOverflow: "ellipsis",
 });
 
+// Cards are full width on phones, two per row on tablets and four on desktops
+const CARD_IMAGE_SIZES = "(max-width: 600px) 100vw, (max-width: 900px) 50vw, 25vw";
+
 const AnnouncementCard = ({ announcement, onClick }) => {
+  const srcset = announcement.cover_image_srcset || {};
+
   const formattedDate = announcement?.created_at
     ? new Date(announcement.created_at).toLocaleDateString(undefined, {
         year: "numeric",
@@ -68,12 +73,23 @@ const AnnouncementCard = ({ announcement, onClick }) => {
     <StyledCard onClick={onClick} sx={{ cursor: "pointer" }}>
       <CardMediaContainer>
         {announcement.cover_image_url && (
-          <CardMedia
-            component="img"
-            height="140"
-            image={announcement.cover_image_url}
-            alt={announcement.title}
-          />
+          <Box component="picture" sx={{ display: "block" }}>
+            {srcset.webp && (
+              <source
+                type="image/webp"
+                srcSet={srcset.webp}
+                sizes={CARD_IMAGE_SIZES}
+              />
+            )}
+            <CardMedia
+              component="img"
+              height="140"
+              image={announcement.cover_image_url}
+              srcSet={srcset.jpeg}
+              sizes={srcset.jpeg ? CARD_IMAGE_SIZES : undefined}
+              alt={announcement.title}
+            />
+          </Box>
         )}
         {announcement.pinned && (
           <PinIcon>
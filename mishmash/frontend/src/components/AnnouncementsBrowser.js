@@ -28,7 +28,10 @@ const AnnouncementsBrowser = () => {
 
   const fetchAnnouncements = async () => {
     try {
-      const res = await axiosInstance.get("/api/announcements/");
+      // Cards only need the summary; the full content is loaded when opened
+      const res = await axiosInstance.get("/api/announcements/", {
+        params: { fields: "summary" },
+      });
       const active = res.data.filter((a) => a.is_active);
       setAnnouncements(active);
     } catch (err) {
@@ -69,8 +72,19 @@ const AnnouncementsBrowser = () => {
     handleSortMenuClose();
   };
 
+  const openAnnouncement = async (announcement) => {
+    try {
+      const res = await axiosInstance.get(
+        `/api/announcements/${announcement.id}/`
+      );
+      setSelectedAnnouncement(res.data);
+    } catch (err) {
+      console.error("Error fetching announcement", err);
+    }
+  };
+
   const handleNavigate = (announcement) => {
-    setSelectedAnnouncement(announcement);
+    openAnnouncement(announcement);
   };
 
   return (
@@ -119,7 +133,7 @@ const AnnouncementsBrowser = () => {
           <Grid item xs={12} sm={6} md={3} key={ann.id}>
             <AnnouncementCard
               announcement={ann}
-              onClick={() => setSelectedAnnouncement(ann)}
+              onClick={() => openAnnouncement(ann)}
             />
           </Grid>
         ))}
@@ -24,6 +24,7 @@ import {
 } from "@mui/material";
 import { useNavigate } from "react-router-dom";
 import axiosInstance from "../utils/axios";
+import { checkPrerequisites, refreshPrerequisiteReport } from "../utils/transcript";
 import {
   get_all_available_statuses_to_edit,
   STATUS,
@@ -72,6 +73,8 @@ const ApplicantTable = ({ programId, show_track_payment }) => {
   const [documents, setDocuments] = useState({});
   const [confidentialNotes, setConfidentialNotes] = useState({});
   const [prereqCheck, setPrereqCheck] = useState(null);
+  const [prereqReport, setPrereqReport] = useState({});
+  const [refreshingTranscripts, setRefreshingTranscripts] = useState(false);
   const ALL_AVAILABLE_STATUSES = Object.values(
     get_all_available_statuses_to_edit(user.roles_object)
   );
@@ -98,21 +101,47 @@ const ApplicantTable = ({ programId, show_track_payment }) => {
     fetchApplicants();
   }, [programId, statusFilter]);
 
+  // Map prerequisite results by application
+  const mapReportRows = (rows) => {
+    const reportMap = {};
+    rows.forEach((row) => {
+      reportMap[row.application_id] = row;
+    });
+    return reportMap;
+  };
+
+  const outdatedTranscriptCount = Object.values(prereqReport).filter(
+    (row) => row.transcript_status === "stale" || row.transcript_status === "missing"
+  ).length;
+
+  const handleRefreshTranscripts = async () => {
+    setRefreshingTranscripts(true);
+    try {
+      const report = await refreshPrerequisiteReport(programId);
+      setPrereqReport(mapReportRows(report.applicants));
+      setSnackbarMessage("Transcripts refreshed.");
+      setSnackbarSeverity("success");
+    } catch (err) {
+      console.error("Error refreshing transcripts:", err);
+      setSnackbarMessage(err.response?.data?.detail || "Failed to refresh transcripts.");
+      setSnackbarSeverity("error");
+    } finally {
+      setRefreshingTranscripts(false);
+      setSnackbarOpen(true);
+    }
+  };
+
   const fetchApplicants = async () => {
     try {
       setLoading(true);
-      let url = `/api/applications/?program=${programId}`;
+      let url = `/api/applications/?program=${programId}&expand=student`;
       if (statusFilter !== "ALL") url += `&status=${statusFilter}`;
 
       const response = await axiosInstance.get(url);
       setApplicants(response.data);
 
-      // Fetch user details, documents, and notes for each applicant
-      const userRequests = response.data.map((app) =>
-        axiosInstance
-          .get(`/api/users/${app.student}`)
-          .then((res) => ({ id: app.student, ...res.data }))
-      );
+      // Student details are embedded via expand=student;
+      // fetch documents and notes for each applicant
       const documentRequests = response.data.map((app) =>
         axiosInstance
           .get(`/api/documents/?application=${app.id}`)
@@ -124,14 +153,23 @@ const ApplicantTable = ({ programId, show_track_payment }) => {
           .then((res) => ({ id: app.id, notes: res.data }))
       );
 
-      const userResponses = await Promise.all(userRequests);
+      // Prerequisites of all applicants in one request, from their cached transcripts
+      const reportRequest = axiosInstance
+        .get(`/api/programs/${programId}/prerequisite_report/`)
+        .then((res) => res.data.applicants)
+        .catch((err) => {
+          console.error("Error fetching prerequisite report:", err);
+          return [];
+        });
+
       const documentResponses = await Promise.all(documentRequests);
       const noteResponses = await Promise.all(noteRequests);
+      setPrereqReport(mapReportRows(await reportRequest));
 
       // Map users
       const userMap = {};
-      userResponses.forEach((user) => {
-        userMap[user.id] = user;
+      response.data.forEach((app) => {
+        userMap[app.student] = { id: app.student, ...app.student_details };
       });
       setUserDetails(userMap);
 
@@ -281,20 +319,23 @@ const ApplicantTable = ({ programId, show_track_payment }) => {
     if (newStatus === currentStatus) return;
 
     try {
-      // Fetch application to get student and program IDs
-      const appResponse = await axiosInstance.get(
-        `/api/applications/${applicantId}/`
-      );
-
-      // Then fetch prerequisite check
-      const prereqResponse = await axiosInstance.get(
-        `/api/programs/${appResponse.data.program}/check_prerequisites/?student_id=${appResponse.data.student}`
-      );
-
-      setPrereqCheck(prereqResponse.data);
+      // Use the program's prerequisite report; only check applicants it has no transcript for
+      const reportRow = prereqReport[applicantId];
+      if (reportRow && reportRow.meets_all !== null) {
+        setPrereqCheck(reportRow);
+      } else {
+        const appResponse = await axiosInstance.get(
+          `/api/applications/${applicantId}/`
+        );
+        const prereqData = await checkPrerequisites(
+          appResponse.data.program,
+          appResponse.data.student
+        );
+        setPrereqCheck(prereqData);
+      }
     } catch (err) {
       console.error("Error fetching prerequisite check:", err);
-      setPrereqCheck({ error: err.response?.data?.detail || "Unknown error" });
+      setPrereqCheck({ error: err.response?.data?.detail || err.message || "Unknown error" });
     }
 
     setPendingApplicationStatus({ applicantId, newStatus, currentStatus });
@@ -548,6 +589,17 @@ const ApplicantTable = ({ programId, show_track_payment }) => {
         >
           Copy Emails ({sortedApplicants.length})
         </Button>
+
+        <Button
+          variant="outlined"
+          onClick={handleRefreshTranscripts}
+          disabled={refreshingTranscripts || outdatedTranscriptCount === 0}
+          sx={{ height: "40px" }}
+        >
+          {refreshingTranscripts
+            ? "Refreshing Transcripts..."
+            : `Refresh Transcripts (${outdatedTranscriptCount})`}
+        </Button>
       </Box>
 
       <TableContainer>
@@ -246,39 +246,20 @@ const MyProgramsTable = () => {
     const fetchApplications = async () => {
       try {
         setLoading(true);
-        // Include both current and past programs
-        const programsResponse = await axiosInstance.get("/api/programs/", {
-          params: { exclude_ended: "false" },
-        });
-        const programsWithStatus = await Promise.all(
-          programsResponse.data.map(async (program) => {
-            try {
-              const statusResponse = await axiosInstance.get(
-                `/api/programs/${program.id}/application_status/`
-              );
-              const paymentStatusResponse = await axiosInstance.get(
-                `/api/programs/${program.id}/payment_status/`
-              );
-              let documents = [];
-              if (statusResponse.data.application_id) {
-                const documentsResponse = await axiosInstance.get(
-                  `/api/documents/?application=${statusResponse.data.application_id}`
-                );
-                documents = documentsResponse.data;
-              }
-              console.log(program);
-              return {
-                id: program.id,
-                program,
-                application_id: statusResponse.data.application_id,
-                status: statusResponse.data.status,
-                payment_status: paymentStatusResponse.data.payment_status,
-                documents,
-              };
-            } catch (error) {
-              console.error("Error fetching status:", error);
-              return null;
-            }
+        // Include both current and past programs, with the user's application,
+        // payment and document status for each, in a single request
+        const dashboardResponse = await axiosInstance.get(
+          "/api/users/me/dashboard/",
+          { params: { exclude_ended: "false" } }
+        );
+        const programsWithStatus = dashboardResponse.data.programs.map(
+          ({ program, application }) => ({
+            id: program.id,
+            program,
+            application_id: application?.id,
+            status: application?.status ?? null,
+            payment_status: application?.payment_status,
+            documents: application?.documents || [],
           })
         );
 
@@ -180,22 +180,20 @@ const PartnerProgramsTable = () => {
       setPrograms(response.data);
       setError(null);
 
-      const counts = {};
-      await Promise.all(
-        response.data.map(async (program) => {
-          try {
-            const countResponse = await axiosInstance.get(
-              `/api/programs/${program.id}/applicant_counts/`
-            );
-            counts[program.id] = countResponse.data;
-          } catch (err) {
-            console.error(
-              `Error fetching applicant counts for program ${program.id}:`,
-              err
-            );
-          }
-        })
-      );
+      // Fetch the counts for every listed program in a single request, selected
+      // with the same filters as the list (listing every id can exceed URL limits)
+      let counts = {};
+      if (response.data.length > 0) {
+        try {
+          const countResponse = await axiosInstance.get(
+            "/api/programs/applicant_counts/",
+            { params }
+          );
+          counts = countResponse.data;
+        } catch (err) {
+          console.error("Error fetching applicant counts:", err);
+        }
+      }
       setApplicantCounts(counts);
     } catch (err) {
       setError("Failed to load programs.");
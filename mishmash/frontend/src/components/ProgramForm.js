@@ -23,7 +23,7 @@ import {
 import { Delete, Add, Check } from "@mui/icons-material";
 import { useNavigate } from "react-router-dom";
 import axiosInstance from "../utils/axios";
-import { SEMESTERS } from "../utils/constants";
+import { SEMESTERS, LETTER_GRADES } from "../utils/constants";
 import { DEFAULT_QUESTIONS } from "../utils/constants";
 import ApplicantTable from "./ApplicantTable";
 import FacultyPicklist from "./FacultyPicklist";
@@ -49,7 +49,11 @@ const ProgramForm = ({ onClose, refreshPrograms, editingProgram }) => {
     description: "",
     track_payment: false,
     prerequisites: [],
+    prerequisite_min_grade: "",
+    prerequisite_equivalents: {},
   });
+  // Comma-separated courses accepted instead of each prerequisite, by index
+  const [equivalentInputs, setEquivalentInputs] = useState([]);
 
   const [errorMessage, setErrorMessage] = useState(null);
   const [systemAdminWarning, setSystemAdminWarning] = useState(false);
@@ -96,7 +100,14 @@ const ProgramForm = ({ onClose, refreshPrograms, editingProgram }) => {
         description: editingProgram.description,
         track_payment: editingProgram.track_payment,
         prerequisites: editingProgram.prerequisites || [],
+        prerequisite_min_grade: editingProgram.prerequisite_min_grade || "",
+        prerequisite_equivalents: editingProgram.prerequisite_equivalents || {},
       });
+      setEquivalentInputs(
+        (editingProgram.prerequisites || []).map((course) =>
+          (editingProgram.prerequisite_equivalents?.[course] || []).join(", ")
+        )
+      );
       axiosInstance
         .get(`/api/questions/?program=${editingProgram.id}`)
         .then((response) => {
@@ -261,6 +272,13 @@ const ProgramForm = ({ onClose, refreshPrograms, editingProgram }) => {
     setDirty(true);
   };
 
+  const handleEquivalentChange = (index, value) => {
+    const updated = [...equivalentInputs];
+    updated[index] = value;
+    setEquivalentInputs(updated);
+    setDirty(true);
+  };
+
   const submitProgram = async () => {
     setIsSubmitting(true);
     try {
@@ -277,7 +295,29 @@ const ProgramForm = ({ onClose, refreshPrograms, editingProgram }) => {
       }
 
       const updatedPrereqs = normalizedPrereqs.map((item) => item.normalized);
-      const payload = { ...programData, prerequisites: updatedPrereqs };
+
+      const equivalents = {};
+      for (const [index, course] of updatedPrereqs.entries()) {
+        const options = (equivalentInputs[index] || "")
+          .split(",")
+          .filter((option) => option.trim())
+          .map((option) => normalizeCourse(option));
+        if (options.find((item) => !item.isValid)) {
+          setErrorMessage(
+            'Equivalent courses must be in the format "<DEPARTMENT> <NUMBER>", separated by commas'
+          );
+          return;
+        }
+        if (options.length > 0) {
+          equivalents[course] = options.map((item) => item.normalized);
+        }
+      }
+
+      const payload = {
+        ...programData,
+        prerequisites: updatedPrereqs,
+        prerequisite_equivalents: equivalents,
+      };
 
       if (editingProgram) {
         await axiosInstance.put(`/api/programs/${editingProgram.id}/`, payload);
@@ -558,6 +598,13 @@ const ProgramForm = ({ onClose, refreshPrograms, editingProgram }) => {
                   handlePrerequisiteChange(index, e.target.value)
                 }
               />
+              <TextField
+                fullWidth
+                disabled={!user.is_admin}
+                label="Also accepted (comma separated)"
+                value={equivalentInputs[index] || ""}
+                onChange={(e) => handleEquivalentChange(index, e.target.value)}
+              />
               <IconButton
                 disabled={!user.is_admin}
                 onClick={() => {
@@ -565,6 +612,9 @@ const ProgramForm = ({ onClose, refreshPrograms, editingProgram }) => {
                     (_, i) => i !== index
                   );
                   setProgramData({ ...programData, prerequisites: updated });
+                  setEquivalentInputs(
+                    equivalentInputs.filter((_, i) => i !== index)
+                  );
                   setDirty(true);
                 }}
               >
@@ -580,11 +630,30 @@ const ProgramForm = ({ onClose, refreshPrograms, editingProgram }) => {
                 ...programData,
                 prerequisites: [...programData.prerequisites, ""],
               });
+              setEquivalentInputs([...equivalentInputs, ""]);
               setDirty(true);
             }}
           >
             Add Course
           </Button>
+          <FormControl fullWidth sx={{ mt: 2 }}>
+            <InputLabel id="min-grade-label">Minimum Grade</InputLabel>
+            <Select
+              labelId="min-grade-label"
+              label="Minimum Grade"
+              name="prerequisite_min_grade"
+              disabled={!user.is_admin}
+              value={programData.prerequisite_min_grade}
+              onChange={handleInputChange}
+            >
+              <MenuItem value="">Any passing grade</MenuItem>
+              {LETTER_GRADES.map((grade) => (
+                <MenuItem key={grade} value={grade}>
+                  {grade}
+                </MenuItem>
+              ))}
+            </Select>
+          </FormControl>
         </Box>
 
         {/* Questions Section */}
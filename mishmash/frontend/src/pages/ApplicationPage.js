@@ -13,6 +13,7 @@ import {
   Alert,
 } from "@mui/material";
 import axiosInstance from "../utils/axios";
+import { checkPrerequisites, refreshTranscript } from "../utils/transcript";
 import { useAuth } from "../context/AuthContext";
 import EssentialDocumentFormSubmission from "../components/EssentialDocumentFormSubmission";
 import DeadlineIndicator from "../components/DeadlineIndicator";
@@ -206,10 +207,8 @@ const ApplicationPage = () => {
 
         if (programData?.prerequisites?.length > 0) {
           try {
-            const prereqRes = await axiosInstance.get(
-              `/api/programs/${program_id}/check_prerequisites/?student_id=${user.id}`
-            );
-            setPrereqStatus(prereqRes.data);
+            const prereqData = await checkPrerequisites(program_id, user.id);
+            setPrereqStatus(prereqData);
           } catch (err) {
             console.error("Error checking prerequisites:", err);
             setPrereqStatus({
@@ -481,11 +480,9 @@ const ApplicationPage = () => {
 
   const handleRefreshTranscript = async () => {
     try {
-      await axiosInstance.post(`/api/users/${user.id}/refresh_transcript/`);
-      const prereqRes = await axiosInstance.get(
-        `/api/programs/${program_id}/check_prerequisites/?student_id=${user.id}`
-      );
-      setPrereqStatus(prereqRes.data);
+      await refreshTranscript(user.id);
+      const prereqData = await checkPrerequisites(program_id, user.id);
+      setPrereqStatus(prereqData);
       setSuccessMessage("Transcript refreshed!");
       setTimeout(() => setSuccessMessage(""), 3000);
     } catch (err) {
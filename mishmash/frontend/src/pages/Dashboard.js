@@ -7,7 +7,7 @@ import {
   Navigate,
   Outlet,
 } from "react-router-dom";
-import axiosInstance from "../utils/axios";
+import { refreshTranscript } from "../utils/transcript";
 import { useAuth } from "../context/AuthContext";
 import { styled } from "@mui/material/styles";
 import TopNavBar from "../components/TopNavBar";
@@ -214,7 +214,7 @@ const Dashboard = () => {
 
   const refreshPrerequisites = async () => {
     try {
-      await axiosInstance.post(`/api/users/${user.id}/refresh_transcript/`);
+      await refreshTranscript(user.id);
       refreshUser();
     } catch (err) {
       console.error("Failed to connect user to a Ulink account.");
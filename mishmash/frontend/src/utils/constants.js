@@ -221,6 +221,11 @@ export const SESSION_TIMEOUTS = {
 // Academic terms
 export const SEMESTERS = ["Summer", "Fall", "Spring"];
 
+// Letter grades from highest to lowest, for a program's minimum prerequisite grade
+export const LETTER_GRADES = [
+  "A+", "A", "A-", "B+", "B", "B-", "C+", "C", "C-", "D+", "D", "D-",
+];
+
 /**
  * Determines the set of application statuses a user can edit based on their role.
  *
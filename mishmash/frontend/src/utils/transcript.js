@@ -0,0 +1,90 @@
+/**
+ * Study Abroad Program - Transcript Refresh Helpers
+ * ============================================
+ *
+ * Transcripts are fetched from Ulink by a background worker. Requesting a
+ * refresh (or checking prerequisites of a student without a transcript)
+ * answers 202 with a job, and these helpers poll the job until it has finished.
+ *
+ * Used by:
+ * - ApplicationPage, AdminAppView and ApplicantTable for prerequisite checks
+ * - ApplicantTable for refreshing the transcripts of a program's applicants
+ * - Dashboard for refreshing the signed-in user's transcript
+ */
+
+import axiosInstance from "./axios";
+
+const POLL_INTERVAL_MS = 1500;
+const POLL_TIMEOUT_MS = 90000;
+const ACTIVE_STATUSES = ["queued", "running"];
+
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
+/**
+ * Poll a user's latest transcript refresh job until it has finished.
+ * Resolves with {job, transcript}; rejects if the job failed or timed out.
+ */
+export const waitForTranscriptRefresh = async (userId) => {
+  const deadline = Date.now() + POLL_TIMEOUT_MS;
+  while (Date.now() < deadline) {
+    await sleep(POLL_INTERVAL_MS);
+    const response = await axiosInstance.get(
+      `/api/users/${userId}/refresh_transcript/`
+    );
+    const { job } = response.data;
+    if (!job || !ACTIVE_STATUSES.includes(job.status)) {
+      if (job?.status === "failed") {
+        throw new Error(job.error || "Transcript refresh failed.");
+      }
+      return response.data;
+    }
+  }
+  throw new Error("Transcript refresh is taking longer than expected.");
+};
+
+/**
+ * Queue a transcript refresh for a user and wait for it to finish.
+ */
+export const refreshTranscript = async (userId) => {
+  await axiosInstance.post(`/api/users/${userId}/refresh_transcript/`);
+  return waitForTranscriptRefresh(userId);
+};
+
+/**
+ * Check a student's prerequisites for a program. If the student's transcript
+ * has not been fetched yet, waits for the queued refresh and checks again.
+ */
+export const checkPrerequisites = async (programId, studentId) => {
+  const url = `/api/programs/${programId}/check_prerequisites/?student_id=${studentId}`;
+  let response = await axiosInstance.get(url);
+  if (response.status === 202) {
+    await waitForTranscriptRefresh(studentId);
+    response = await axiosInstance.get(url);
+    if (response.status === 202) {
+      throw new Error("The transcript could not be fetched from Ulink.");
+    }
+  }
+  return response.data;
+};
+
+/**
+ * Queue refreshes of the stale or missing transcripts of a program's
+ * applicants, then re-read the prerequisite report until those transcripts
+ * have been fetched (or the wait times out). Resolves with the latest report.
+ */
+export const refreshPrerequisiteReport = async (programId) => {
+  const url = `/api/programs/${programId}/prerequisite_report/`;
+  let report = (await axiosInstance.post(url)).data;
+  const pending = new Set(
+    report.applicants.filter((row) => row.refresh_queued).map((row) => row.student_id)
+  );
+  const deadline = Date.now() + POLL_TIMEOUT_MS;
+  while (pending.size > 0 && Date.now() < deadline) {
+    await sleep(POLL_INTERVAL_MS);
+    report = (await axiosInstance.get(url)).data;
+    report.applicants.forEach((row) => {
+      if (row.transcript_status === "fresh") pending.delete(row.student_id);
+    });
+  }
+  return report;
+};
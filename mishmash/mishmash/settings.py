@@ -105,6 +105,7 @@ INSTALLED_APPS = [
 # Order is important for middleware
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',   # Must be at the top for CORS to work
+    'api.middleware.QueryInstrumentationMiddleware',  # Counts SQL queries per request
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -242,6 +243,23 @@ STATIC_URL = "/django-static/"
 STATIC_ROOT = BASE_DIR / "static"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
+# Files only served through API views, outside MEDIA_ROOT (which nginx serves)
+PRIVATE_MEDIA_ROOT = Path(os.getenv('PRIVATE_MEDIA_ROOT', BASE_DIR / "private_media"))
+
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+    },
+    # Document signatures (see api/signatures.py); any Django storage backend
+    # can be configured here, e.g. an object store
+    "signatures": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+        "OPTIONS": {"location": PRIVATE_MEDIA_ROOT},
+    },
+}
 
 # AUTHENTICATION AND SECURITY
 # =========================
@@ -258,6 +276,8 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',  # Require authentication by default
     ],
     'COERCE_DECIMAL_TO_STRING': True,
+    # Opt-in cursor pagination (?page_size=<n>), see api/pagination.py
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.OptionalCursorPagination',
 }
 
 # CORS Configuration for frontend communication
@@ -330,10 +350,122 @@ LOGGING = {
             "level": "INFO",
             "propagate": False,
         },
+        "api": {
+            "handlers": ["console"],
+            "level": "INFO",
+            "propagate": False,
+        },
     },
 }
 
 
+# BACKGROUND THREADS
+# ==================
+# Web server processes run the application lifecycle scheduler and the
+# transcript refresh workers in background threads. They are only started when
+# RUN_BACKGROUND_THREADS is set, which the gunicorn and runserver commands do
+# (e.g. `gunicorn -e RUN_BACKGROUND_THREADS=true`), so management commands,
+# tests and scripts never start them.
+RUN_BACKGROUND_THREADS = os.getenv('RUN_BACKGROUND_THREADS', 'False').lower() in ['true', '1', 't', 'y', 'yes']
+
+
+# APPLICATION LIFECYCLE
+# =====================
+# Periodically moves "Enrolled" applications of ended programs to "Completed"
+# (see api/lifecycle.py). Can also be run on demand with
+# `python manage.py complete_enrollments`.
+APPLICATION_LIFECYCLE_SCHEDULER = os.getenv('APPLICATION_LIFECYCLE_SCHEDULER', 'True').lower() in ['true', '1', 't', 'y', 'yes']
+APPLICATION_LIFECYCLE_INTERVAL = int(os.getenv('APPLICATION_LIFECYCLE_INTERVAL', '3600'))  # seconds
+
+
+# IMAGE THUMBNAILS
+# ================
+# Announcement cover images are resized in the background after upload
+# (see api/thumbnails.py). Turn THUMBNAIL_ASYNC off to resize during the request.
+THUMBNAIL_ASYNC = os.getenv('THUMBNAIL_ASYNC', 'True').lower() in ['true', '1', 't', 'y', 'yes']
+THUMBNAIL_WORKERS = int(os.getenv('THUMBNAIL_WORKERS', '2'))  # threads per process
+
+
+# TRANSCRIPT PROVIDERS
+# ====================
+# HTTP client used to scrape transcript providers such as Ulink
+# (see api/transcript_providers/http.py). Requests are bounded by the timeouts
+# and retries, and after TRANSCRIPT_PROVIDER_FAILURE_THRESHOLD consecutive
+# failures the provider is not contacted for TRANSCRIPT_PROVIDER_RESET_TIMEOUT seconds.
+TRANSCRIPT_PROVIDER_CONNECT_TIMEOUT = float(os.getenv('TRANSCRIPT_PROVIDER_CONNECT_TIMEOUT', '3'))  # seconds
+TRANSCRIPT_PROVIDER_READ_TIMEOUT = float(os.getenv('TRANSCRIPT_PROVIDER_READ_TIMEOUT', '10'))  # seconds
+TRANSCRIPT_PROVIDER_RETRIES = int(os.getenv('TRANSCRIPT_PROVIDER_RETRIES', '2'))
+TRANSCRIPT_PROVIDER_BACKOFF = float(os.getenv('TRANSCRIPT_PROVIDER_BACKOFF', '0.5'))  # 0.5s, 1s, ... between retries
+TRANSCRIPT_PROVIDER_FAILURE_THRESHOLD = int(os.getenv('TRANSCRIPT_PROVIDER_FAILURE_THRESHOLD', '5'))
+TRANSCRIPT_PROVIDER_RESET_TIMEOUT = float(os.getenv('TRANSCRIPT_PROVIDER_RESET_TIMEOUT', '30'))  # seconds
+
+
+# TRANSCRIPT REFRESH JOBS
+# =======================
+# Transcripts are fetched by background workers from a database-backed queue
+# (see api/transcript_jobs.py). Each web server process (see RUN_BACKGROUND_THREADS)
+# runs TRANSCRIPT_REFRESH_WORKERS worker threads; turn TRANSCRIPT_REFRESH_IN_PROCESS
+# off to run them with `python manage.py run_transcript_worker` instead.
+TRANSCRIPT_REFRESH_IN_PROCESS = os.getenv('TRANSCRIPT_REFRESH_IN_PROCESS', 'True').lower() in ['true', '1', 't', 'y', 'yes']
+TRANSCRIPT_REFRESH_WORKERS = int(os.getenv('TRANSCRIPT_REFRESH_WORKERS', '2'))  # threads per process
+TRANSCRIPT_REFRESH_POLL_INTERVAL = float(os.getenv('TRANSCRIPT_REFRESH_POLL_INTERVAL', '5'))  # seconds
+TRANSCRIPT_REFRESH_MAX_ATTEMPTS = int(os.getenv('TRANSCRIPT_REFRESH_MAX_ATTEMPTS', '3'))
+TRANSCRIPT_REFRESH_RETRY_DELAY = float(os.getenv('TRANSCRIPT_REFRESH_RETRY_DELAY', '15'))  # 15s, 30s, ... between attempts
+TRANSCRIPT_REFRESH_JOB_TIMEOUT = int(os.getenv('TRANSCRIPT_REFRESH_JOB_TIMEOUT', '300'))  # seconds before a running job is retried
+TRANSCRIPT_REFRESH_FAILURE_COOLDOWN = int(os.getenv('TRANSCRIPT_REFRESH_FAILURE_COOLDOWN', '900'))  # seconds before a failed user is refreshed again
+# Cached transcripts older than this are still served, but a refresh is queued
+# when they are read (see api/transcripts.py)
+TRANSCRIPT_FRESHNESS = int(os.getenv('TRANSCRIPT_FRESHNESS', '86400'))  # seconds
+
+
+# CACHE CONFIGURATION
+# ===================
+# Shared cache used through api/cache.py. Set REDIS_URL (e.g. redis://cache:6379/0)
+# to share it between all gunicorn workers; every compose file that runs gunicorn
+# does. Without it, CACHE_DIR selects a file-based cache (shared by the workers
+# of one host), and otherwise each process gets its own local-memory cache,
+# which is only enough for runserver and tests.
+REDIS_URL = os.getenv('REDIS_URL')
+CACHE_DIR = os.getenv('CACHE_DIR')
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+            "KEY_PREFIX": "mishmash",
+            "TIMEOUT": 300,
+        }
+    }
+elif CACHE_DIR:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": CACHE_DIR,
+            "KEY_PREFIX": "mishmash",
+            "TIMEOUT": 300,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "mishmash",
+            "TIMEOUT": 300,
+        }
+    }
+
+
+# QUERY INSTRUMENTATION
+# =====================
+# Per-request SQL query counting (see api/middleware.py), on by default in DEBUG.
+# Results are logged, and sent in the Server-Timing header in DEBUG or to
+# signed-in admins. Views that exceed their declared `query_budget` raise an
+# error when QUERY_BUDGET_ENFORCE is on, and are only logged otherwise.
+QUERY_INSTRUMENTATION = os.getenv('QUERY_INSTRUMENTATION', str(DEBUG)).lower() in ['true', '1', 't', 'y', 'yes']
+QUERY_BUDGET_ENFORCE = os.getenv('QUERY_BUDGET_ENFORCE', str(DEBUG)).lower() in ['true', '1', 't', 'y', 'yes']
+QUERY_DUPLICATE_THRESHOLD = int(os.getenv('QUERY_DUPLICATE_THRESHOLD', '5'))  # repeated queries before logging an N+1 warning
+
+
 # Add this line to define the backup directory (archive directory)
 ARCHIVE_DIRECTORY = BASE_DIR / 'backups'
 ARCHIVE_FILENAME = '%Y-%m-%d--%H-%M'